@@ -18,7 +18,6 @@ const BloodBank: React.FC = () => {
   const isDark = theme === 'dark';
   const {
     bloodUnits, bloodBags, bloodDonors, bloodRequests,
-    addBloodUnit, updateBloodUnit,
     addBloodBag, updateBloodBag, deleteBloodBag,
     addBloodDonor, updateBloodDonor, deleteBloodDonor,
     addBloodRequest, updateBloodRequest
@@ -208,18 +207,9 @@ const BloodBank: React.FC = () => {
       status: bagForm.status,
       location: bagForm.location
     };
+    // the server recounts the group's blood unit; addBloodBag reloads it
     addBloodBag(newBag);
 
-    // Update blood unit count
-    const unit = bloodUnits.find(u => u.group === bagForm.bloodGroup);
-    if (unit) {
-      const newCount = unit.bags + 1;
-      updateBloodUnit(unit.id, {
-        bags: newCount,
-        status: newCount <= 2 ? 'Critical' : newCount <= 5 ? 'Low' : 'Adequate'
-      });
-    }
-
     setIsBagModalOpen(false);
     resetBagForm();
   };
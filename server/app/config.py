@@ -4,12 +4,70 @@ from functools import lru_cache
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite+aiosqlite:///./nexushealth.db"
+    DATABASE_READ_URL: str = ""  # optional read replica for GET traffic
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_AUTO_MIGRATE: bool = True  # run alembic upgrade head on startup
+    SQLITE_PRAGMAS_ENABLED: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MiB
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
     JWT_SECRET: str = "nexushealth-super-secret-key"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # thread | process
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
     GEMINI_API_KEY: str = ""
+    GEMINI_BASE_URL: str = "https://generativelanguage.googleapis.com"
+    GEMINI_MODEL: str = "gemini-2.0-flash"
+    AI_TIMEOUT_SECONDS: float = 30.0
+    AI_MAX_CONCURRENCY: int = 16
+    AI_MAX_CONNECTIONS: int = 32
+    AI_CACHE_BACKEND: str = "memory"  # memory | sqlite | none
+    AI_CACHE_PATH: str = "./ai_cache.db"
+    AI_CACHE_TTL_SECONDS: float = 3600
+    AI_CACHE_MAX_ENTRIES: int = 2048
     PORT: int = 5000
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 1000
+    BULK_MAX_ROWS: int = 50000
+    BULK_CHUNK_SIZE: int = 500
+    EXPORT_BATCH_SIZE: int = 1000
+    LIST_FAST_PATH_ENABLED: bool = False  # Core rows + orjson for list endpoints, no per-row validation
+    EVENTS_CLIENT_BUFFER: int = 256  # events buffered per client before it is told to resync
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    EVENTS_FANOUT: str = "none"  # none | unix | database (multi-worker delivery)
+    EVENTS_SOCKET_DIR: str = "/tmp/arya-hms-events"
+    EVENTS_POLL_SECONDS: float = 1.0
+    OPD_TOKEN_SCOPE: str = "department"  # department | doctor: which queue a token number counts within
+    OPD_TOKEN_START: int = 1
+    BLOOD_STOCK_CRITICAL_BELOW: int = 5  # available bags per group below which status is "Critical"
+    BLOOD_STOCK_LOW_BELOW: int = 20  # ... and "Low"
+    BLOOD_EXPIRY_WARNING_DAYS: int = 7
+    SEARCH_BACKEND: str = "auto"  # auto (FTS5 on SQLite when available) | like
+    SEARCH_PAGE_SIZE_MAX: int = 100
+    SEARCH_RANK_WINDOW: int = 2000  # FTS5: most recently indexed matches ranked per query; older ones follow unranked
+    NAME_LOOKUP_MIN_SIMILARITY: float = 0.3  # score a name needs to be suggested (see name_lookup.name_score)
+    NAME_LOOKUP_WORD_SIMILARITY: float = 0.25  # ... and each query word to a name word (short words score low)
+    NAME_LOOKUP_WORDS_PER_TERM: int = 8  # most similar vocabulary words followed per query word
+    NAME_LOOKUP_CANDIDATES: int = 500  # names scored per lookup
+    NAME_MAX_LENGTH: int = 128  # characters of a name that get trigrams
+    TIMELINE_PAGE_SIZE_MAX: int = 200
+    TIMELINE_CONCURRENT_QUERIES: bool = True  # one read connection per entity instead of the request's session
+    METRICS_ENABLED: bool = True
+    ETAG_ENABLED: bool = True
+    ETAG_VERSION_TTL_SECONDS: float = 1.0  # how stale another worker's writes may look
+    STATS_SNAPSHOT_ENABLED: bool = True
+    STATS_SNAPSHOT_TTL_SECONDS: float = 30.0
 
     @property
     def cors_origins_list(self) -> list[str]:
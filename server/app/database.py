@@ -1,12 +1,79 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from pathlib import Path
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 from app.config import get_settings
+from app.services.serialization import JSON_ENGINE_OPTIONS
 
 settings = get_settings()
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+def _is_sqlite_memory(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _apply_sqlite_pragmas(sync_engine, read_only: bool = False):
+    """Run the SQLite pragma profile (WAL, synchronous, mmap, page cache, busy timeout) on every new connection."""
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        try:
+            cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+            # negative cache_size is in KiB rather than pages
+            cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+
+def build_engine(database_url: str, read_only: bool = False) -> AsyncEngine:
+    """Create an async engine with the configured pool settings and, on SQLite, the pragma profile."""
+    url = make_url(database_url)
+    kwargs = {"echo": False, "pool_pre_ping": settings.DB_POOL_PRE_PING, **JSON_ENGINE_OPTIONS}
+    # in-memory SQLite runs on a single static connection, so queue pool options don't apply
+    if not _is_sqlite_memory(url):
+        kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        )
+        # aiosqlite defaults to NullPool (a fresh connection and pragma run per checkout)
+        if url.get_backend_name() == "sqlite":
+            kwargs["poolclass"] = AsyncAdaptedQueuePool
+    new_engine = create_async_engine(url, **kwargs)
+    if url.get_backend_name() == "sqlite" and settings.SQLITE_PRAGMAS_ENABLED:
+        _apply_sqlite_pragmas(new_engine.sync_engine, read_only=read_only)
+    return new_engine
+
+
+def _build_read_engine() -> AsyncEngine:
+    """Engine for read-only traffic: DATABASE_READ_URL (a replica) if set, otherwise a
+    separate query_only pool on the same SQLite file so dashboard reads never wait
+    for a connection held by a writer. Other backends without a replica share the primary."""
+    if settings.DATABASE_READ_URL:
+        return build_engine(settings.DATABASE_READ_URL, read_only=True)
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "sqlite" and not _is_sqlite_memory(url):
+        return build_engine(settings.DATABASE_URL, read_only=True)
+    return engine
+
+
+engine = build_engine(settings.DATABASE_URL)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+read_engine = _build_read_engine()
+read_session = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
 
 class Base(DeclarativeBase):
     pass
@@ -22,6 +89,38 @@ async def get_db():
             raise
 
 
+async def get_read_db():
+    """Session for GET handlers: bound to the read engine, never flushes or commits.
+    Closing it ends the read transaction and clears the identity map as soon as the
+    response has been built."""
+    async with read_session() as session:
+        yield session
+
+
+def _run_migrations(sync_conn):
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["connection"] = sync_conn
+    command.upgrade(config, "head")
+
+
 async def init_db():
     async with engine.begin() as conn:
+        if settings.DB_AUTO_MIGRATE:
+            await conn.run_sync(_run_migrations)
+        # tables not covered by a migration yet (and in-memory test databases)
         await conn.run_sync(Base.metadata.create_all)
+        from app.services.table_versions import ensure_rows
+        await ensure_rows(conn)
+        from app.services.search import ensure_search_index
+        await ensure_search_index(conn)
+        from app.services.name_lookup import ensure_name_index
+        await ensure_name_index(conn)
+
+
+async def dispose_engines():
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
@@ -1,8 +1,15 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.config import get_settings
-from app.database import init_db
+from app.database import dispose_engines, init_db
+from app.services.ai_client import close_ai_client
+from app.middleware.auth import shutdown_hash_executor
+from app.middleware.metrics import MetricsMiddleware
+from app.services.metrics import registry as metrics_registry
+from app.services.events import broker, register_topic
+from app.services.beds import bed_index
 
 # Import routers
 from app.routers.auth import router as auth_router
@@ -10,6 +17,13 @@ from app.routers.patients import router as patients_router
 from app.routers.stats import router as stats_router
 from app.routers.ai import router as ai_router
 from app.routers.advanced_ai import router as advanced_ai_router
+from app.routers.events import router as events_router
+from app.routers.opd_queue import router as opd_queue_router
+from app.routers.beds import router as beds_router
+from app.routers.blood_bank import router as blood_bank_router
+from app.routers.blood_stock import router as blood_stock_router
+from app.routers.inventory import router as inventory_router
+from app.routers.search import router as search_router
 
 # Import CRUD factory + models + schemas for all entities
 from app.routers.crud_factory import create_crud_router
@@ -38,7 +52,7 @@ from app.schemas.schemas import (
     CertificateCreate, CertificateOut,
     TrialCreate, TrialOut,
     MaternityCreate, MaternityOut,
-    QueueCreate, QueueOut,
+    QueueCreate, QueueOut, QueueUpdate,
     BloodUnitCreate, BloodUnitOut,
     BloodBagCreate, BloodBagOut,
     BloodDonorCreate, BloodDonorOut,
@@ -52,8 +66,14 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     # Startup: create tables
     await init_db()
+    await bed_index.rebuild()
+    await broker.start()
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: stop event fan-out, release pooled AI connections, hashing workers and DB connections
+    await broker.stop()
+    await close_ai_client()
+    shutdown_hash_executor()
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -70,14 +90,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Request metrics (outermost, so CORS preflights and errors are counted too)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # ── Core Routers ──
 app.include_router(auth_router)
 app.include_router(patients_router)
 app.include_router(stats_router)
 app.include_router(ai_router)
 app.include_router(advanced_ai_router)
+app.include_router(events_router)
+# before the generated "opd-queue" router: its POST / allocates tokens server-side
+app.include_router(opd_queue_router)
+# before the generated "beds" router: availability index and atomic assign/release
+app.include_router(beds_router)
+# before the generated "blood-requests" router: FEFO bag allocation
+app.include_router(blood_bank_router)
+# before the generated "blood-units" router: stock derived from blood bags
+app.include_router(blood_stock_router)
+# before the generated "inventory" router: ledgered dispense / receive
+app.include_router(inventory_router)
+app.include_router(search_router)
 
 # ── Generated CRUD Routers ──
 crud_configs = [
@@ -102,8 +139,46 @@ crud_configs = [
     ("blood-requests", "Blood Requests", BloodRequest, BloodRequestCreate, BloodRequestOut, "BR-"),
 ]
 
+# Columns each list endpoint can be filtered (exact match) and sorted on
+crud_list_options = {
+    "appointments": {"filter_fields": ("status", "patient_name", "doctor_name", "date"), "sort_fields": ("date", "patient_name")},
+    "invoices": {"filter_fields": ("status", "patient_name", "date"), "sort_fields": ("date", "amount", "patient_name")},
+    "inventory": {"filter_fields": ("status", "category", "name"), "sort_fields": ("name", "stock")},
+    "ambulances": {"filter_fields": ("status", "type"), "sort_fields": ("vehicle_number",)},
+    "staff": {"filter_fields": ("status", "specialty"), "sort_fields": ("name",)},
+    "tasks": {"filter_fields": ("status", "priority", "assignee"), "sort_fields": ("title",)},
+    "beds": {"filter_fields": ("status", "ward", "type"), "sort_fields": ("ward", "number")},
+    "notices": {"filter_fields": ("priority", "date"), "sort_fields": ("date",)},
+    "lab-requests": {"filter_fields": ("status", "patient_name", "priority", "date"), "sort_fields": ("date", "patient_name")},
+    "radiology": {"filter_fields": ("status", "patient_name", "modality", "date"), "sort_fields": ("date", "patient_name")},
+    "referrals": {"filter_fields": ("status", "patient_name", "direction", "date"), "sort_fields": ("date", "patient_name")},
+    "certificates": {"filter_fields": ("status", "patient_name", "type"), "sort_fields": ("issue_date", "patient_name")},
+    "research-trials": {"filter_fields": ("status", "phase"), "sort_fields": ("title",)},
+    "maternity": {"filter_fields": ("status", "doctor"), "sort_fields": ("name",)},
+    "opd-queue": {"filter_fields": ("status", "department", "doctor_name", "patient_name"), "sort_fields": ("token_number",)},
+    "blood-units": {"filter_fields": ("group", "status"), "sort_fields": ("group",)},
+    "blood-bags": {"filter_fields": ("blood_group", "status", "expiry_date"), "sort_fields": ("expiry_date",)},
+    "blood-donors": {"filter_fields": ("blood_group", "status"), "sort_fields": ("name",)},
+    "blood-requests": {"filter_fields": ("status", "blood_group", "urgency", "patient_name", "request_date"), "sort_fields": ("request_date",)},
+}
+
+# Entities whose PUT accepts fewer fields than their create schema
+crud_update_schemas = {
+    "opd-queue": QueueUpdate,  # token_number is allocated server-side and never rewritten
+}
+
+# Tables the server derives (blood_units from blood_bags, see services/blood_stock): no write routes
+crud_read_only = {"blood-units"}
+
+# Lists that clients follow live via /api/events instead of polling
+push_topics = ("opd-queue", "beds", "ambulances", "notices")
+
 for prefix, tag, model, create_schema, out_schema, id_prefix in crud_configs:
-    r = create_crud_router(prefix, tag, model, create_schema, out_schema, id_prefix)
+    if prefix in push_topics:
+        register_topic(prefix, model, out_schema)
+    r = create_crud_router(prefix, tag, model, create_schema, out_schema, id_prefix,
+                           update_schema=crud_update_schemas.get(prefix), read_only=prefix in crud_read_only,
+                           **crud_list_options.get(prefix, {}))
     app.include_router(r)
 
 
@@ -113,6 +188,12 @@ async def health():
     return {"status": "ok", "service": "Arya Hospital HMS API"}
 
 
+# ── Prometheus Metrics ──
+@app.get("/api/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=settings.PORT, reload=True)
@@ -0,0 +1,41 @@
+"""Pure-ASGI middleware feeding app.services.metrics with per-route request metrics."""
+import time
+from app.services.metrics import UNMATCHED_ROUTE, registry, request_db_stats
+
+
+class MetricsMiddleware:
+    """Records count, latency, response size and SQL work for every HTTP request.
+
+    Requests are labelled with the matched route template (e.g. /api/patients/{patient_id}),
+    which FastAPI leaves in scope["route"] once routing has run, so label cardinality is
+    bounded by the number of routes rather than by ids.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        state = [500, 0]  # status, body bytes
+        db = [0, 0.0]
+        token = request_db_stats.set(db)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                state[1] += len(message.get("body", b""))
+            await send(message)
+
+        registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            registry.in_flight -= 1
+            request_db_stats.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            registry.route(scope["method"], path).record(state[0], time.perf_counter() - started, state[1], db)
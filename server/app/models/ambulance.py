@@ -8,6 +8,6 @@ class Ambulance(Base):
     id = Column(String, primary_key=True)
     vehicle_number = Column(String, nullable=False, unique=True)
     driver_name = Column(String, nullable=False)
-    status = Column(String, nullable=False, default="Available")
+    status = Column(String, nullable=False, default="Available", index=True)
     location = Column(String, nullable=True)
     type = Column(String, nullable=False, default="BLS")
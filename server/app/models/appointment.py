@@ -1,15 +1,20 @@
-from sqlalchemy import Column, String, Boolean
+from sqlalchemy import Column, Index, String, Boolean
 from app.database import Base
+from app.models.types import DateType, TimeType
 
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        Index("ix_appointments_status_date", "status", "date"),
+        Index("ix_appointments_patient_name_date", "patient_name", "date"),
+    )
 
     id = Column(String, primary_key=True)
-    patient_name = Column(String, nullable=False, index=True)
+    patient_name = Column(String, nullable=False)
     doctor_name = Column(String, nullable=False)
-    time = Column(String, nullable=False)
-    date = Column(String, nullable=False)
+    time = Column(TimeType, nullable=False)
+    date = Column(DateType, nullable=False)
     type = Column(String, nullable=False)
     status = Column(String, nullable=False, default="Pending")
     is_online = Column(Boolean, default=False)
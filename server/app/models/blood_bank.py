@@ -1,28 +1,39 @@
-from sqlalchemy import Column, String, Integer, Float
+from sqlalchemy import Column, Index, String, Integer, Float
 from app.database import Base
+from app.models.types import DateType
 
 
 class BloodUnit(Base):
+    """Stock per blood group, derived from blood_bags (see app.services.blood_stock)."""
     __tablename__ = "blood_units"
+    __table_args__ = (
+        Index("ix_blood_units_group", "group", unique=True),
+    )
 
     id = Column(String, primary_key=True)
     group = Column(String, nullable=False)
-    bags = Column(Integer, nullable=False, default=0)
+    bags = Column(Integer, nullable=False, default=0)  # Available bags
+    reserved = Column(Integer, nullable=False, default=0, server_default="0")
     status = Column(String, nullable=False, default="Adequate")
 
 
 class BloodBag(Base):
     __tablename__ = "blood_bags"
+    __table_args__ = (
+        Index("ix_blood_bags_status_expiry_date", "status", "expiry_date"),
+        Index("ix_blood_bags_blood_group_status_expiry_date", "blood_group", "status", "expiry_date"),
+    )
 
     id = Column(String, primary_key=True)
-    blood_group = Column(String, nullable=False, index=True)
+    blood_group = Column(String, nullable=False)
     donor_id = Column(String, nullable=True)
     donor_name = Column(String, nullable=True)
-    collection_date = Column(String, nullable=False)
-    expiry_date = Column(String, nullable=False)
+    collection_date = Column(DateType, nullable=False)
+    expiry_date = Column(DateType, nullable=False)
     volume = Column(Float, nullable=False, default=450)
     status = Column(String, nullable=False, default="Available")
     location = Column(String, nullable=True)
+    request_id = Column(String, nullable=True, index=True)  # BloodRequest the bag is reserved for
 
 
 class BloodDonor(Base):
@@ -45,19 +56,23 @@ class BloodDonor(Base):
 
 class BloodRequest(Base):
     __tablename__ = "blood_requests"
+    __table_args__ = (
+        Index("ix_blood_requests_status_request_date", "status", "request_date"),
+        Index("ix_blood_requests_patient_name_request_date", "patient_name", "request_date"),
+    )
 
     id = Column(String, primary_key=True)
     patient_id = Column(String, nullable=True)
-    patient_name = Column(String, nullable=False, index=True)
+    patient_name = Column(String, nullable=False)
     blood_group = Column(String, nullable=False)
     units_required = Column(Integer, nullable=False)
     urgency = Column(String, nullable=False, default="Routine")
     department = Column(String, nullable=True)
     doctor = Column(String, nullable=True)
     status = Column(String, nullable=False, default="Pending")
-    request_date = Column(String, nullable=False)
-    required_date = Column(String, nullable=True)
+    request_date = Column(DateType, nullable=False)
+    required_date = Column(DateType, nullable=True)
     cross_match_status = Column(String, nullable=True)
     notes = Column(String, nullable=True)
-    fulfilled_date = Column(String, nullable=True)
+    fulfilled_date = Column(DateType, nullable=True)
     fulfilled_units = Column(Integer, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer
+from sqlalchemy import Column, DateTime, Index, String, Integer
 from app.database import Base
 
 
@@ -11,4 +11,22 @@ class InventoryItem(Base):
     stock = Column(Integer, nullable=False, default=0)
     unit = Column(String, nullable=False)
     last_updated = Column(String, nullable=True)
-    status = Column(String, nullable=False, default="In Stock")
+    status = Column(String, nullable=False, default="In Stock")  # derived from stock and threshold
+    threshold = Column(Integer, nullable=False, default=10, server_default="10")  # "Low Stock" below this
+
+
+class StockMovement(Base):
+    """Append-only ledger of inventory stock changes; an item's movements sum to its stock."""
+    __tablename__ = "inventory_movements"
+    __table_args__ = (
+        Index("ix_inventory_movements_item_id_id", "item_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    item_id = Column(String, nullable=False)
+    change = Column(Integer, nullable=False)
+    stock_after = Column(Integer, nullable=False)
+    reason = Column(String, nullable=False)  # opening | receive | dispense | adjust
+    reference = Column(String, nullable=True)  # prescription, purchase order, ...
+    note = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False)
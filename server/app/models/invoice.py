@@ -1,13 +1,18 @@
-from sqlalchemy import Column, String, Float, JSON
+from sqlalchemy import Column, Index, String, Float, JSON
 from app.database import Base
+from app.models.types import DateType
 
 
 class Invoice(Base):
     __tablename__ = "invoices"
+    __table_args__ = (
+        Index("ix_invoices_status_date", "status", "date"),
+        Index("ix_invoices_patient_name_date", "patient_name", "date"),
+    )
 
     id = Column(String, primary_key=True)
-    patient_name = Column(String, nullable=False, index=True)
-    date = Column(String, nullable=False)
+    patient_name = Column(String, nullable=False)
+    date = Column(DateType, nullable=False)
     amount = Column(Float, nullable=False)
     status = Column(String, nullable=False, default="Pending")
     items = Column(JSON, nullable=True)  # list of strings
@@ -1,24 +1,33 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String
 from app.database import Base
+from app.models.types import DateType
 
 
 class LabTestRequest(Base):
     __tablename__ = "lab_requests"
+    __table_args__ = (
+        Index("ix_lab_requests_status_date", "status", "date"),
+        Index("ix_lab_requests_patient_name_date", "patient_name", "date"),
+    )
 
     id = Column(String, primary_key=True)
-    patient_name = Column(String, nullable=False, index=True)
+    patient_name = Column(String, nullable=False)
     test_name = Column(String, nullable=False)
     priority = Column(String, nullable=False, default="Routine")
     status = Column(String, nullable=False, default="Pending")
-    date = Column(String, nullable=False)
+    date = Column(DateType, nullable=False)
 
 
 class RadiologyRequest(Base):
     __tablename__ = "radiology_requests"
+    __table_args__ = (
+        Index("ix_radiology_requests_status_date", "status", "date"),
+        Index("ix_radiology_requests_patient_name_date", "patient_name", "date"),
+    )
 
     id = Column(String, primary_key=True)
-    patient_name = Column(String, nullable=False, index=True)
+    patient_name = Column(String, nullable=False)
     modality = Column(String, nullable=False)
     body_part = Column(String, nullable=False)
     status = Column(String, nullable=False, default="Scheduled")
-    date = Column(String, nullable=False)
+    date = Column(DateType, nullable=False)
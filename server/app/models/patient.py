@@ -1,15 +1,17 @@
-from sqlalchemy import Column, String, Integer
+from sqlalchemy import Column, Index, String, Integer
 from app.database import Base
+from app.models.types import DateType
 
 
 class Patient(Base):
     __tablename__ = "patients"
+    __table_args__ = (Index("ix_patients_status_admission_date", "status", "admission_date"),)
 
     id = Column(String, primary_key=True)
     name = Column(String, nullable=False, index=True)
     age = Column(Integer, nullable=False)
     gender = Column(String, nullable=False)
-    admission_date = Column(String, nullable=False)
+    admission_date = Column(DateType, nullable=False)
     condition = Column(String, nullable=False)
     room_number = Column(String, nullable=True)
     urgency = Column(String, nullable=False, default="MEDIUM")
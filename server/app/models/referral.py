@@ -1,9 +1,11 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String
 from app.database import Base
+from app.models.types import DateType
 
 
 class Referral(Base):
     __tablename__ = "referrals"
+    __table_args__ = (Index("ix_referrals_status_date", "status", "date"),)
 
     id = Column(String, primary_key=True)
     patient_name = Column(String, nullable=False, index=True)
@@ -11,7 +13,7 @@ class Referral(Base):
     hospital = Column(String, nullable=False)
     reason = Column(String, nullable=False)
     status = Column(String, nullable=False, default="Pending")
-    date = Column(String, nullable=False)
+    date = Column(DateType, nullable=False)
 
 
 class MedicalCertificate(Base):
@@ -20,6 +22,6 @@ class MedicalCertificate(Base):
     id = Column(String, primary_key=True)
     patient_name = Column(String, nullable=False, index=True)
     type = Column(String, nullable=False)  # Sick Leave / Fitness
-    issue_date = Column(String, nullable=False)
+    issue_date = Column(DateType, nullable=False)
     doctor = Column(String, nullable=False)
     status = Column(String, nullable=False, default="Draft")
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, String, Integer
+from sqlalchemy import Column, DateTime, Index, String, Integer
 from app.database import Base
+from app.models.types import DateType
 
 
 class ResearchTrial(Base):
@@ -26,6 +27,13 @@ class MaternityPatient(Base):
 
 class QueueItem(Base):
     __tablename__ = "opd_queue"
+    __table_args__ = (
+        Index("ix_opd_queue_department_status_token_number", "department", "status", "token_number"),
+        # call-next: equality on (department, queue_date, status), then highest priority, lowest token
+        Index("ix_opd_queue_call_order", "department", "queue_date", "status", Column("priority").desc(), "token_number"),
+        # a token is issued once per day and department (per doctor under OPD_TOKEN_SCOPE=doctor)
+        Index("ix_opd_queue_token", "queue_date", "department", "doctor_name", "token_number", unique=True),
+    )
 
     id = Column(String, primary_key=True)
     token_number = Column(Integer, nullable=False)
@@ -34,3 +42,17 @@ class QueueItem(Base):
     department = Column(String, nullable=False)
     status = Column(String, nullable=False, default="Waiting")
     wait_time = Column(String, nullable=True)
+    priority = Column(Integer, nullable=False, default=0, server_default="0")  # 0 routine, higher is seen first
+    queue_date = Column(DateType, nullable=True)  # the day the token belongs to; tokens restart daily
+    issued_at = Column(DateTime, nullable=True)
+    called_at = Column(DateTime, nullable=True)
+
+
+class QueueTokenSequence(Base):
+    """Last token issued per (department, doctor, day); doctor_name is "" for department-wide numbering."""
+    __tablename__ = "opd_token_sequences"
+
+    department = Column(String, primary_key=True)
+    doctor_name = Column(String, primary_key=True)
+    queue_date = Column(DateType, primary_key=True)
+    last_token = Column(Integer, nullable=False, default=0)
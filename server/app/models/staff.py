@@ -8,7 +8,7 @@ class Doctor(Base):
     id = Column(String, primary_key=True)
     name = Column(String, nullable=False, index=True)
     specialty = Column(String, nullable=False)
-    status = Column(String, nullable=False, default="Online")
+    status = Column(String, nullable=False, default="Online", index=True)
     patients = Column(Integer, default=0)
     image = Column(String, nullable=True)
     phone = Column(String, nullable=True)
@@ -0,0 +1,10 @@
+from sqlalchemy import BigInteger, Column, String
+from app.database import Base
+
+
+class TableVersion(Base):
+    """Per-table change counter, bumped in the same transaction as every write to that table."""
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -18,7 +18,7 @@ class Bed(Base):
     id = Column(String, primary_key=True)
     ward = Column(String, nullable=False)
     number = Column(String, nullable=False)
-    status = Column(String, nullable=False, default="Available")
+    status = Column(String, nullable=False, default="Available", index=True)
     patient_name = Column(String, nullable=True)
     type = Column(String, nullable=False, default="General")
 
@@ -0,0 +1,74 @@
+"""Date/time column types that also accept the free-form strings the frontend and older rows use."""
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import Date, Time
+from sqlalchemy.types import TypeDecorator
+
+RELATIVE_DAYS = {"today": 0, "tomorrow": 1, "yesterday": -1}
+DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%d-%m-%Y", "%m/%d/%Y", "%b %d, %Y", "%B %d, %Y", "%d %b %Y", "%d %B %Y")
+TIME_FORMATS = ("%H:%M", "%H:%M:%S", "%I:%M %p", "%I:%M%p", "%I %p", "%I%p")
+
+
+def parse_date(value) -> date:
+    """Parse ISO dates, ISO datetimes, common display formats and Today/Tomorrow/Yesterday."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    if text.lower() in RELATIVE_DAYS:
+        return date.today() + timedelta(days=RELATIVE_DAYS[text.lower()])
+    try:
+        return datetime.fromisoformat(text).date()
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date: {value!r}")
+
+
+def parse_time(value) -> time:
+    """Parse 24-hour ("14:30") and 12-hour ("09:00 AM") clock times."""
+    if isinstance(value, datetime):
+        return value.time()
+    if isinstance(value, time):
+        return value
+    text = str(value).strip().upper()
+    try:
+        return time.fromisoformat(text)
+    except ValueError:
+        pass
+    for fmt in TIME_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).time()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised time: {value!r}")
+
+
+class DateType(TypeDecorator):
+    """DATE column; string binds (seed data, query filters, cursors) are parsed with parse_date."""
+    impl = Date
+    cache_ok = True
+
+    @property
+    def python_type(self):
+        return date
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else parse_date(value)
+
+
+class TimeType(TypeDecorator):
+    """TIME column; string binds are parsed with parse_time."""
+    impl = Time
+    cache_ok = True
+
+    @property
+    def python_type(self):
+        return time
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else parse_time(value)
@@ -6,13 +6,15 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import Optional
 from app.config import get_settings
+from app.services.ai_client import get_ai_client
+from app.services.ai_cache import ai_response_cache
 
 router = APIRouter(prefix="/api/ai/advanced", tags=["Advanced AI Features"])
 settings = get_settings()
 
 
 # ── Shared Gemini caller ──
-async def _gemini(prompt: str) -> dict:
+async def _gemini(prompt: str, endpoint: str) -> dict:
     import logging
     import json
     import random
@@ -57,14 +59,28 @@ async def _gemini(prompt: str) -> dict:
             
         return {"status": "mock", "response": "Mock AI Response: Configure GEMINI_API_KEY in .env for real analysis."}
 
-    try:
-        from google import genai
-        client = genai.Client(api_key=api_key)
-        resp = client.models.generate_content(model="gemini-2.0-flash", contents=prompt)
-        return {"status": "success", "response": resp.text}
-    except Exception as e:
-        logger.error(f"Gemini API Error: {e}")
-        return {"status": "error", "response": f"AI Error: {str(e)}"}
+    client = get_ai_client()
+
+    async def call() -> dict:
+        try:
+            text = await client.generate(prompt)
+            return {"status": "success", "response": text}
+        except Exception as e:
+            logger.error(f"Gemini API Error: {e}")
+            return {"status": "error", "response": f"AI Error: {str(e)}"}
+
+    # Identical prompts to the same endpoint/model are served from the response cache
+    if ai_response_cache is None:
+        return await call()
+    return await ai_response_cache.get_or_call(endpoint, prompt, client.model, call)
+
+
+@router.get("/cache/stats")
+async def ai_cache_stats():
+    """Hit/miss counters for the advanced AI response cache."""
+    if ai_response_cache is None:
+        return {"backend": None, "entries": 0, "hits": 0, "misses": 0, "hit_rate": 0.0}
+    return await ai_response_cache.stats()
 
 
 # ═══════════════════════════════════════════════
@@ -95,7 +111,7 @@ async def sepsis_predictor(data: SepsisInput):
     4. Recommended interventions (antibiotics, cultures, IV fluids)
     5. Time-critical actions
     Respond in structured JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "sepsis-predictor")
 
 
 # ═══════════════════════════════════════════════
@@ -123,7 +139,7 @@ async def drug_interaction_checker(data: DrugInteractionInput):
     4. Management recommendations
     5. Alternative medications if contraindicated
     Respond in JSON with an interactions array."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "drug-interactions")
 
 
 # ═══════════════════════════════════════════════
@@ -153,7 +169,7 @@ async def clinical_pathway_recommender(data: PathwayInput):
     7. Follow-up plan
     8. Cost-quality optimization notes
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "clinical-pathway")
 
 
 # ═══════════════════════════════════════════════
@@ -185,7 +201,7 @@ async def risk_stratification(data: RiskStratificationInput):
     7. Overall acuity level (1-5)
     8. Personalized interventions for each risk
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "risk-stratification")
 
 
 # ═══════════════════════════════════════════════
@@ -215,7 +231,7 @@ async def smart_scheduling(data: SmartSchedulingInput):
     6. Bottleneck identification
     7. Overbooking recommendations
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "smart-scheduling")
 
 
 # ═══════════════════════════════════════════════
@@ -248,7 +264,7 @@ async def surgical_risk_predictor(data: SurgicalRiskInput):
     6. Post-op monitoring priorities
     7. Enhanced recovery protocol suggestions
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "surgical-risk")
 
 
 # ═══════════════════════════════════════════════
@@ -275,7 +291,7 @@ async def nlp_records_analyzer(data: NLPRecordsInput):
     7. CPT codes for identified procedures
     8. Key clinical concerns flagged
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "nlp-records")
 
 
 # ═══════════════════════════════════════════════
@@ -305,7 +321,7 @@ async def cancer_screening(data: CancerScreeningInput):
     5. Genetic testing recommendations
     6. Lifestyle modification recommendations
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "cancer-screening")
 
 
 # ═══════════════════════════════════════════════
@@ -335,7 +351,7 @@ async def nutrition_planner(data: NutritionPlanInput):
     6. Contraindicated foods
     7. Transition plan (NPO → clear liquid → regular diet)
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "nutrition-planner")
 
 
 # ═══════════════════════════════════════════════
@@ -368,7 +384,7 @@ async def mental_health_screening(data: MentalHealthInput):
     7. Safety planning recommendations
     8. Lifestyle interventions
     Respond in JSON. IMPORTANT: Include disclaimer that this is a screening tool, not a diagnosis."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "mental-health-screening")
 
 
 # ═══════════════════════════════════════════════
@@ -400,7 +416,7 @@ async def pandemic_simulation(data: PandemicSimInput):
     7. Triage protocol recommendations
     8. Resource reallocation strategy
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "pandemic-simulation")
 
 
 # ═══════════════════════════════════════════════
@@ -431,7 +447,7 @@ async def trial_eligibility_matcher(data: TrialMatchInput):
     5. Nearest trial sites
     6. Patient information sheet summary
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "trial-eligibility")
 
 
 # ═══════════════════════════════════════════════
@@ -459,7 +475,7 @@ async def treatment_cost_estimator(data: CostEstimateInput):
     6. Cost optimization opportunities
     7. Financial assistance program eligibility
     Respond in JSON with all amounts in USD."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "cost-estimator")
 
 
 # ═══════════════════════════════════════════════
@@ -488,7 +504,7 @@ async def genetic_risk_analysis(data: GeneticRiskInput):
     6. Risk communication summary for the patient
     7. Genetic counseling referral recommendation
     Respond in JSON. Include disclaimer about clinical genetic testing."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "genetic-risk")
 
 
 # ═══════════════════════════════════════════════
@@ -518,7 +534,7 @@ async def emergency_response_optimizer(data: EmergencyResponseInput):
     7. Communication protocols
     8. Decontamination procedures (if applicable)
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "emergency-response")
 
 
 # ═══════════════════════════════════════════════
@@ -547,7 +563,7 @@ async def population_health_analytics(data: PopulationHealthInput):
     7. Community health improvement priorities
     8. HEDIS measure performance
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "population-health")
 
 
 # ═══════════════════════════════════════════════
@@ -574,7 +590,7 @@ async def patient_journey_mapper(data: PatientJourneyInput):
     7. Optimization recommendations
     8. Predicted next encounter
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "patient-journey")
 
 
 # ═══════════════════════════════════════════════
@@ -607,7 +623,7 @@ async def chronic_disease_manager(data: ChronicDiseaseInput):
     7. Telehealth monitoring plan
     8. Quarterly milestone goals
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "chronic-disease-manager")
 
 
 # ═══════════════════════════════════════════════
@@ -642,7 +658,7 @@ async def wound_assessment(data: WoundAssessmentInput):
     8. Follow-up schedule
     9. When to escalate to wound specialist
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "wound-assessment")
 
 
 # ═══════════════════════════════════════════════
@@ -667,7 +683,7 @@ async def speech_to_soap(data: SpeechToSOAPInput):
     4. Plan: Medications, procedures, referrals, follow-up, patient education
     5. Billing codes: E&M level, CPT codes
     Respond in JSON with clear SOAP sections."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "speech-to-soap")
 
 
 # ═══════════════════════════════════════════════
@@ -697,7 +713,7 @@ async def icd_cpt_auto_coder(data: AutoCoderInput):
     9. Coding confidence level
     10. Documentation improvement suggestions
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "auto-coder")
 
 
 # ═══════════════════════════════════════════════
@@ -728,7 +744,7 @@ async def radiology_report_generator(data: RadReportInput):
     7. Critical/urgent findings flagged
     8. Recommended follow-up imaging
     Respond in JSON with structured sections."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "radiology-report")
 
 
 # ═══════════════════════════════════════════════
@@ -762,7 +778,7 @@ async def pharmacovigilance(data: PharmacovigilanceInput):
     8. MedWatch report recommendation
     9. Alternative medication suggestions
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "pharmacovigilance")
 
 
 # ═══════════════════════════════════════════════
@@ -796,7 +812,7 @@ async def predictive_staffing(data: PredictiveStaffingInput):
     7. Overtime risk prediction
     8. Cost impact analysis
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "predictive-staffing")
 
 
 # ═══════════════════════════════════════════════
@@ -828,4 +844,4 @@ async def quality_metrics_analyzer(data: QualityMetricsInput):
     8. Projected improvement with interventions
     9. HCAHPS/patient satisfaction correlation
     Respond in JSON."""
-    return await _gemini(prompt)
+    return await _gemini(prompt, "quality-metrics")
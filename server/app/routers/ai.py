@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 from app.config import get_settings
+from app.services.ai_client import get_ai_client
 
 router = APIRouter(prefix="/api/ai", tags=["AI Services"])
 settings = get_settings()
@@ -49,13 +50,8 @@ async def _call_gemini(prompt: str) -> dict:
         }
 
     try:
-        from google import genai
-        client = genai.Client(api_key=api_key)
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompt,
-        )
-        return {"response": response.text, "status": "success"}
+        text = await get_ai_client().generate(prompt)
+        return {"response": text, "status": "success"}
     except Exception as e:
         logger.error(f"Error calling Gemini API: {str(e)}")
         return {"response": str(e), "status": "error"}
@@ -4,7 +4,8 @@ from sqlalchemy import select
 from app.database import get_db
 from app.models.user import User
 from app.schemas.schemas import UserCreate, UserLogin, UserOut, Token
-from app.middleware.auth import hash_password, verify_password, create_access_token, get_current_user
+from app.middleware.auth import hash_password_async, verify_password_async, create_access_token, get_current_user, require_role
+from app.services.principal_cache import principal_cache
 import uuid
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
@@ -20,7 +21,7 @@ async def register(data: UserCreate, db: AsyncSession = Depends(get_db)):
         id=str(uuid.uuid4()),
         name=data.name,
         email=data.email,
-        hashed_password=hash_password(data.password),
+        hashed_password=await hash_password_async(data.password),
         role=data.role,
         avatar=f"https://ui-avatars.com/api/?name={data.name.replace(' ', '+')}&background=0D9488&color=fff",
     )
@@ -35,7 +36,7 @@ async def register(data: UserCreate, db: AsyncSession = Depends(get_db)):
 async def login(data: UserLogin, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.email == data.email))
     user = result.scalar_one_or_none()
-    if not user or not verify_password(data.password, user.hashed_password):
+    if not user or not await verify_password_async(data.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     token = create_access_token({"sub": user.id, "role": user.role})
@@ -45,3 +46,9 @@ async def login(data: UserLogin, db: AsyncSession = Depends(get_db)):
 @router.get("/me", response_model=UserOut)
 async def me(user: User = Depends(get_current_user)):
     return UserOut.model_validate(user)
+
+
+@router.get("/cache-stats", dependencies=[Depends(require_role("Admin"))])
+async def auth_cache_stats():
+    """Hit/miss counters for the authenticated-user cache."""
+    return principal_cache.stats()
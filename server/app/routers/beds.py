@@ -0,0 +1,40 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.models.task import Bed
+from app.schemas.schemas import BedAssign, BedAvailability, BedOut, BedRelease
+from app.services.beds import assign_bed, bed_index, release_bed
+
+# Included before the generic "beds" CRUD router, so /availability is not taken for a bed id.
+router = APIRouter(prefix="/api/beds", tags=["Beds"])
+
+
+@router.get("/availability", response_model=list[BedAvailability])
+async def availability(ward: Optional[str] = None, type: Optional[str] = None):
+    """Bed counts per (ward, type), from the in-memory index."""
+    await bed_index.ensure_current()
+    return bed_index.availability(ward, type)
+
+
+@router.post("/assign", response_model=BedOut)
+async def assign(data: BedAssign, db: AsyncSession = Depends(get_db)):
+    """Occupy an available bed (a given one, or any in the ward/type) for a patient."""
+    bed = await assign_bed(db, data.patient_name, data.ward, data.type, data.bed_id)
+    if bed is None:
+        if data.bed_id is not None and await db.get(Bed, data.bed_id) is None:
+            raise HTTPException(status_code=404, detail="Bed not found")
+        raise HTTPException(status_code=409, detail="No available bed")
+    return bed
+
+
+@router.post("/{bed_id}/release", response_model=BedOut)
+async def release(bed_id: str, data: BedRelease, db: AsyncSession = Depends(get_db)):
+    """Free an occupied bed."""
+    bed = await release_bed(db, bed_id, data.status, data.patient_name)
+    if bed is None:
+        if await db.get(Bed, bed_id) is None:
+            raise HTTPException(status_code=404, detail="Bed not found")
+        raise HTTPException(status_code=409, detail="Bed is not occupied by this patient"
+                            if data.patient_name else "Bed is not occupied")
+    return bed
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.models.blood_bank import BloodRequest
+from app.schemas.schemas import BloodAllocation
+from app.services.blood_bank import allocate, allocate_pending
+
+# Included before the generic "blood-requests" CRUD router.
+router = APIRouter(prefix="/api/blood-requests", tags=["Blood Requests"])
+
+
+@router.post("/allocate", response_model=list[BloodAllocation])
+async def allocate_all(exact_only: bool = False, db: AsyncSession = Depends(get_db)):
+    """Reserve bags for every pending request, most urgent first, in one transaction."""
+    return await allocate_pending(db, exact_only)
+
+
+@router.post("/{request_id}/allocate", response_model=BloodAllocation)
+async def allocate_request(request_id: str, exact_only: bool = False, db: AsyncSession = Depends(get_db)):
+    """Reserve compatible bags for a request, soonest expiry first. Units that cannot be
+    covered are reported as shortfall; calling again later tops the request up."""
+    allocation = await allocate(db, request_id, exact_only)
+    if allocation is None:
+        if await db.get(BloodRequest, request_id) is None:
+            raise HTTPException(status_code=404, detail="Blood request not found")
+        raise HTTPException(status_code=409, detail="Blood request is not open for allocation")
+    return allocation
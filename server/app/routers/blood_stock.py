@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
+from app.database import get_db, get_read_db
+from app.schemas.schemas import BloodStock, BloodStockCheck
+from app.services.blood_stock import rebuild, stock, verify
+
+settings = get_settings()
+
+# Included before the generic "blood-units" CRUD router, so /stock etc. are not taken for ids.
+router = APIRouter(prefix="/api/blood-units", tags=["Blood Units"])
+
+
+@router.get("/stock", response_model=list[BloodStock])
+async def blood_stock(
+    expiring_days: int = Query(settings.BLOOD_EXPIRY_WARNING_DAYS, ge=0, le=365),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Available / reserved / expiring bags per group."""
+    return await stock(db, expiring_days)
+
+
+@router.get("/verify", response_model=BloodStockCheck)
+async def verify_stock(db: AsyncSession = Depends(get_read_db)):
+    """Recount bags per group and report where blood_units disagrees."""
+    return await db.run_sync(verify)
+
+
+@router.post("/rebuild", response_model=BloodStockCheck)
+async def rebuild_stock(db: AsyncSession = Depends(get_db)):
+    """Recount bags per group and correct blood_units; returns the drift that was fixed."""
+    return await db.run_sync(rebuild)
@@ -1,9 +1,14 @@
 """Generic CRUD router factory — generates list/get/create/update/delete for any model+schema pair."""
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.database import get_db
-import uuid
+from app.database import get_db, get_read_db
+from app.services.bulk import add_bulk_routes, new_id
+from app.services.export import add_export_route
+from app.services.pagination import build_list_query_model, build_list_statement, next_cursor
+from app.services.serialization import row_projection
+from app.services.table_versions import etag_guard
 
 
 def create_crud_router(
@@ -14,26 +19,54 @@ def create_crud_router(
     out_schema,
     id_prefix: str = "",
     update_schema=None,
+    filter_fields: tuple[str, ...] = (),
+    sort_fields: tuple[str, ...] = (),
+    read_only: bool = False,
 ):
+    """With read_only, only the list / export / get routes are mounted (for server-derived tables)."""
     router = APIRouter(prefix=f"/api/{prefix}", tags=[tag])
+    list_query_model = build_list_query_model(model_class, filter_fields, sort_fields)
+    if_changed = Depends(etag_guard(model_class.__tablename__))
+    projection = row_projection(model_class, out_schema)
 
-    @router.get("/", response_model=list[out_schema])
-    async def list_all(db: AsyncSession = Depends(get_db)):
-        result = await db.execute(select(model_class))
-        return result.scalars().all()
+    @router.get("/", response_model=list[out_schema], dependencies=[if_changed])
+    async def list_all(
+        response: Response,
+        params: Annotated[list_query_model, Query()],
+        db: AsyncSession = Depends(get_read_db),
+    ):
+        """Keyset-paginated list; the next page's cursor is returned in the X-Next-Cursor header.
+        Pass ?unpaginated=true to fetch every matching row in one response."""
+        if projection is not None:
+            items = await projection.fetch(db, build_list_statement(model_class, params, filter_fields, base=projection.select()))
+        else:
+            result = await db.execute(build_list_statement(model_class, params, filter_fields))
+            items = list(result.scalars().all())
+        cursor = next_cursor(model_class, params, items)
+        if cursor:
+            response.headers["X-Next-Cursor"] = cursor
+        if projection is not None:
+            return projection.response(items, headers=response.headers)
+        return items
 
-    @router.get("/{item_id}", response_model=out_schema)
-    async def get_one(item_id: str, db: AsyncSession = Depends(get_db)):
+    if not read_only:
+        add_bulk_routes(router, model_class, create_schema, update_schema or create_schema, id_prefix)
+    add_export_route(router, model_class, out_schema, prefix, filter_fields, sort_fields)
+
+    @router.get("/{item_id}", response_model=out_schema, dependencies=[if_changed])
+    async def get_one(item_id: str, db: AsyncSession = Depends(get_read_db)):
         result = await db.execute(select(model_class).where(model_class.id == item_id))
         item = result.scalar_one_or_none()
         if not item:
             raise HTTPException(status_code=404, detail=f"{tag} not found")
         return item
 
+    if read_only:
+        return router
+
     @router.post("/", response_model=out_schema)
     async def create(data: create_schema, db: AsyncSession = Depends(get_db)):
-        item_id = f"{id_prefix}{uuid.uuid4().hex[:6].upper()}" if id_prefix else str(uuid.uuid4())
-        item = model_class(id=item_id, **data.model_dump())
+        item = model_class(id=new_id(id_prefix), **data.model_dump())
         db.add(item)
         await db.flush()
         return item
@@ -0,0 +1,83 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from app.config import get_settings
+from app.services.events import broker, topics
+
+settings = get_settings()
+
+router = APIRouter(prefix="/api/events", tags=["Live Updates"])
+
+
+def _parse_topics(raw: Optional[str]) -> set[str]:
+    known = set(topics())
+    requested = {t.strip() for t in raw.split(",") if t.strip()} if raw else known
+    unknown = requested - known
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown topics: {', '.join(sorted(unknown))}. Available: {', '.join(sorted(known))}")
+    return requested
+
+
+@router.get("/")
+async def list_topics():
+    return {"topics": topics(), "subscribers": broker.subscriber_count}
+
+
+@router.get("/stream")
+async def stream(request: Request, topics: Optional[str] = Query(None, description="Comma-separated topics; all when omitted")):
+    """Server-sent events: one `change` event per committed create/update/delete on the subscribed topics."""
+    sub = broker.subscribe(_parse_topics(topics))
+
+    async def events():
+        try:
+            yield f"retry: {int(settings.EVENTS_HEARTBEAT_SECONDS * 1000)}\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(sub.queue.get(), settings.EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # comment line: keeps proxies from closing an idle connection
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: change\ndata: {message}\n\n"
+        finally:
+            broker.unsubscribe(sub)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+async def _until_disconnect(ws: WebSocket):
+    """Drain (and ignore) client frames until the connection closes."""
+    while (await ws.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@router.websocket("/ws")
+async def websocket(ws: WebSocket, topics: Optional[str] = None):
+    """WebSocket variant of /stream: each text frame is one change event as JSON."""
+    try:
+        requested = _parse_topics(topics)
+    except HTTPException as e:
+        await ws.close(code=1008, reason=e.detail)
+        return
+    await ws.accept()
+    sub = broker.subscribe(requested)
+    # a quiet topic never sends, so only reading notices a client that has gone
+    # (including one the server's protocol-level pings found dead)
+    closed = asyncio.create_task(_until_disconnect(ws))
+    message = None
+    try:
+        while True:
+            message = asyncio.create_task(sub.queue.get())
+            await asyncio.wait({message, closed}, return_when=asyncio.FIRST_COMPLETED)
+            if closed.done():
+                break
+            await ws.send_text(message.result())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in (message, closed):
+            if task is not None:
+                task.cancel()
+        broker.unsubscribe(sub)
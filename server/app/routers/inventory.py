@@ -0,0 +1,55 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_read_db
+from app.schemas.schemas import InventoryOut, PrescriptionDispense, StockMove, StockMovementOut
+from app.services.inventory import StockShortage, dispense, dispense_prescription, movements_statement, receive
+
+# Included before the generic "inventory" CRUD router.
+router = APIRouter(prefix="/api/inventory", tags=["Inventory"])
+
+
+def _shortage(e: StockShortage, single: bool = False) -> HTTPException:
+    if single and e.shortfalls[0].available is None:
+        return HTTPException(status_code=404, detail="Item not found")
+    return HTTPException(status_code=409, detail={
+        "message": "Insufficient stock",
+        "shortfalls": [s.model_dump() for s in e.shortfalls],
+    })
+
+
+@router.post("/dispense", response_model=list[InventoryOut])
+async def dispense_batch(data: PrescriptionDispense, db: AsyncSession = Depends(get_db)):
+    """Dispense a whole prescription atomically: every line, or none with the shortfalls listed."""
+    try:
+        return await dispense_prescription(db, data)
+    except StockShortage as e:
+        raise _shortage(e)
+
+
+@router.post("/{item_id}/dispense", response_model=InventoryOut)
+async def dispense_item(item_id: str, data: StockMove, db: AsyncSession = Depends(get_db)):
+    try:
+        return await dispense(db, item_id, data.quantity, data.reference, data.note)
+    except StockShortage as e:
+        raise _shortage(e, single=True)
+
+
+@router.post("/{item_id}/receive", response_model=InventoryOut)
+async def receive_item(item_id: str, data: StockMove, db: AsyncSession = Depends(get_db)):
+    try:
+        return await receive(db, item_id, data.quantity, data.reference, data.note)
+    except StockShortage as e:
+        raise _shortage(e, single=True)
+
+
+@router.get("/{item_id}/movements", response_model=list[StockMovementOut])
+async def movements(
+    item_id: str,
+    limit: int = Query(50, ge=1, le=500),
+    before: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Stock ledger for an item, newest first. Pass the last id received as before for older entries."""
+    result = await db.execute(movements_statement(item_id, limit, before))
+    return result.scalars().all()
@@ -0,0 +1,44 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_read_db
+from app.schemas.schemas import BulkResult, QueueCallNext, QueueIssue, QueueOut
+from app.services.bulk import read_bulk_body
+from app.services.opd_queue import call_next, issue_token, issue_tokens, waiting_statement
+
+# Included before the generic "opd-queue" CRUD router, so its POST / and POST /bulk replace the
+# generic creates (which took token_number from the client); the other generic routes stay.
+router = APIRouter(prefix="/api/opd-queue", tags=["OPD Queue"])
+
+
+@router.post("/", response_model=QueueOut)
+async def check_in(data: QueueIssue, db: AsyncSession = Depends(get_db)):
+    """Add a patient to today's queue with the next token for the department (or doctor)."""
+    return await issue_token(db, data)
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def check_in_bulk(request: Request, db: AsyncSession = Depends(get_db)):
+    """Check in many patients (JSON array or NDJSON), each with the next token as POST / allocates."""
+    return await issue_tokens(db, await read_bulk_body(request))
+
+
+@router.post("/call-next", response_model=QueueOut)
+async def call_next_patient(data: QueueCallNext, db: AsyncSession = Depends(get_db)):
+    """Move the highest-priority, earliest-token waiting patient to "In Consultation"."""
+    item = await call_next(db, data.department, data.doctor_name)
+    if item is None:
+        raise HTTPException(status_code=404, detail="No patients waiting")
+    return item
+
+
+@router.get("/waiting", response_model=list[QueueOut])
+async def waiting(
+    department: str,
+    doctor_name: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Today's waiting patients in the order they will be called."""
+    result = await db.execute(waiting_statement(department, doctor_name).limit(limit))
+    return result.scalars().all()
@@ -1,22 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.patient import Patient
-from app.schemas.schemas import PatientCreate, PatientUpdate, PatientOut
+from app.config import get_settings
+from app.schemas.schemas import NameMatch, PatientCreate, PatientUpdate, PatientOut, TimelinePage
+from app.services.bulk import add_bulk_routes
+from app.services.export import add_export_route
+from app.services.name_lookup import lookup
+from app.services.serialization import row_projection
+from app.services.table_versions import etag_guard
+from app.services.timeline import SOURCES as TIMELINE_SOURCES, timeline
 import uuid
 
+settings = get_settings()
 router = APIRouter(prefix="/api/patients", tags=["Patients"])
+if_changed = Depends(etag_guard(Patient.__tablename__))
+projection = row_projection(Patient, PatientOut)
 
 
-@router.get("/", response_model=list[PatientOut])
-async def list_patients(db: AsyncSession = Depends(get_db)):
+@router.get("/", response_model=list[PatientOut], dependencies=[if_changed])
+async def list_patients(response: Response, db: AsyncSession = Depends(get_read_db)):
+    if projection is not None:
+        rows = await projection.fetch(db, projection.select().order_by(Patient.admission_date.desc()))
+        return projection.response(rows, headers=response.headers)
     result = await db.execute(select(Patient).order_by(Patient.admission_date.desc()))
     return result.scalars().all()
 
 
-@router.get("/{patient_id}", response_model=PatientOut)
-async def get_patient(patient_id: str, db: AsyncSession = Depends(get_db)):
+add_bulk_routes(router, Patient, PatientCreate, PatientUpdate, id_prefix="P-")
+add_export_route(router, Patient, PatientOut, "patients",
+                 filter_fields=("status", "ward", "urgency"), sort_fields=("name", "admission_date"))
+
+
+@router.get("/lookup", response_model=list[NameMatch])
+async def lookup_patient_name(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=100),
+    min_similarity: float = Query(settings.NAME_LOOKUP_MIN_SIMILARITY, ge=0.05, le=1.0),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Names similar to q across patients and every patient_name column, best first; tolerates typos."""
+    return await lookup(db, q, limit, min_similarity)
+
+
+@router.get("/{patient_id}", response_model=PatientOut, dependencies=[if_changed])
+async def get_patient(patient_id: str, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(Patient).where(Patient.id == patient_id))
     patient = result.scalar_one_or_none()
     if not patient:
@@ -24,6 +54,25 @@ async def get_patient(patient_id: str, db: AsyncSession = Depends(get_db)):
     return patient
 
 
+@router.get("/{patient_id}/timeline", response_model=TimelinePage)
+async def patient_timeline(
+    patient_id: str,
+    entity: Optional[list[str]] = Query(None, description=f"any of: {', '.join(TIMELINE_SOURCES)}"),
+    limit: int = Query(50, ge=1, le=settings.TIMELINE_PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """The patient's appointments, invoices, requests, certificates and queue tokens, newest first;
+    pass next_cursor back as cursor for the next page."""
+    unknown = set(entity or ()) - TIMELINE_SOURCES.keys()
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown entity: {', '.join(sorted(unknown))}")
+    name = (await db.execute(select(Patient.name).where(Patient.id == patient_id))).scalar_one_or_none()
+    if name is None:
+        raise HTTPException(status_code=404, detail="Patient not found")
+    return await timeline(db, name, entity, limit, cursor)
+
+
 @router.post("/", response_model=PatientOut)
 async def create_patient(data: PatientCreate, db: AsyncSession = Depends(get_db)):
     patient = Patient(id=f"P-{uuid.uuid4().hex[:6].upper()}", **data.model_dump())
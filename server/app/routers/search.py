@@ -0,0 +1,33 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
+from app.database import get_db, get_read_db
+from app.schemas.schemas import SearchPage
+from app.services.search import SOURCES, rebuild_search_index, search
+
+settings = get_settings()
+
+# Server-side search across patients, notices, lab and radiology requests.
+router = APIRouter(prefix="/api/search", tags=["Search"])
+
+
+@router.get("/", response_model=SearchPage)
+async def search_records(
+    q: str = Query(..., min_length=1, max_length=200),
+    entity: Optional[list[str]] = Query(None, description=f"any of: {', '.join(SOURCES)}"),
+    limit: int = Query(20, ge=1, le=settings.SEARCH_PAGE_SIZE_MAX),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Ranked hits, every word matched as a prefix; pass next_offset back as offset for the next page."""
+    unknown = set(entity or ()) - SOURCES.keys()
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown entity: {', '.join(sorted(unknown))}")
+    return await search(db, q, entity, limit, offset)
+
+
+@router.post("/rebuild")
+async def rebuild(db: AsyncSession = Depends(get_db)):
+    """Refill the search index from the source tables."""
+    return {"rebuilt": await rebuild_search_index(await db.connection())}
@@ -1,5 +1,12 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from datetime import date, datetime, time
+from pydantic import BaseModel, BeforeValidator, EmailStr, Field
+from typing import Annotated, Any, Optional
+from app.models.types import parse_date, parse_time
+
+# Dates/times accept ISO values as well as the display strings the frontend sends
+# ("Today", "Oct 24, 2023", "09:00 AM"); responses always carry ISO values.
+ClinicalDate = Annotated[date, BeforeValidator(parse_date)]
+ClinicalTime = Annotated[time, BeforeValidator(parse_time)]
 
 
 # ── Auth ──
@@ -33,7 +40,7 @@ class PatientCreate(BaseModel):
     name: str
     age: int
     gender: str
-    admission_date: str
+    admission_date: ClinicalDate
     condition: str
     room_number: Optional[str] = None
     urgency: str = "MEDIUM"
@@ -61,7 +68,7 @@ class PatientOut(BaseModel):
     name: str
     age: int
     gender: str
-    admission_date: str
+    admission_date: ClinicalDate
     condition: str
     room_number: Optional[str] = None
     urgency: str
@@ -78,8 +85,8 @@ class PatientOut(BaseModel):
 class AppointmentCreate(BaseModel):
     patient_name: str
     doctor_name: str
-    time: str
-    date: str
+    time: ClinicalTime
+    date: ClinicalDate
     type: str
     status: str = "Pending"
     is_online: bool = False
@@ -88,8 +95,8 @@ class AppointmentOut(BaseModel):
     id: str
     patient_name: str
     doctor_name: str
-    time: str
-    date: str
+    time: ClinicalTime
+    date: ClinicalDate
     type: str
     status: str
     is_online: bool
@@ -100,7 +107,7 @@ class AppointmentOut(BaseModel):
 # ── Invoice ──
 class InvoiceCreate(BaseModel):
     patient_name: str
-    date: str
+    date: ClinicalDate
     amount: float
     status: str = "Pending"
     items: Optional[list[str]] = None
@@ -108,7 +115,7 @@ class InvoiceCreate(BaseModel):
 class InvoiceOut(BaseModel):
     id: str
     patient_name: str
-    date: str
+    date: ClinicalDate
     amount: float
     status: str
     items: Optional[list[str]] = None
@@ -123,7 +130,8 @@ class InventoryCreate(BaseModel):
     stock: int
     unit: str
     last_updated: Optional[str] = None
-    status: str = "In Stock"
+    status: str = "In Stock"  # recomputed from stock and threshold on save
+    threshold: int = 10
 
 class InventoryOut(BaseModel):
     id: str
@@ -133,6 +141,37 @@ class InventoryOut(BaseModel):
     unit: str
     last_updated: Optional[str] = None
     status: str
+    threshold: int = 10
+    class Config:
+        from_attributes = True
+
+class StockMove(BaseModel):
+    quantity: int = Field(gt=0)
+    reference: Optional[str] = None
+    note: Optional[str] = None
+
+class PrescriptionLine(BaseModel):
+    item_id: str
+    quantity: int = Field(gt=0)
+
+class PrescriptionDispense(BaseModel):
+    reference: Optional[str] = None  # prescription id, recorded on every movement
+    lines: list[PrescriptionLine] = Field(min_length=1)
+
+class StockShortfall(BaseModel):
+    item_id: str
+    requested: int
+    available: Optional[int] = None  # None when the item does not exist
+
+class StockMovementOut(BaseModel):
+    id: int
+    item_id: str
+    change: int
+    stock_after: int
+    reason: str
+    reference: Optional[str] = None
+    note: Optional[str] = None
+    created_at: datetime
     class Config:
         from_attributes = True
 
@@ -214,6 +253,23 @@ class BedOut(BaseModel):
     class Config:
         from_attributes = True
 
+class BedAssign(BaseModel):
+    patient_name: str
+    ward: Optional[str] = None
+    type: Optional[str] = None
+    bed_id: Optional[str] = None  # a specific bed instead of any matching one
+
+class BedRelease(BaseModel):
+    status: str = "Available"  # or e.g. "Cleaning" / "Maintenance"
+    patient_name: Optional[str] = None  # when set, only release if this patient still holds the bed
+
+class BedAvailability(BaseModel):
+    ward: str
+    type: str
+    available: int
+    total: int
+    by_status: dict[str, int]
+
 
 # ── Notice ──
 class NoticeCreate(BaseModel):
@@ -238,7 +294,7 @@ class LabRequestCreate(BaseModel):
     test_name: str
     priority: str = "Routine"
     status: str = "Pending"
-    date: str
+    date: ClinicalDate
 
 class LabRequestOut(BaseModel):
     id: str
@@ -246,7 +302,7 @@ class LabRequestOut(BaseModel):
     test_name: str
     priority: str
     status: str
-    date: str
+    date: ClinicalDate
     class Config:
         from_attributes = True
 
@@ -257,7 +313,7 @@ class RadiologyCreate(BaseModel):
     modality: str
     body_part: str
     status: str = "Scheduled"
-    date: str
+    date: ClinicalDate
 
 class RadiologyOut(BaseModel):
     id: str
@@ -265,7 +321,7 @@ class RadiologyOut(BaseModel):
     modality: str
     body_part: str
     status: str
-    date: str
+    date: ClinicalDate
     class Config:
         from_attributes = True
 
@@ -277,7 +333,7 @@ class ReferralCreate(BaseModel):
     hospital: str
     reason: str
     status: str = "Pending"
-    date: str
+    date: ClinicalDate
 
 class ReferralOut(BaseModel):
     id: str
@@ -286,7 +342,7 @@ class ReferralOut(BaseModel):
     hospital: str
     reason: str
     status: str
-    date: str
+    date: ClinicalDate
     class Config:
         from_attributes = True
 
@@ -295,7 +351,7 @@ class ReferralOut(BaseModel):
 class CertificateCreate(BaseModel):
     patient_name: str
     type: str
-    issue_date: str
+    issue_date: ClinicalDate
     doctor: str
     status: str = "Draft"
 
@@ -303,7 +359,7 @@ class CertificateOut(BaseModel):
     id: str
     patient_name: str
     type: str
-    issue_date: str
+    issue_date: ClinicalDate
     doctor: str
     status: str
     class Config:
@@ -369,9 +425,25 @@ class QueueOut(BaseModel):
     department: str
     status: str
     wait_time: Optional[str] = None
+    priority: int = 0
+    queue_date: Optional[ClinicalDate] = None
+    issued_at: Optional[datetime] = None
+    called_at: Optional[datetime] = None
     class Config:
         from_attributes = True
 
+class QueueIssue(BaseModel):
+    """Front-desk check-in; the token number is allocated by the server."""
+    patient_name: str
+    doctor_name: str
+    department: str
+    priority: int = Field(default=0, ge=0, le=9)
+    wait_time: Optional[str] = None
+
+class QueueCallNext(BaseModel):
+    department: str
+    doctor_name: Optional[str] = None
+
 
 # ── Blood Unit ──
 class BloodUnitCreate(BaseModel):
@@ -383,32 +455,54 @@ class BloodUnitOut(BaseModel):
     id: str
     group: str
     bags: int
+    reserved: int = 0
     status: str
     class Config:
         from_attributes = True
 
+class BloodStock(BaseModel):
+    group: str
+    available: int
+    reserved: int
+    expiring: int  # available bags expiring within the requested window (today included)
+    expired: int  # still marked Available but past their expiry date
+    status: str
+
+class BloodStockDrift(BaseModel):
+    group: str
+    stored_available: int
+    actual_available: int
+    stored_reserved: int
+    actual_reserved: int
+
+class BloodStockCheck(BaseModel):
+    consistent: bool
+    drift: list[BloodStockDrift]
+
 
 # ── Blood Bag ──
 class BloodBagCreate(BaseModel):
     blood_group: str
     donor_id: Optional[str] = None
     donor_name: Optional[str] = None
-    collection_date: str
-    expiry_date: str
+    collection_date: ClinicalDate
+    expiry_date: ClinicalDate
     volume: float = 450
     status: str = "Available"
     location: Optional[str] = None
+    request_id: Optional[str] = None
 
 class BloodBagOut(BaseModel):
     id: str
     blood_group: str
     donor_id: Optional[str] = None
     donor_name: Optional[str] = None
-    collection_date: str
-    expiry_date: str
+    collection_date: ClinicalDate
+    expiry_date: ClinicalDate
     volume: float
     status: str
     location: Optional[str] = None
+    request_id: Optional[str] = None
     class Config:
         from_attributes = True
 
@@ -456,8 +550,8 @@ class BloodRequestCreate(BaseModel):
     department: Optional[str] = None
     doctor: Optional[str] = None
     status: str = "Pending"
-    request_date: str
-    required_date: Optional[str] = None
+    request_date: ClinicalDate
+    required_date: Optional[ClinicalDate] = None
     cross_match_status: Optional[str] = None
     notes: Optional[str] = None
 
@@ -471,15 +565,58 @@ class BloodRequestOut(BaseModel):
     department: Optional[str] = None
     doctor: Optional[str] = None
     status: str
-    request_date: str
-    required_date: Optional[str] = None
+    request_date: ClinicalDate
+    required_date: Optional[ClinicalDate] = None
     cross_match_status: Optional[str] = None
     notes: Optional[str] = None
-    fulfilled_date: Optional[str] = None
+    fulfilled_date: Optional[ClinicalDate] = None
     fulfilled_units: Optional[int] = None
     class Config:
         from_attributes = True
 
+class BloodAllocation(BaseModel):
+    request_id: str
+    blood_group: str
+    status: str
+    units_required: int
+    bags: list[BloodBagOut]  # every bag reserved for the request, including earlier allocations
+    shortfall: int
+
+
+# ── Search ──
+class SearchHit(BaseModel):
+    entity: str  # patient | notice | lab | radiology
+    id: str
+    title: str  # HTML: the record's text escaped, words matching a term wrapped in <mark>
+    snippet: str  # the same, cut to the words around the first match
+    score: float  # higher is more relevant, 0 past the ranked window; only comparable within one response
+
+class SearchPage(BaseModel):
+    hits: list[SearchHit]
+    next_offset: Optional[int] = None
+
+
+# ── Patient name lookup ──
+class NameMatch(BaseModel):
+    name: str
+    similarity: float  # 0..1: whole-name trigram Jaccard, or the mean per-word trigram Dice if higher
+    patient_ids: list[str]  # patients registered under exactly this name
+    references: dict[str, int]  # table -> rows carrying this name
+
+
+# ── Patient timeline ──
+class TimelineEvent(BaseModel):
+    entity: str  # the entity's list route: appointments | invoices | lab-requests | ...
+    id: str
+    date: date
+    title: str
+    status: Optional[str] = None
+    record: dict[str, Any]  # the row's columns
+
+class TimelinePage(BaseModel):
+    events: list[TimelineEvent]
+    next_cursor: Optional[str] = None
+
 
 # ── Dashboard Stats ──
 class DashboardStats(BaseModel):
@@ -492,3 +629,19 @@ class DashboardStats(BaseModel):
     occupied_beds: int
     pending_labs: int
     active_ambulances: int
+
+
+# ── Bulk Operations ──
+class BulkDeleteRequest(BaseModel):
+    ids: list[str]
+
+class BulkRowResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    status: str  # created | updated | deleted | not_found | error
+    errors: Optional[list] = None
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[BulkRowResult]
@@ -1,4 +1,7 @@
-"""Seed the database with initial mock data matching the frontend DataContext."""
+"""Seed the database with initial mock data matching the frontend DataContext.
+
+For production-sized datasets (millions of rows) use app.seed_synthetic instead.
+"""
 import asyncio
 from app.database import engine, async_session, Base
 from app.models.user import User
@@ -11,9 +14,10 @@ from app.models.staff import Doctor
 from app.models.task import Task, Bed, Notice
 from app.models.lab import LabTestRequest, RadiologyRequest
 from app.models.referral import Referral, MedicalCertificate
-from app.models.research import ResearchTrial, MaternityPatient, QueueItem
-from app.models.blood_bank import BloodUnit, BloodBag, BloodDonor, BloodRequest
+from app.models.research import ResearchTrial, MaternityPatient, QueueItem, QueueTokenSequence
+from app.models.blood_bank import BloodBag, BloodDonor, BloodRequest
 from app.middleware.auth import hash_password
+from app.services.blood_stock import rebuild as rebuild_blood_stock
 
 
 async def seed():
@@ -58,7 +62,7 @@ async def seed():
         # ── Inventory ──
         db.add_all([
             InventoryItem(id="MED-001", name="Paracetamol", category="Medicine", stock=500, unit="Tablets", last_updated="2023-10-25", status="In Stock"),
-            InventoryItem(id="MED-002", name="Insulin", category="Medicine", stock=20, unit="Vials", last_updated="2023-10-24", status="Low Stock"),
+            InventoryItem(id="MED-002", name="Insulin", category="Medicine", stock=20, unit="Vials", last_updated="2023-10-24", status="Low Stock", threshold=50),
             InventoryItem(id="SUP-001", name="Surgical Masks", category="Supply", stock=1000, unit="Pieces", last_updated="2023-10-20", status="In Stock"),
             InventoryItem(id="SUP-002", name="Gloves (L)", category="Supply", stock=0, unit="Boxes", last_updated="2023-10-22", status="Out of Stock"),
         ])
@@ -145,20 +149,12 @@ async def seed():
 
         # ── OPD Queue ──
         db.add_all([
-            QueueItem(id="1", token_number=101, patient_name="John Doe", doctor_name="Dr. Sarah Chen", department="Cardiology", status="In Consultation", wait_time="0m"),
-            QueueItem(id="2", token_number=102, patient_name="Alice Smith", doctor_name="Dr. Sarah Chen", department="Cardiology", status="Waiting", wait_time="15m"),
-            QueueItem(id="3", token_number=103, patient_name="Bob Brown", doctor_name="Dr. Sarah Chen", department="Cardiology", status="Waiting", wait_time="30m"),
+            QueueItem(id="1", token_number=101, patient_name="John Doe", doctor_name="Dr. Sarah Chen", department="Cardiology", status="In Consultation", wait_time="0m", queue_date="Today"),
+            QueueItem(id="2", token_number=102, patient_name="Alice Smith", doctor_name="Dr. Sarah Chen", department="Cardiology", status="Waiting", wait_time="15m", queue_date="Today"),
+            QueueItem(id="3", token_number=103, patient_name="Bob Brown", doctor_name="Dr. Sarah Chen", department="Cardiology", status="Waiting", wait_time="30m", queue_date="Today"),
+            QueueTokenSequence(department="Cardiology", doctor_name="", queue_date="Today", last_token=103),
         ])
 
-        # ── Blood Units ──
-        blood_units = [
-            ("BU-001", "A+", 12, "Adequate"), ("BU-002", "A-", 3, "Low"),
-            ("BU-003", "B+", 15, "Adequate"), ("BU-004", "B-", 2, "Critical"),
-            ("BU-005", "O+", 20, "Adequate"), ("BU-006", "O-", 4, "Low"),
-            ("BU-007", "AB+", 8, "Adequate"), ("BU-008", "AB-", 1, "Critical"),
-        ]
-        db.add_all([BloodUnit(id=bu[0], group=bu[1], bags=bu[2], status=bu[3]) for bu in blood_units])
-
         # ── Blood Bags ──
         db.add_all([
             BloodBag(id="BB-001", blood_group="A+", donor_id="D-001", donor_name="John Smith", collection_date="2024-01-15", expiry_date="2024-02-15", volume=450, status="Available", location="Freezer A-1"),
@@ -187,6 +183,10 @@ async def seed():
             BloodRequest(id="BR-003", patient_id="P-109", patient_name="James Taylor", blood_group="O-", units_required=3, urgency="Urgent", department="Emergency", doctor="Dr. Emily House", status="Fulfilled", request_date="2024-01-18", required_date="2024-01-18", cross_match_status="Compatible", fulfilled_date="2024-01-18", fulfilled_units=3),
         ])
 
+        # ── Blood Units (stock per group, counted from the bags above) ──
+        await db.flush()
+        await db.run_sync(rebuild_blood_stock)
+
         await db.commit()
         print("✅ Database seeded successfully with all mock data!")
 
@@ -0,0 +1,310 @@
+"""Production-sized synthetic dataset: the scaled-up counterpart of seed.py.
+
+Generates referentially consistent patients, doctors, staff users, appointments,
+invoices, lab requests, beds and blood-bank data (donors, bags, requests and the
+per-group unit totals) and writes them with Core executemany inserts in chunked
+transactions on a single connection. Secondary indexes and the search / name index
+triggers are dropped for the load and rebuilt once at the end, and staff passwords
+share one bcrypt hash computed up front.
+
+    cd server && python -m app.seed_synthetic --rows 1000000 --seed 42 --days 730
+    cd server && python -m app.seed_synthetic --patients 5000000 --invoices 3000000 --appointments 2000000
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from datetime import date, time as clock_time, timedelta
+from sqlalchemy import insert, text
+from app.database import Base, engine, init_db
+from app.middleware.auth import hash_password
+from app.models.appointment import Appointment
+from app.models.blood_bank import BloodBag, BloodDonor, BloodRequest, BloodUnit
+from app.models.invoice import Invoice
+from app.models.lab import LabTestRequest
+from app.models.patient import Patient
+from app.models.staff import Doctor
+from app.models.task import Bed
+from app.models.user import User
+from app.services.blood_stock import stock_status
+from app.services.name_lookup import drop_name_triggers, ensure_name_index
+from app.services.search import drop_search_triggers, ensure_search_index
+
+FIRST_NAMES = ["Aarav", "Aisha", "Amelia", "Arjun", "Carlos", "Chen", "Diya", "Elena", "Emily", "Fatima", "Grace", "Hiro",
+               "Ibrahim", "Isabella", "James", "Kavya", "Liam", "Lucia", "Maya", "Mohammed", "Noah", "Olivia", "Omar",
+               "Priya", "Rahul", "Sarah", "Sofia", "Thomas", "Wei", "Yusuf", "Zara", "Daniel", "Hannah", "Ravi"]
+LAST_NAMES = ["Ahmed", "Brown", "Chen", "Davis", "Fernandez", "Garcia", "Gupta", "Hassan", "Ito", "Johnson", "Khan",
+              "Kim", "Lee", "Lopez", "Martin", "Mehta", "Nguyen", "Okafor", "Patel", "Rossi", "Sharma", "Singh",
+              "Smith", "Taylor", "Wang", "Williams", "Wilson", "Yadav", "Zhang", "Mensah", "Novak", "Silva"]
+SPECIALTIES = ["Cardiology", "Neurology", "Orthopedics", "Pediatrics", "Oncology", "General Medicine", "Dermatology",
+               "Emergency", "Radiology", "Psychiatry"]
+CONDITIONS = ["Hypertension", "Diabetes T2", "Pneumonia", "Migraine", "Fractured Tibia", "Asthma", "COPD", "Sepsis",
+              "Appendicitis", "Cardiac Arrhythmia", "Gastroenteritis", "Observation"]
+LAB_TESTS = ["Complete Blood Count (CBC)", "Liver Function Test", "Lipid Profile", "HbA1c", "Renal Panel",
+             "Thyroid Panel", "Urinalysis", "Blood Culture", "Troponin"]
+BLOOD_GROUPS = ["O+", "A+", "B+", "AB+", "O-", "A-", "B-", "AB-"]
+BLOOD_GROUP_WEIGHTS = [38, 34, 9, 3, 7, 6, 2, 1]
+WARDS = ["General", "ICU", "Pediatric", "Maternity", "Surgical", "Cardiac", "Oncology", "Emergency"]
+
+
+class Generator:
+    """Row factories for every entity. Names and foreign keys are derived from row indexes,
+    so child tables can reference patients, doctors and donors without holding them in memory."""
+
+    def __init__(self, counts: dict[str, int], seed: int, start: date, days: int):
+        self.counts = counts
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.start = start
+        self.days = days
+        self.today = start + timedelta(days=days)
+        self.bag_counts: Counter = Counter()
+
+    def _date(self) -> date:
+        return self.start + timedelta(days=int(self.rng.random() * self.days))
+
+    def person_name(self, i: int, salt: int = 0) -> str:
+        h = (i * 2654435761 + (self.seed + salt) * 40503) & 0xFFFFFFFF
+        return f"{FIRST_NAMES[h % len(FIRST_NAMES)]} {LAST_NAMES[(h >> 8) % len(LAST_NAMES)]}"
+
+    def patient_id(self, i: int) -> str:
+        return f"P-{i:08d}"
+
+    def random_patient(self) -> int:
+        return int(self.rng.random() * self.counts["patients"])
+
+    def doctor_name(self, i: int) -> str:
+        return f"Dr. {self.person_name(i, salt=1)}"
+
+    def random_doctor(self) -> int:
+        return int(self.rng.random() * self.counts["doctors"])
+
+    def users(self, lo: int, hi: int) -> list[dict]:
+        hashed = hash_password("staff123")
+        roles = ["Doctor", "Nurse", "Staff", "Receptionist", "Pharmacist", "Lab Technician"]
+        return [{"id": f"U-{i:06d}", "name": self.person_name(i, salt=2), "email": f"staff{i}@synthetic.nexushealth.com",
+                 "hashed_password": hashed, "role": roles[i % len(roles)]} for i in range(lo, hi)]
+
+    def doctors(self, lo: int, hi: int) -> list[dict]:
+        return [{"id": f"DOC-{i:06d}", "name": self.doctor_name(i), "specialty": SPECIALTIES[i % len(SPECIALTIES)],
+                 "status": self.rng.choice(["Online", "Offline", "In Surgery"]), "patients": self.rng.randrange(40)}
+                for i in range(lo, hi)]
+
+    def patients(self, lo: int, hi: int) -> list[dict]:
+        rng = self.rng
+        rows = []
+        for i in range(lo, hi):
+            admitted = rng.random() < 0.2
+            rows.append({
+                "id": self.patient_id(i), "name": self.person_name(i), "age": rng.randrange(0, 100),
+                "gender": "Female" if i & 1 else "Male", "admission_date": self._date(), "condition": rng.choice(CONDITIONS),
+                "urgency": rng.choice(["LOW", "MEDIUM", "MEDIUM", "HIGH", "CRITICAL"]),
+                "status": "Admitted" if admitted else rng.choice(["OPD", "Discharged"]),
+                "ward": rng.choice(WARDS) if admitted else None,
+            })
+        return rows
+
+    def appointments(self, lo: int, hi: int) -> list[dict]:
+        rng = self.rng
+        rows = []
+        for i in range(lo, hi):
+            day = self._date()
+            status = "Pending" if day >= self.today else rng.choice(["Completed", "Completed", "Cancelled", "Confirmed"])
+            rows.append({
+                "id": f"APT-{i:08d}", "patient_name": self.person_name(self.random_patient()),
+                "doctor_name": self.doctor_name(self.random_doctor()), "date": day,
+                "time": clock_time(rng.randrange(8, 18), rng.choice((0, 15, 30, 45))),
+                "type": rng.choice(["General Checkup", "Follow-up", "Tele-Consult", "Consultation"]),
+                "status": status, "is_online": rng.random() < 0.25,
+            })
+        return rows
+
+    def invoices(self, lo: int, hi: int) -> list[dict]:
+        rng = self.rng
+        return [{"id": f"INV-{i:08d}", "patient_name": self.person_name(self.random_patient()), "date": self._date(),
+                 "amount": round(rng.lognormvariate(5.5, 1.0), 2), "status": rng.choice(["Paid", "Paid", "Pending", "Overdue"]),
+                 "items": [rng.choice(LAB_TESTS), "Consultation"]} for i in range(lo, hi)]
+
+    def lab_requests(self, lo: int, hi: int) -> list[dict]:
+        rng = self.rng
+        return [{"id": f"LAB-{i:08d}", "patient_name": self.person_name(self.random_patient()),
+                 "test_name": rng.choice(LAB_TESTS), "priority": rng.choice(["Routine", "Routine", "Urgent", "STAT"]),
+                 "status": rng.choice(["Completed", "Completed", "Pending", "Processing", "Sample Collected"]),
+                 "date": self._date()} for i in range(lo, hi)]
+
+    def beds(self, lo: int, hi: int) -> list[dict]:
+        rng = self.rng
+        rows = []
+        for i in range(lo, hi):
+            occupied = rng.random() < 0.7
+            rows.append({"id": f"B-{i:06d}", "ward": WARDS[i % len(WARDS)], "number": f"{i // len(WARDS) + 1:04d}",
+                         "status": "Occupied" if occupied else rng.choice(["Available", "Available", "Cleaning"]),
+                         "patient_name": self.person_name(self.random_patient()) if occupied else None,
+                         "type": "ICU" if WARDS[i % len(WARDS)] == "ICU" else "General"})
+        return rows
+
+    def _donor_group(self, i: int) -> str:
+        h = (i * 2246822519 + self.seed) & 0xFFFF
+        bucket = h % sum(BLOOD_GROUP_WEIGHTS)
+        for group, weight in zip(BLOOD_GROUPS, BLOOD_GROUP_WEIGHTS):
+            if bucket < weight:
+                return group
+            bucket -= weight
+        return BLOOD_GROUPS[0]
+
+    def blood_donors(self, lo: int, hi: int) -> list[dict]:
+        rng = self.rng
+        return [{"id": f"D-{i:07d}", "name": self.person_name(i, salt=3), "age": rng.randrange(18, 65),
+                 "gender": "Female" if i & 1 else "Male", "blood_group": self._donor_group(i),
+                 "total_donations": rng.randrange(1, 20), "status": "Active" if rng.random() < 0.9 else "Deferred"}
+                for i in range(lo, hi)]
+
+    def blood_bags(self, lo: int, hi: int) -> list[dict]:
+        rng = self.rng
+        rows = []
+        for i in range(lo, hi):
+            donor = int(rng.random() * self.counts["blood_donors"])
+            group = self._donor_group(donor)
+            collected = self._date()
+            expiry = collected + timedelta(days=42)
+            status = "Expired" if expiry < self.today else rng.choice(["Available", "Available", "Reserved", "Used"])
+            self.bag_counts[group, status] += 1
+            rows.append({"id": f"BB-{i:08d}", "blood_group": group, "donor_id": f"D-{donor:07d}",
+                         "donor_name": self.person_name(donor, salt=3), "collection_date": collected,
+                         "expiry_date": expiry, "volume": 450, "status": status,
+                         "location": f"Freezer {group[0]}-{rng.randrange(1, 6)}"})
+        return rows
+
+    def blood_requests(self, lo: int, hi: int) -> list[dict]:
+        rng = self.rng
+        rows = []
+        for i in range(lo, hi):
+            patient = self.random_patient()
+            requested = self._date()
+            fulfilled = rng.random() < 0.6
+            units = rng.randrange(1, 5)
+            rows.append({"id": f"BR-{i:08d}", "patient_id": self.patient_id(patient), "patient_name": self.person_name(patient),
+                         "blood_group": rng.choices(BLOOD_GROUPS, BLOOD_GROUP_WEIGHTS)[0], "units_required": units,
+                         "urgency": rng.choice(["Routine", "Urgent", "Emergency"]), "doctor": self.doctor_name(self.random_doctor()),
+                         "status": "Fulfilled" if fulfilled else rng.choice(["Pending", "Approved", "Cancelled"]),
+                         "request_date": requested, "required_date": requested + timedelta(days=rng.randrange(3)),
+                         "fulfilled_date": requested if fulfilled else None, "fulfilled_units": units if fulfilled else None})
+        return rows
+
+    def blood_units(self) -> list[dict]:
+        rows = []
+        for group in BLOOD_GROUPS:
+            bags = self.bag_counts[group, "Available"]
+            rows.append({"id": f"BU-{group}", "group": group, "bags": bags,
+                         "reserved": self.bag_counts[group, "Reserved"], "status": stock_status(bags)})
+        return rows
+
+
+# entity -> model, in load order (blood_units is derived from blood_bags, so it goes last)
+ENTITIES = {
+    "users": User,
+    "doctors": Doctor,
+    "patients": Patient,
+    "appointments": Appointment,
+    "invoices": Invoice,
+    "lab_requests": LabTestRequest,
+    "beds": Bed,
+    "blood_donors": BloodDonor,
+    "blood_bags": BloodBag,
+    "blood_requests": BloodRequest,
+}
+
+
+def default_counts(rows: int) -> dict[str, int]:
+    """Row counts per entity for a given scale: large tables get rows, reference tables are smaller."""
+    return {
+        "users": max(10, rows // 10000),
+        "doctors": max(20, rows // 1000),
+        "patients": rows,
+        "appointments": rows,
+        "invoices": rows,
+        "lab_requests": rows,
+        "beds": max(50, rows // 100),
+        "blood_donors": max(50, rows // 10),
+        "blood_bags": max(100, rows // 2),
+        "blood_requests": max(20, rows // 10),
+    }
+
+
+def _deferred_indexes():
+    tables = {model.__table__ for model in ENTITIES.values()}
+    return [ix for table in tables for ix in table.indexes if not ix.unique]
+
+
+async def generate(counts: dict[str, int], seed: int, start: date, days: int, chunk_size: int, defer_indexes: bool) -> dict:
+    gen = Generator(counts, seed, start, days)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await init_db()
+
+    timings = {}
+    total_start = time.perf_counter()
+    async with engine.connect() as conn:
+        if conn.dialect.name == "sqlite":
+            # a rebuildable bulk load does not need per-commit durability
+            await conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        indexes = _deferred_indexes() if defer_indexes else []
+        for ix in indexes:
+            await conn.exec_driver_sql(f"DROP INDEX IF EXISTS {ix.name}")
+        if defer_indexes:
+            await drop_search_triggers(conn)
+            await drop_name_triggers(conn)
+        await conn.commit()
+
+        for entity, model in ENTITIES.items():
+            started = time.perf_counter()
+            factory = getattr(gen, entity)
+            for lo in range(0, counts[entity], chunk_size):
+                hi = min(counts[entity], lo + chunk_size)
+                async with conn.begin():
+                    await conn.execute(insert(model), factory(lo, hi))
+            timings[entity] = round(time.perf_counter() - started, 2)
+            print(f"  {entity:<15} {counts[entity]:>11,} rows  {timings[entity]:>8.2f}s")
+
+        async with conn.begin():
+            await conn.execute(insert(BloodUnit), gen.blood_units())
+        started = time.perf_counter()
+        async with conn.begin():
+            for ix in indexes:
+                await conn.run_sync(lambda sync_conn, ix=ix: ix.create(sync_conn))
+            await ensure_search_index(conn)
+            await ensure_name_index(conn)
+            if conn.dialect.name == "sqlite":
+                await conn.execute(text("ANALYZE"))
+        timings["indexes"] = round(time.perf_counter() - started, 2)
+        print(f"  {'indexes':<15} {len(indexes):>11,} built {timings['indexes']:>8.2f}s")
+    await engine.dispose()
+    timings["total"] = round(time.perf_counter() - total_start, 2)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="scale: rows for each large table (others scale from it)")
+    for entity in ENTITIES:
+        parser.add_argument(f"--{entity.replace('_', '-')}", type=int, dest=entity, help=f"override the {entity} row count")
+    parser.add_argument("--seed", type=int, default=42, help="random seed; the same seed reproduces the same data")
+    parser.add_argument("--start-date", type=date.fromisoformat, help="first generated date (default: --days before today)")
+    parser.add_argument("--days", type=int, default=730, help="date span that generated dates fall into")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="rows per insert transaction")
+    parser.add_argument("--keep-indexes", action="store_true", help="maintain secondary indexes during the load")
+    args = parser.parse_args()
+
+    counts = default_counts(args.rows)
+    for entity in ENTITIES:
+        if getattr(args, entity) is not None:
+            counts[entity] = getattr(args, entity)
+    start = args.start_date or date.today() - timedelta(days=args.days)
+    print(f"Generating {sum(counts.values()):,} rows (seed={args.seed}, {start} + {args.days} days)")
+    timings = asyncio.run(generate(counts, args.seed, start, args.days, args.chunk_size, not args.keep_indexes))
+    print(f"✅ Synthetic dataset loaded in {timings['total']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Content-addressed cache for AI responses, keyed on a hash of (endpoint, prompt, model).
+
+Backends are synchronous; ResponseCache runs the ones that do I/O (blocking = True) in a
+worker thread so a cache lookup never stalls the event loop.
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, Protocol
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class CacheBackend(Protocol):
+    blocking: bool  # does file or network I/O: called off the event loop
+    def get(self, key: str) -> Optional[dict]: ...
+    def set(self, key: str, value: dict, ttl: float) -> None: ...
+    def clear(self) -> None: ...
+    def __len__(self) -> int: ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU with per-entry expiry."""
+    blocking = False
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: dict, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCacheBackend:
+    """File-backed LRU so cached answers survive restarts and are shared by workers on one host."""
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ai_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_ai_cache_last_used ON ai_cache (last_used)")
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM ai_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM ai_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE ai_cache SET last_used = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: dict, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ai_cache (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl, now),
+            )
+            self._conn.execute(
+                "DELETE FROM ai_cache WHERE key IN ("
+                "SELECT key FROM ai_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM ai_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ai_cache").fetchone()[0]
+
+
+class ResponseCache:
+    """Caches successful model responses and coalesces concurrent identical calls."""
+
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._pending: dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def make_key(endpoint: str, prompt: str, model: str) -> str:
+        return hashlib.sha256(f"{endpoint}\0{model}\0{prompt}".encode()).hexdigest()
+
+    async def _backend(self, method: Callable, *args):
+        if self.backend.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def get_or_call(self, endpoint: str, prompt: str, model: str, call: Callable[[], Awaitable[dict]]) -> dict:
+        key = self.make_key(endpoint, prompt, model)
+        pending = self._pending.get(key)
+        if pending is None:
+            cached = await self._backend(self.backend.get, key)
+            if cached is not None:
+                self.hits += 1
+                return dict(cached)
+            # a blocking lookup yields, so an identical call may have started meanwhile
+            pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+            return dict(await asyncio.shield(pending))
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            result = await call()
+            if result.get("status") == "success":
+                await self._backend(self.backend.set, key, result, self.ttl)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._pending[key]
+
+    async def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": await self._backend(len, self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def _build_cache() -> Optional[ResponseCache]:
+    if settings.AI_CACHE_BACKEND == "none":
+        return None
+    if settings.AI_CACHE_BACKEND == "sqlite":
+        backend = SQLiteCacheBackend(settings.AI_CACHE_PATH, settings.AI_CACHE_MAX_ENTRIES)
+    else:
+        backend = MemoryCacheBackend(settings.AI_CACHE_MAX_ENTRIES)
+    return ResponseCache(backend, settings.AI_CACHE_TTL_SECONDS)
+
+
+ai_response_cache = _build_cache()
@@ -0,0 +1,84 @@
+"""Process-wide async Gemini client — one pooled HTTP connection set, per-call timeouts and an in-flight cap."""
+import asyncio
+import time
+from typing import Optional
+import httpx
+from app.config import get_settings
+from app.services.metrics import registry as metrics_registry
+
+settings = get_settings()
+
+
+class AIClientError(Exception):
+    pass
+
+
+class GeminiClient:
+    """Thin async wrapper over the Gemini generateContent REST endpoint.
+
+    A single instance is shared by every request so TLS connections are reused,
+    and a semaphore bounds how many model calls are in flight at once.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = settings.GEMINI_BASE_URL,
+        model: str = settings.GEMINI_MODEL,
+        timeout: float = settings.AI_TIMEOUT_SECONDS,
+        max_concurrency: int = settings.AI_MAX_CONCURRENCY,
+        max_connections: int = settings.AI_MAX_CONNECTIONS,
+    ):
+        self.model = model
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"x-goog-api-key": api_key},
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def generate(self, prompt: str, model: Optional[str] = None, timeout: Optional[float] = None) -> str:
+        """Send one prompt and return the concatenated text of the first candidate."""
+        body = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        model = model or self.model
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                resp = await self._http.post(
+                    f"/v1beta/models/{model}:generateContent",
+                    json=body,
+                    timeout=timeout or self.timeout,
+                )
+            except httpx.HTTPError:
+                metrics_registry.observe_ai_call(model, "transport_error", time.perf_counter() - started)
+                raise
+            metrics_registry.observe_ai_call(model, str(resp.status_code), time.perf_counter() - started)
+        if resp.status_code != 200:
+            raise AIClientError(f"{resp.status_code} {resp.text[:200]}")
+        try:
+            parts = resp.json()["candidates"][0]["content"]["parts"]
+        except (KeyError, IndexError, ValueError):
+            raise AIClientError("Malformed response from model")
+        return "".join(p.get("text", "") for p in parts)
+
+    async def aclose(self):
+        await self._http.aclose()
+
+
+_client: Optional[GeminiClient] = None
+
+
+def get_ai_client() -> GeminiClient:
+    global _client
+    if _client is None:
+        _client = GeminiClient(api_key=settings.GEMINI_API_KEY)
+    return _client
+
+
+async def close_ai_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,283 @@
+"""Bed assignment with an in-memory availability index per (ward, type).
+
+The index holds every bed's (ward, type, status), the ids of available beds per
+(ward, type) and a status count per (ward, type), so availability reads and picking a
+candidate bed are O(1) and never touch the database. It is built at startup and kept
+current by the commits of this process (ORM flushes and the assign/release statements
+below). It also records the "beds" table_versions counter it reflects: a commit whose
+counter bumps do not directly follow that value means another worker (or an untracked
+statement) wrote in between, and the index is rebuilt on its next read, as it is when the
+counter read through table_versions moves past it.
+
+The assign/release statements bypass the ORM flush the dashboard stats snapshot learns
+from, so they add their bed status moves to the session's stats delta themselves.
+
+The index only proposes beds. A bed is taken with a conditional
+UPDATE ... WHERE id = :bed_id AND status = 'Available', so two terminals can never both
+get it; the loser (or a stale index) simply moves on to the next candidate. Candidates
+handed out to in-flight transactions in this process are held until they end, so
+concurrent admissions on one worker pick different beds instead of colliding.
+"""
+import asyncio
+from collections import Counter
+from typing import Optional
+from sqlalchemy import bindparam, event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.database import read_engine
+from app.models.table_version import TableVersion
+from app.models.task import Bed
+from app.schemas.schemas import BedAvailability
+from app.services.stats_snapshot import add_delta, stats_snapshot
+from app.services.table_versions import table_versions
+
+AVAILABLE = "Available"
+OCCUPIED = "Occupied"
+
+BedKey = tuple[str, str]
+BedState = tuple[str, str, str]  # ward, type, status
+
+
+class BedIndex:
+    def __init__(self):
+        self._beds: Optional[dict[str, BedState]] = None
+        self._available: dict[BedKey, set[str]] = {}
+        self._counts: dict[BedKey, Counter] = {}
+        self._held: set[str] = set()
+        self._version = 0
+        self._stale = False
+        self._lock = asyncio.Lock()
+
+    # ── Reads ──
+
+    async def ensure_current(self):
+        version = await table_versions.get(Bed.__tablename__)
+        if self._beds is None or self._stale or version > self._version:
+            async with self._lock:
+                version = table_versions.peek(Bed.__tablename__)
+                if self._beds is None or self._stale or version > self._version:
+                    await self.rebuild()
+
+    async def rebuild(self):
+        version_stmt = select(TableVersion.version).where(TableVersion.table_name == Bed.__tablename__)
+        async with read_engine.connect() as conn:
+            while True:
+                before = (await conn.execute(version_stmt)).scalar_one_or_none() or 0
+                rows = (await conn.execute(select(Bed.id, Bed.ward, Bed.type, Bed.status))).all()
+                after = (await conn.execute(version_stmt)).scalar_one_or_none() or 0
+                # a write committed while the rows were read: read them again
+                if before == after:
+                    break
+        self._beds, self._available, self._counts = {}, {}, {}
+        for bed_id, ward, bed_type, status in rows:
+            self._add(bed_id, (ward, bed_type, status))
+        self._version = after
+        self._stale = False
+
+    def availability(self, ward: Optional[str] = None, bed_type: Optional[str] = None) -> list[BedAvailability]:
+        if ward is not None and bed_type is not None:
+            keys = [(ward, bed_type)] if (ward, bed_type) in self._counts else []
+        else:
+            keys = sorted(k for k in self._counts if ward in (None, k[0]) and bed_type in (None, k[1]))
+        return [
+            BedAvailability(ward=w, type=t, available=self._counts[(w, t)][AVAILABLE],
+                            total=sum(self._counts[(w, t)].values()), by_status=dict(self._counts[(w, t)]))
+            for w, t in keys
+        ]
+
+    def hold_candidate(self, ward: Optional[str], bed_type: Optional[str]) -> Optional[str]:
+        """An available bed not already held by another in-flight transaction; the caller owns the hold."""
+        if ward is not None and bed_type is not None:
+            keys = [(ward, bed_type)]
+        else:
+            keys = [k for k in self._available if ward in (None, k[0]) and bed_type in (None, k[1])]
+        for key in keys:
+            for bed_id in self._available.get(key, ()):
+                if bed_id not in self._held:
+                    self._held.add(bed_id)
+                    return bed_id
+        return None
+
+    # ── Writes ──
+
+    def _add(self, bed_id: str, state: BedState):
+        ward, bed_type, status = state
+        self._beds[bed_id] = state
+        self._counts.setdefault((ward, bed_type), Counter())[status] += 1
+        if status == AVAILABLE:
+            self._available.setdefault((ward, bed_type), set()).add(bed_id)
+
+    def _remove(self, bed_id: str):
+        state = self._beds.pop(bed_id, None)
+        if state is None:
+            return
+        ward, bed_type, status = state
+        counts = self._counts[(ward, bed_type)]
+        counts[status] -= 1
+        if counts[status] <= 0:
+            del counts[status]
+            if not counts:
+                del self._counts[(ward, bed_type)]
+        available = self._available.get((ward, bed_type))
+        if available is not None:
+            available.discard(bed_id)
+            if not available:
+                del self._available[(ward, bed_type)]
+
+    def set_state(self, bed_id: str, state: Optional[BedState]):
+        self._remove(bed_id)
+        if state is not None:
+            self._add(bed_id, state)
+
+    def commit(self, pending: dict):
+        """Apply a committed transaction's bed changes (see _BedWrites)."""
+        self._held.difference_update(pending["holds"])
+        first, last = pending["first"], pending["last"]
+        if self._beds is None or (first is None and not pending["untracked"]):
+            return
+        if last is not None and self._version >= last:
+            return  # a rebuild already read this commit
+        for bed_id, state in pending["changes"]:
+            self.set_state(bed_id, state)
+        if pending["untracked"] or first is None or self._version != first - 1:
+            self._stale = True
+        else:
+            self._version = last
+
+    def release_holds(self, holds: list[str]):
+        self._held.difference_update(holds)
+
+
+bed_index = BedIndex()
+
+
+# ── Assign / release ──
+
+def _pending(session: Session) -> dict:
+    return session.info.setdefault("bed_index", {"changes": [], "holds": [], "first": None, "last": None, "untracked": False})
+
+
+def _claim_statement():
+    return (
+        update(Bed)
+        .where(Bed.id == bindparam("bed_id"), Bed.status == AVAILABLE)
+        .values(status=OCCUPIED, patient_name=bindparam("patient_name"))
+        .returning(Bed)
+        .execution_options(synchronize_session=False, bed_index_tracked=True)
+    )
+
+
+def _note_statement_write(db: AsyncSession, bed: Bed, old_status: str):
+    session = db.sync_session
+    _pending(session)["changes"].append((bed.id, (bed.ward, bed.type, bed.status)))
+    add_delta(session, Bed.__tablename__, old_status, -1)
+    add_delta(session, Bed.__tablename__, bed.status, 1)
+
+
+async def _claim(db: AsyncSession, bed_id: str, patient_name: str) -> Optional[Bed]:
+    bed = (await db.execute(_claim_statement(), {"bed_id": bed_id, "patient_name": patient_name})).scalar_one_or_none()
+    if bed is not None:
+        _note_statement_write(db, bed, AVAILABLE)
+    return bed
+
+
+async def assign_bed(db: AsyncSession, patient_name: str, ward: Optional[str] = None,
+                     bed_type: Optional[str] = None, bed_id: Optional[str] = None) -> Optional[Bed]:
+    """Occupy a specific bed, or any available bed matching ward/type; None when there is none."""
+    if bed_id is not None:
+        return await _claim(db, bed_id, patient_name)
+    await bed_index.ensure_current()
+    holds = _pending(db.sync_session)["holds"]
+    while (candidate := bed_index.hold_candidate(ward, bed_type)) is not None:
+        holds.append(candidate)
+        # no row means another worker took it first; the index is behind, so try the next one
+        bed = await _claim(db, candidate, patient_name)
+        if bed is not None:
+            return bed
+    # the index has nothing left for this ward/type; confirm against the table before giving up
+    candidates = select(Bed.id).where(Bed.status == AVAILABLE)
+    if ward is not None:
+        candidates = candidates.where(Bed.ward == ward)
+    if bed_type is not None:
+        candidates = candidates.where(Bed.type == bed_type)
+    while True:
+        candidate = (await db.execute(candidates.limit(1))).scalar_one_or_none()
+        if candidate is None:
+            return None
+        bed = await _claim(db, candidate, patient_name)
+        if bed is not None:
+            return bed
+
+
+async def release_bed(db: AsyncSession, bed_id: str, status: str = AVAILABLE,
+                      patient_name: Optional[str] = None) -> Optional[Bed]:
+    """Free an occupied bed (optionally only if patient_name still holds it); None if it is not occupied."""
+    stmt = update(Bed).where(Bed.id == bed_id, Bed.status == OCCUPIED)
+    if patient_name is not None:
+        stmt = stmt.where(Bed.patient_name == patient_name)
+    stmt = (
+        stmt.values(status=status, patient_name=None)
+        .returning(Bed)
+        .execution_options(synchronize_session=False, bed_index_tracked=True)
+    )
+    bed = (await db.execute(stmt)).scalar_one_or_none()
+    if bed is not None:
+        _note_statement_write(db, bed, OCCUPIED)
+    return bed
+
+
+# ── Write capture ──
+# Registered after table_versions' listeners (this module imports it), so the "beds"
+# counter value returned by each bump is already in session.info when these run.
+
+def _note_version(session: Session, pending: dict):
+    version = session.info.get("table_versions", {}).get(Bed.__tablename__)
+    if version is None:
+        pending["untracked"] = True
+        return
+    if pending["first"] is None:
+        pending["first"] = version
+    pending["last"] = version
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_bed_changes(session, flush_context):
+    pending = None
+    for objs, deleted in ((session.new, False), (session.dirty, False), (session.deleted, True)):
+        for obj in objs:
+            if type(obj) is not Bed or (obj in session.dirty and not session.is_modified(obj)):
+                continue
+            if pending is None:
+                pending = _pending(session)
+                _note_version(session, pending)
+            pending["changes"].append((obj.id, None if deleted else (obj.ward, obj.type, obj.status)))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bed_statement(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if orm_execute_state.statement.table.name != Bed.__tablename__:
+        return
+    pending = _pending(orm_execute_state.session)
+    _note_version(orm_execute_state.session, pending)
+    if not orm_execute_state.execution_options.get("bed_index_tracked"):
+        # bulk writes and other statements whose rows are unknown here: rebuild after commit
+        pending["untracked"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_bed_changes(session):
+    pending = session.info.pop("bed_index", None)
+    if pending is None:
+        return
+    bed_index.commit(pending)
+    if pending["untracked"] and stats_snapshot is not None:
+        stats_snapshot.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_bed_changes(session):
+    pending = session.info.pop("bed_index", None)
+    if pending is not None:
+        bed_index.release_holds(pending["holds"])
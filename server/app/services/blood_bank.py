@@ -0,0 +1,140 @@
+"""Blood bag allocation for blood requests: ABO/Rh compatible, first-expiry-first-out.
+
+Candidate bags are read with one indexed range scan per compatible donor group on
+ix_blood_bags_blood_group_status_expiry_date (blood_group = ?, status = 'Available',
+expiry_date >= today, in expiry order, LIMIT the units still needed). The scans are
+merged by donor preference — the recipient's own group first, O negative last so the
+universal donor stock is kept for patients who need it — then by expiry.
+
+A request is locked for the transaction with a no-op UPDATE on its row before its
+reservations are counted, so two allocations of the same request cannot both top it
+up. Bags are taken with UPDATE ... WHERE status = 'Available', so a bag another
+request reserved in the meantime is skipped and the next candidate scan fills the gap.
+"""
+from datetime import date
+from typing import Optional
+from sqlalchemy import case, func, literal, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.blood_bank import BloodBag, BloodRequest
+from app.schemas.schemas import BloodAllocation, BloodBagOut
+from app.services.blood_stock import apply_moves
+
+AVAILABLE = "Available"
+RESERVED = "Reserved"
+ALLOCATABLE_REQUEST_STATUSES = ("Pending", "Approved", RESERVED)
+PENDING_REQUEST_STATUSES = ("Pending", "Approved")
+
+# recipient group -> red cell donor groups it can receive, in order of preference
+COMPATIBLE_DONORS = {
+    "O-": ("O-",),
+    "O+": ("O+", "O-"),
+    "A-": ("A-", "O-"),
+    "A+": ("A+", "A-", "O+", "O-"),
+    "B-": ("B-", "O-"),
+    "B+": ("B+", "B-", "O+", "O-"),
+    "AB-": ("AB-", "A-", "B-", "O-"),
+    "AB+": ("AB+", "AB-", "A+", "B+", "A-", "B-", "O+", "O-"),
+}
+
+URGENCY_RANK = {"Emergency": 0, "Urgent": 1, "Routine": 2}
+
+
+def donor_groups(recipient_group: str, exact_only: bool = False) -> tuple[str, ...]:
+    donors = COMPATIBLE_DONORS.get(recipient_group, (recipient_group,))
+    return donors[:1] if exact_only else donors
+
+
+def candidates_statement(donors: tuple[str, ...], limit: int, day: date):
+    """Ids of up to limit available, unexpired bags from donors, by preference then expiry."""
+    scans = []
+    for rank, group in enumerate(donors):
+        scan = (
+            select(BloodBag.id, BloodBag.expiry_date, literal(rank).label("rank"))
+            .where(BloodBag.blood_group == group, BloodBag.status == AVAILABLE, BloodBag.expiry_date >= day)
+            .order_by(BloodBag.expiry_date)
+            .limit(limit)
+            .subquery()
+        )
+        scans.append(select(scan))
+    merged = union_all(*scans).subquery()
+    return select(merged.c.id).order_by(merged.c.rank, merged.c.expiry_date).limit(limit)
+
+
+def _reserved_bags(request_id: str):
+    return select(BloodBag).where(BloodBag.request_id == request_id, BloodBag.status == RESERVED) \
+        .order_by(BloodBag.expiry_date).execution_options(populate_existing=True)
+
+
+async def allocate(db: AsyncSession, request_id: str, exact_only: bool = False,
+                   exhausted: Optional[set[str]] = None) -> Optional[BloodAllocation]:
+    """Reserve bags for a request up to units_required; None if the request is not open for allocation.
+
+    exhausted collects donor groups known to have no bags left in this transaction, so a
+    batch does not rescan them for every later request.
+    """
+    lock = (
+        update(BloodRequest)
+        .where(BloodRequest.id == request_id, BloodRequest.status.in_(ALLOCATABLE_REQUEST_STATUSES))
+        .values(status=BloodRequest.status)
+        .returning(BloodRequest.blood_group, BloodRequest.units_required, BloodRequest.status)
+        .execution_options(synchronize_session=False)
+    )
+    row = (await db.execute(lock)).one_or_none()
+    if row is None:
+        return None
+    group, required, status = row
+    reserved = (await db.execute(
+        select(func.count()).where(BloodBag.request_id == request_id, BloodBag.status == RESERVED)
+    )).scalar_one()
+    need = required - reserved
+    exhausted = exhausted if exhausted is not None else set()
+    today = date.today()
+    claim = (
+        update(BloodBag)
+        .where(BloodBag.status == AVAILABLE)
+        .values(status=RESERVED, request_id=request_id)
+        .returning(BloodBag.blood_group)
+        .execution_options(synchronize_session=False, blood_stock_tracked=True)
+    )
+    while need > 0:
+        donors = tuple(g for g in donor_groups(group, exact_only) if g not in exhausted)
+        ids = (await db.execute(candidates_statement(donors, need, today))).scalars().all() if donors else []
+        if not ids:
+            exhausted.update(donors)
+            break
+        # bags reserved by a concurrent allocation since the scan are not matched; rescan for the rest
+        groups = (await db.execute(claim.where(BloodBag.id.in_(ids)))).scalars().all()
+        await db.run_sync(apply_moves, [(g, AVAILABLE, RESERVED) for g in groups])
+        need -= len(groups)
+    if need <= 0 and status != RESERVED:
+        status = RESERVED
+        await db.execute(
+            update(BloodRequest).where(BloodRequest.id == request_id).values(status=RESERVED)
+            .execution_options(synchronize_session=False)
+        )
+    bags = (await db.execute(_reserved_bags(request_id))).scalars().all()
+    return BloodAllocation(
+        request_id=request_id,
+        blood_group=group,
+        status=status,
+        units_required=required,
+        bags=[BloodBagOut.model_validate(b) for b in bags],
+        shortfall=max(need, 0),
+    )
+
+
+async def allocate_pending(db: AsyncSession, exact_only: bool = False) -> list[BloodAllocation]:
+    """Allocate every pending/approved request in one transaction: most urgent first, then oldest."""
+    urgency = case(URGENCY_RANK, value=BloodRequest.urgency, else_=len(URGENCY_RANK))
+    pending = (
+        select(BloodRequest.id)
+        .where(BloodRequest.status.in_(PENDING_REQUEST_STATUSES))
+        .order_by(urgency, BloodRequest.request_date, BloodRequest.id)
+    )
+    exhausted: set[str] = set()
+    allocations = []
+    for request_id in (await db.execute(pending)).scalars().all():
+        allocation = await allocate(db, request_id, exact_only, exhausted)
+        if allocation is not None:
+            allocations.append(allocation)
+    return allocations
@@ -0,0 +1,207 @@
+"""Per-group blood stock in blood_units, derived from blood_bags in the transaction that writes them.
+
+blood_units.bags counts a group's Available bags and blood_units.reserved its Reserved
+ones; status follows from bags and the BLOOD_STOCK_* thresholds. Every ORM flush that
+creates, updates or deletes bags adjusts the affected groups with one
+UPDATE ... SET bags = bags + :n per group on the flushing connection, so the stock
+commits or rolls back with the bags. Bulk inserts are counted from their parameters.
+Other statements on blood_bags either report their moves through apply_moves (the
+allocator does) or have the stock rebuilt from one aggregate query before the
+transaction commits.
+
+How many bags expire within N days changes with the date rather than with writes, so
+it is counted when read, with a range scan on ix_blood_bags_status_expiry_date that only
+touches bags inside the window.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Optional
+from sqlalchemy import case, event, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, attributes
+from app.config import get_settings
+from app.models.blood_bank import BloodBag, BloodUnit
+from app.schemas.schemas import BloodStock, BloodStockCheck, BloodStockDrift
+from app.services.table_versions import bump_versions
+
+settings = get_settings()
+
+AVAILABLE = "Available"
+RESERVED = "Reserved"
+BLOOD_GROUPS = ("A+", "A-", "B+", "B-", "O+", "O-", "AB+", "AB-")
+
+# group -> [available, reserved] change
+Delta = dict[str, list[int]]
+
+
+def stock_status(bags: int) -> str:
+    if bags < settings.BLOOD_STOCK_CRITICAL_BELOW:
+        return "Critical"
+    if bags < settings.BLOOD_STOCK_LOW_BELOW:
+        return "Low"
+    return "Adequate"
+
+
+def _status_expr(bags):
+    return case(
+        (bags < settings.BLOOD_STOCK_CRITICAL_BELOW, "Critical"),
+        (bags < settings.BLOOD_STOCK_LOW_BELOW, "Low"),
+        else_="Adequate",
+    )
+
+
+def _count(delta: Delta, group: Optional[str], status: Optional[str], sign: int):
+    if status == AVAILABLE:
+        delta[group][0] += sign
+    elif status == RESERVED:
+        delta[group][1] += sign
+
+
+def _write_unit(conn, group: str, bags, reserved, missing_bags: int, missing_reserved: int):
+    """Set one group's counts (SQL expressions or values); create its row if there is none."""
+    status = stock_status(bags) if isinstance(bags, int) else _status_expr(bags)
+    stmt = update(BloodUnit).where(BloodUnit.group == group).values(bags=bags, reserved=reserved, status=status)
+    if conn.execute(stmt).rowcount == 0:
+        conn.execute(insert(BloodUnit).values(id=f"BU-{group}", group=group, bags=missing_bags,
+                                              reserved=missing_reserved, status=stock_status(missing_bags)))
+
+
+def apply_delta(session: Session, delta: Delta):
+    conn = session.connection()
+    written = False
+    for group, (available, reserved) in delta.items():
+        if available or reserved:
+            _write_unit(conn, group, BloodUnit.bags + available, BloodUnit.reserved + reserved,
+                        max(available, 0), max(reserved, 0))
+            written = True
+    if written:
+        bump_versions(session, {BloodUnit.__tablename__})
+
+
+def apply_moves(session: Session, moves: list[tuple[str, Optional[str], Optional[str]]]):
+    """Record bags that changed status through a Core statement, as (group, old status, new status);
+    None stands for a bag created or deleted. For use with session.run_sync."""
+    delta: Delta = defaultdict(lambda: [0, 0])
+    for group, old, new in moves:
+        _count(delta, group, old, -1)
+        _count(delta, group, new, 1)
+    apply_delta(session, delta)
+
+
+# ── Rebuild / verify ──
+
+def _aggregate_statement():
+    """Available and Reserved bags per group: one pass over the (blood_group, status, ...) index."""
+    return select(
+        BloodBag.blood_group,
+        func.sum(case((BloodBag.status == AVAILABLE, 1), else_=0)),
+        func.sum(case((BloodBag.status == RESERVED, 1), else_=0)),
+    ).group_by(BloodBag.blood_group)
+
+
+def _actual_and_stored(conn) -> tuple[dict[str, tuple[int, int]], dict[str, tuple[int, int]]]:
+    actual = {g: (a or 0, r or 0) for g, a, r in conn.execute(_aggregate_statement()).all()}
+    stored = {g: (b, r) for g, b, r in conn.execute(select(BloodUnit.group, BloodUnit.bags, BloodUnit.reserved)).all()}
+    return actual, stored
+
+
+def _check(actual: dict, stored: dict) -> BloodStockCheck:
+    drift = []
+    for group in sorted(set(BLOOD_GROUPS) | actual.keys() | stored.keys()):
+        counts = actual.get(group, (0, 0))
+        if stored.get(group) != counts:
+            held = stored.get(group, (0, 0))
+            drift.append(BloodStockDrift(group=group, stored_available=held[0], actual_available=counts[0],
+                                         stored_reserved=held[1], actual_reserved=counts[1]))
+    return BloodStockCheck(consistent=not drift, drift=drift)
+
+
+def verify(session: Session) -> BloodStockCheck:
+    """Compare blood_units with a fresh count; a group with no row counts as drift."""
+    return _check(*_actual_and_stored(session.connection()))
+
+
+def rebuild(session: Session) -> BloodStockCheck:
+    """Recount every group from blood_bags and correct the rows that drifted; returns what was corrected."""
+    conn = session.connection()
+    check = _check(*_actual_and_stored(conn))
+    for d in check.drift:
+        _write_unit(conn, d.group, d.actual_available, d.actual_reserved, d.actual_available, d.actual_reserved)
+    if check.drift:
+        bump_versions(session, {BloodUnit.__tablename__})
+    return check
+
+
+# ── Dashboard read ──
+
+async def stock(db: AsyncSession, expiring_days: int) -> list[BloodStock]:
+    today = date.today()
+    units = (await db.execute(select(BloodUnit).order_by(BloodUnit.group))).scalars().all()
+    window = (
+        select(BloodBag.blood_group,
+               func.sum(case((BloodBag.expiry_date < today, 0), else_=1)),
+               func.sum(case((BloodBag.expiry_date < today, 1), else_=0)))
+        .where(BloodBag.status == AVAILABLE, BloodBag.expiry_date <= today + timedelta(days=expiring_days))
+        .group_by(BloodBag.blood_group)
+    )
+    counts = {g: (expiring, expired) for g, expiring, expired in (await db.execute(window)).all()}
+    return [
+        BloodStock(group=u.group, available=u.bags, reserved=u.reserved, status=u.status,
+                   expiring=counts.get(u.group, (0, 0))[0], expired=counts.get(u.group, (0, 0))[1])
+        for u in units
+    ]
+
+
+# ── Write capture ──
+
+def _old(obj, attr):
+    hist = attributes.get_history(obj, attr)
+    return hist.deleted[0] if hist.deleted else getattr(obj, attr)
+
+
+@event.listens_for(Session, "after_flush")
+def _adjust_stock_for_flush(session, flush_context):
+    delta: Delta = defaultdict(lambda: [0, 0])
+    for obj in session.new:
+        if type(obj) is BloodBag:
+            _count(delta, obj.blood_group, obj.status, 1)
+    for obj in session.deleted:
+        if type(obj) is BloodBag:
+            _count(delta, _old(obj, "blood_group"), _old(obj, "status"), -1)
+    for obj in session.dirty:
+        if type(obj) is BloodBag and session.is_modified(obj):
+            _count(delta, _old(obj, "blood_group"), _old(obj, "status"), -1)
+            _count(delta, obj.blood_group, obj.status, 1)
+    if delta:
+        apply_delta(session, delta)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _adjust_stock_for_statement(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if orm_execute_state.statement.table.name != BloodBag.__tablename__:
+        return
+    if orm_execute_state.execution_options.get("blood_stock_tracked"):
+        return
+    params = orm_execute_state.parameters
+    rows = params if isinstance(params, list) else [params] if params else []
+    if orm_execute_state.is_insert and rows and all(isinstance(r, dict) and "blood_group" in r for r in rows):
+        # bulk insert: every new bag is in the parameters (an insert that fails rolls this back too)
+        delta: Delta = defaultdict(lambda: [0, 0])
+        for row in rows:
+            _count(delta, row["blood_group"], row.get("status", AVAILABLE), 1)
+        apply_delta(orm_execute_state.session, delta)
+    else:
+        orm_execute_state.session.info["blood_stock_rebuild"] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _rebuild_stock_before_commit(session):
+    if session.info.pop("blood_stock_rebuild", False):
+        rebuild(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stock_rebuild(session):
+    session.info.pop("blood_stock_rebuild", None)
@@ -0,0 +1,179 @@
+"""Bulk create/update/delete for entity routers: JSON-array or NDJSON bodies, chunked transactions, per-row results.
+
+Rows are validated against the entity's existing Create/Update schemas, then written
+BULK_CHUNK_SIZE at a time with one executemany per chunk and a commit after each
+chunk. If a chunk fails in the database, its rows are retried one by one so a single
+bad row does not fail its neighbours. These writes bypass the ORM unit of work, so the
+stats snapshot is told to rebuild afterwards.
+"""
+import json
+import uuid
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
+from app.database import get_db
+from app.schemas.schemas import BulkDeleteRequest, BulkResult, BulkRowResult
+from app.services.stats_snapshot import stats_snapshot
+
+settings = get_settings()
+
+
+def new_id(id_prefix: str = "") -> str:
+    return f"{id_prefix}{uuid.uuid4().hex[:6].upper()}" if id_prefix else str(uuid.uuid4())
+
+
+class _InvalidLine:
+    def __init__(self, error: str):
+        self.error = error
+
+
+async def read_bulk_body(request: Request) -> list:
+    """Parse a JSON array, or NDJSON when the content type says so. Unparseable NDJSON
+    lines come back as _InvalidLine so they can be reported against their index."""
+    body = await request.body()
+    if "ndjson" in request.headers.get("content-type", ""):
+        rows = []
+        for line in body.decode().splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as e:
+                rows.append(_InvalidLine(f"Invalid JSON: {e}"))
+    else:
+        try:
+            rows = json.loads(body or b"[]")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if len(rows) > settings.BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_MAX_ROWS} rows per bulk request")
+    return rows
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def summarise(results: list[BulkRowResult], ok_status: str) -> BulkResult:
+    results.sort(key=lambda r: r.index)
+    succeeded = sum(1 for r in results if r.status == ok_status)
+    return BulkResult(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+async def _write_chunk(db: AsyncSession, stmt, chunk: list[tuple[int, dict]], ok_status: str) -> list[BulkRowResult]:
+    try:
+        await db.execute(stmt, [values for _, values in chunk])
+        await db.commit()
+        return [BulkRowResult(index=i, id=values["id"], status=ok_status) for i, values in chunk]
+    except SQLAlchemyError:
+        await db.rollback()
+        if len(chunk) == 1:
+            raise
+    results = []
+    for row in chunk:
+        try:
+            results.extend(await _write_chunk(db, stmt, [row], ok_status))
+        except SQLAlchemyError as e:
+            results.append(BulkRowResult(index=row[0], id=row[1]["id"], status="error", errors=[str(getattr(e, "orig", e))]))
+    return results
+
+
+def validate_rows(rows: list, schema, results: list[BulkRowResult], with_id: bool = False) -> list[tuple[int, dict]]:
+    """Validate each row against schema; failures are appended to results. With with_id, each
+    row must carry a string "id" which is kept alongside the set fields (for updates)."""
+    valid = []
+    for i, raw in enumerate(rows):
+        if isinstance(raw, _InvalidLine):
+            results.append(BulkRowResult(index=i, status="error", errors=[raw.error]))
+            continue
+        if with_id and not (isinstance(raw, dict) and isinstance(raw.get("id"), str)):
+            results.append(BulkRowResult(index=i, status="error", errors=["Each row needs a string 'id'"]))
+            continue
+        try:
+            if with_id:
+                fields = {k: v for k, v in raw.items() if k != "id"}
+                valid.append((i, {**schema.model_validate(fields).model_dump(exclude_unset=True), "id": raw["id"]}))
+            else:
+                valid.append((i, schema.model_validate(raw).model_dump()))
+        except ValidationError as e:
+            results.append(BulkRowResult(index=i, id=raw.get("id") if with_id else None, status="error",
+                                         errors=e.errors(include_url=False, include_context=False)))
+    return valid
+
+
+async def bulk_create(db: AsyncSession, model_class, create_schema, rows: list, id_prefix: str = "") -> BulkResult:
+    results: list[BulkRowResult] = []
+    valid = [(i, {"id": new_id(id_prefix), **values}) for i, values in validate_rows(rows, create_schema, results)]
+    for chunk in _chunks(valid, settings.BULK_CHUNK_SIZE):
+        results.extend(await _write_chunk(db, insert(model_class), chunk, "created"))
+    _invalidate_stats(valid)
+    return summarise(results, "created")
+
+
+async def bulk_update(db: AsyncSession, model_class, update_schema, rows: list) -> BulkResult:
+    results: list[BulkRowResult] = []
+    valid = validate_rows(rows, update_schema, results, with_id=True)
+    for chunk in _chunks(valid, settings.BULK_CHUNK_SIZE):
+        ids = {values["id"] for _, values in chunk}
+        existing = set((await db.execute(select(model_class.id).where(model_class.id.in_(ids)))).scalars())
+        found = [(i, values) for i, values in chunk if values["id"] in existing]
+        results.extend(BulkRowResult(index=i, id=values["id"], status="not_found") for i, values in chunk if values["id"] not in existing)
+        if found:
+            results.extend(await _write_chunk(db, update(model_class), found, "updated"))
+    _invalidate_stats(valid)
+    return summarise(results, "updated")
+
+
+async def bulk_delete(db: AsyncSession, model_class, ids: list[str]) -> BulkResult:
+    if len(ids) > settings.BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_MAX_ROWS} rows per bulk request")
+    results: list[BulkRowResult] = []
+    indexed = list(enumerate(ids))
+    for chunk in _chunks(indexed, settings.BULK_CHUNK_SIZE):
+        chunk_ids = {item_id for _, item_id in chunk}
+        existing = set((await db.execute(select(model_class.id).where(model_class.id.in_(chunk_ids)))).scalars())
+        try:
+            await db.execute(delete(model_class).where(model_class.id.in_(existing)))
+            await db.commit()
+            ok_status = "deleted"
+            errors = None
+        except SQLAlchemyError as e:
+            await db.rollback()
+            ok_status = "error"
+            errors = [str(getattr(e, "orig", e))]
+        results.extend(
+            BulkRowResult(index=i, id=item_id, status=ok_status if item_id in existing else "not_found",
+                          errors=errors if item_id in existing else None)
+            for i, item_id in chunk
+        )
+    _invalidate_stats(indexed)
+    return summarise(results, "deleted")
+
+
+def _invalidate_stats(written: list):
+    if written and stats_snapshot is not None:
+        stats_snapshot.invalidate()
+
+
+def add_bulk_routes(router: APIRouter, model_class, create_schema, update_schema, id_prefix: str = ""):
+    """Register POST/PUT/DELETE {prefix}/bulk. Must run before the /{id} routes so "bulk" is not taken as an id."""
+
+    @router.post("/bulk", response_model=BulkResult)
+    async def create_bulk(request: Request, db: AsyncSession = Depends(get_db)):
+        """Create many rows from a JSON array or NDJSON (Content-Type: application/x-ndjson)."""
+        return await bulk_create(db, model_class, create_schema, await read_bulk_body(request), id_prefix)
+
+    @router.put("/bulk", response_model=BulkResult)
+    async def update_bulk(request: Request, db: AsyncSession = Depends(get_db)):
+        """Update many rows; each row carries its "id" plus the fields to change."""
+        return await bulk_update(db, model_class, update_schema, await read_bulk_body(request))
+
+    @router.delete("/bulk", response_model=BulkResult)
+    async def delete_bulk(data: BulkDeleteRequest, db: AsyncSession = Depends(get_db)):
+        return await bulk_delete(db, model_class, data.ids)
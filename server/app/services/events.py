@@ -0,0 +1,300 @@
+"""Change-event push for polled entity lists (OPD queue, beds, ambulances, notices).
+
+Writes to a registered model are collected per session at flush time and published to
+the in-process broker only after the transaction commits (a rollback discards them).
+The broker fans each event out to every subscriber of its topic with put_nowait on a
+bounded per-client queue, so a slow client can never hold up the writer or other
+clients: when a client's buffer is full it is cleared and replaced by a single "resync"
+event telling the client to refetch the list.
+
+With several workers each process has its own broker, so commits must also reach the
+others. EVENTS_FANOUT selects how:
+
+  - "none": single worker, nothing to forward.
+  - "unix": every worker binds a Unix datagram socket in EVENTS_SOCKET_DIR and sends
+    each committed event to all the other sockets there.
+  - "database": workers poll the table_versions counters and publish a "changed" event
+    for a topic whose table moved because of another process's write.
+"""
+import asyncio
+import glob
+import itertools
+import json
+import logging
+import os
+import socket
+from abc import ABC, abstractmethod
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.services.serialization import dumps
+from app.services.table_versions import table_versions
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# model class -> (topic, out schema)
+_TOPICS: dict[type, tuple[str, type]] = {}
+# table name -> topic, for statement-level and cross-process events
+_TABLE_TOPICS: dict[str, str] = {}
+_TOPIC_TABLES: dict[str, str] = {}
+
+
+def register_topic(topic: str, model_class, out_schema):
+    """Publish committed writes to model_class on topic, with rows serialised through out_schema."""
+    _TOPICS[model_class] = (topic, out_schema)
+    _TABLE_TOPICS[model_class.__tablename__] = topic
+    _TOPIC_TABLES[topic] = model_class.__tablename__
+
+
+def topics() -> list[str]:
+    return sorted(_TABLE_TOPICS.values())
+
+
+class Subscription:
+    """One connected client: the topics it follows and its bounded event buffer."""
+
+    def __init__(self, topics: set[str], buffer: int):
+        self.topics = topics
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+        self.dropped = 0
+
+    def offer(self, topic: str, message: str):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # too far behind to catch up event by event: tell it to refetch instead
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_encode({"topic": topic, "op": "resync"}))
+
+
+def _encode(payload: dict) -> str:
+    return dumps(payload).decode()
+
+
+class Broker:
+    def __init__(self, buffer: int):
+        self.buffer = buffer
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._seq = itertools.count(1)
+        self._fanout: Optional["_Fanout"] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len({s for subs in self._subscribers.values() for s in subs})
+
+    def subscribe(self, topics: set[str]) -> Subscription:
+        sub = Subscription(topics, self.buffer)
+        for topic in topics:
+            self._subscribers.setdefault(topic, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        for topic in sub.topics:
+            subs = self._subscribers.get(topic)
+            if subs is not None:
+                subs.discard(sub)
+
+    def deliver(self, payload: dict):
+        """Fan an event out to this process's subscribers only."""
+        subs = self._subscribers.get(payload["topic"])
+        if not subs:
+            return
+        payload["seq"] = next(self._seq)
+        message = _encode(payload)
+        for sub in subs:
+            sub.offer(payload["topic"], message)
+
+    def publish(self, payload: dict):
+        """Deliver locally and forward to the other workers."""
+        if self._fanout is not None:
+            self._fanout.forward(payload)
+        self.deliver(payload)
+
+    async def start(self):
+        if settings.EVENTS_FANOUT == "unix":
+            self._fanout = _UnixFanout(self, settings.EVENTS_SOCKET_DIR)
+        elif settings.EVENTS_FANOUT == "database":
+            self._fanout = _DatabaseFanout(self, settings.EVENTS_POLL_SECONDS)
+        if self._fanout is not None:
+            await self._fanout.start()
+
+    async def stop(self):
+        if self._fanout is not None:
+            await self._fanout.stop()
+            self._fanout = None
+
+
+broker = Broker(settings.EVENTS_CLIENT_BUFFER)
+
+
+# ── Cross-worker fan-out ──
+
+class _Fanout(ABC):
+    """Carries committed events between workers; subclasses receive in _run."""
+
+    def __init__(self, broker: Broker):
+        self.broker = broker
+        self._task: Optional[asyncio.Task] = None
+
+    def forward(self, payload: dict):
+        pass
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    @abstractmethod
+    async def _run(self):
+        """Receive other workers' events and hand them to the broker until cancelled."""
+
+
+class _UnixFanout(_Fanout):
+    def __init__(self, broker: Broker, directory: str):
+        super().__init__(broker)
+        self.directory = directory
+        self.path = os.path.join(directory, f"worker-{os.getpid()}.sock")
+        self.sock: Optional[socket.socket] = None
+
+    async def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(self.path)
+        self.sock.setblocking(False)
+        await super().start()
+
+    async def stop(self):
+        await super().stop()
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def forward(self, payload: dict):
+        if self.sock is None:
+            return
+        data = dumps(payload)
+        for peer in glob.glob(os.path.join(self.directory, "worker-*.sock")):
+            if peer == self.path:
+                continue
+            try:
+                self.sock.sendto(data, peer)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # the worker that owned this socket is gone
+                try:
+                    os.unlink(peer)
+                except FileNotFoundError:
+                    pass
+            except (BlockingIOError, OSError) as e:
+                # peer's receive buffer is full or the event is oversized: make its clients refetch
+                logger.warning("event fan-out to %s failed: %s", peer, e)
+                try:
+                    self.sock.sendto(dumps({"topic": payload["topic"], "op": "resync"}), peer)
+                except OSError:
+                    pass
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            data = await loop.sock_recv(self.sock, 262144)
+            try:
+                self.broker.deliver(json.loads(data))
+            except (ValueError, KeyError):
+                logger.warning("dropping malformed fan-out datagram")
+
+
+class _DatabaseFanout(_Fanout):
+    """Publishes "changed" for topics whose table_versions counter moved without a local commit."""
+
+    def __init__(self, broker: Broker, interval: float):
+        super().__init__(broker)
+        self.interval = interval
+        self._seen: dict[str, int] = {}
+
+    def forward(self, payload: dict):
+        # local commits are delivered directly; their counter bump (already applied to the
+        # table_versions cache by its own after_commit hook) must not be reported again
+        table = _TOPIC_TABLES[payload["topic"]]
+        self._seen[table] = max(self._seen.get(table, 0), table_versions.peek(table))
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                versions = await table_versions.refresh()
+            except Exception as e:  # keep polling through transient DB errors
+                logger.warning("table version poll failed: %s", e)
+                continue
+            for table, topic in _TABLE_TOPICS.items():
+                version, previous = versions.get(table), self._seen.get(table)
+                if version is None or (previous is not None and version <= previous):
+                    continue
+                self._seen[table] = version
+                if previous is not None:
+                    self.broker.deliver({"topic": topic, "op": "changed"})
+
+
+# ── Write capture ──
+
+def _row_payload(obj, out_schema) -> dict:
+    return out_schema.model_validate(obj).model_dump(mode="json")
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_events(session, flush_context):
+    if not _TOPICS:
+        return
+    pending = None
+    for op, objs in (("created", session.new), ("updated", session.dirty), ("deleted", session.deleted)):
+        for obj in objs:
+            entry = _TOPICS.get(type(obj))
+            if entry is None or (op == "updated" and not session.is_modified(obj)):
+                continue
+            topic, out_schema = entry
+            payload = {"topic": topic, "op": op, "id": obj.id}
+            if op != "deleted":
+                payload["data"] = _row_payload(obj, out_schema)
+            if pending is None:
+                pending = session.info.setdefault("change_events", [])
+            pending.append(payload)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement_events(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    topic = _TABLE_TOPICS.get(orm_execute_state.statement.table.name)
+    if topic is None:
+        return
+    params = orm_execute_state.parameters
+    rows = params if isinstance(params, list) else [params] if params else []
+    ids = [row["id"] for row in rows if isinstance(row, dict) and "id" in row]
+    payload = {"topic": topic, "op": "changed"}
+    if ids:
+        payload["ids"] = ids
+    session = orm_execute_state.session
+    session.info.setdefault("change_events", []).append(payload)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_events(session):
+    for payload in session.info.pop("change_events", ()):
+        broker.publish(payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_events(session):
+    session.info.pop("change_events", None)
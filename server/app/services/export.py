@@ -0,0 +1,77 @@
+"""Streaming NDJSON/CSV exports of entity lists in constant memory.
+
+Rows come from a server-side cursor (AsyncSession.stream with yield_per) and are
+serialised through the entity's Out schema one batch of EXPORT_BATCH_SIZE at a time;
+the session's identity map is weak-referencing, so each batch is freed once it is sent.
+The export opens its own read session inside the response body, because request-scoped
+dependencies are closed before a StreamingResponse starts sending.
+"""
+import csv
+import io
+import json
+from typing import Annotated, AsyncIterator, Literal
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+from app.config import get_settings
+from app.database import read_session
+from app.services.pagination import build_filtered_statement, build_list_query_model
+
+settings = get_settings()
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+class ExportQuery(BaseModel):
+    """Query parameters shared by every export endpoint."""
+    format: Literal["ndjson", "csv"] = "ndjson"
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+async def _stream_rows(stmt: Select, out_schema, fmt: str) -> AsyncIterator[str]:
+    columns = list(out_schema.model_fields)
+    async with read_session() as session:
+        result = await session.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            yield buffer.getvalue()
+        async for partition in result.scalars().partitions():
+            if fmt == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                for item in partition:
+                    row = out_schema.model_validate(item).model_dump(mode="json")
+                    writer.writerow(_csv_value(row[c]) for c in columns)
+                yield buffer.getvalue()
+            else:
+                yield "".join(out_schema.model_validate(item).model_dump_json() + "\n" for item in partition)
+
+
+def export_response(stmt: Select, out_schema, fmt: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        _stream_rows(stmt, out_schema, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
+
+
+def add_export_route(router: APIRouter, model_class, out_schema, filename: str,
+                     filter_fields: tuple[str, ...] = (), sort_fields: tuple[str, ...] = ()):
+    """Register GET {prefix}/export. Must run before the /{id} routes so "export" is not taken as an id."""
+    export_query_model = build_list_query_model(model_class, filter_fields, sort_fields, base=ExportQuery, name="ExportQuery")
+
+    @router.get("/export", response_class=StreamingResponse)
+    async def export(params: Annotated[export_query_model, Query()]):
+        """Stream every matching row as NDJSON (default) or CSV (?format=csv)."""
+        stmt = build_filtered_statement(model_class, params, filter_fields)
+        return export_response(stmt, out_schema, params.format, filename)
@@ -0,0 +1,183 @@
+"""Inventory stock: atomic dispense / receive, whole-prescription dispense and an append-only movement ledger.
+
+A stock change is one UPDATE inventory SET stock = stock + :change ... RETURNING; a
+dispense adds WHERE stock >= :quantity, so concurrent terminals can neither lose an
+update nor take stock below zero, and nothing is read before it is written. The same
+statement recomputes status from the new stock and the item's threshold, and the
+movement is appended to inventory_movements in the same transaction.
+
+Writes through the generic inventory routes keep the ledger and status consistent too:
+ORM saves get their status recomputed and an "opening" / "adjust" movement for any stock
+change, and bulk statements get theirs derived from their parameters before commit.
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Optional
+from sqlalchemy import case, event, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, attributes
+from app.models.inventory import InventoryItem, StockMovement
+from app.schemas.schemas import PrescriptionDispense, StockShortfall
+from app.services.table_versions import bump_versions
+
+OUT_OF_STOCK = "Out of Stock"
+LOW_STOCK = "Low Stock"
+IN_STOCK = "In Stock"
+DEFAULT_THRESHOLD = InventoryItem.__table__.c.threshold.default.arg
+
+
+class StockShortage(Exception):
+    def __init__(self, shortfalls: list[StockShortfall]):
+        super().__init__(f"Insufficient stock for {len(shortfalls)} item(s)")
+        self.shortfalls = shortfalls
+
+
+def inventory_status(stock: int, threshold: Optional[int]) -> str:
+    if stock <= 0:
+        return OUT_OF_STOCK
+    if stock < (threshold if threshold is not None else DEFAULT_THRESHOLD):
+        return LOW_STOCK
+    return IN_STOCK
+
+
+def _status_expr(stock, threshold):
+    return case((stock <= 0, OUT_OF_STOCK), (stock < threshold, LOW_STOCK), else_=IN_STOCK)
+
+
+def _move_statement(item_id: str, change: int):
+    new_stock = InventoryItem.stock + change
+    stmt = update(InventoryItem).where(InventoryItem.id == item_id)
+    if change < 0:
+        stmt = stmt.where(InventoryItem.stock >= -change)
+    return (
+        stmt.values(stock=new_stock, status=_status_expr(new_stock, InventoryItem.threshold),
+                    last_updated=date.today().isoformat())
+        .returning(InventoryItem)
+        .execution_options(synchronize_session=False, inventory_tracked=True)
+    )
+
+
+async def _apply(db: AsyncSession, changes: list[tuple[str, int]], reason: str,
+                 reference: Optional[str], note: Optional[str]) -> list[InventoryItem]:
+    """Apply (item_id, change) pairs; raises StockShortage listing every line that could not be
+    applied (the caller's transaction is then rolled back, so it is all or nothing)."""
+    items, movements, shortfalls = [], [], []
+    now = datetime.now()
+    for item_id, change in changes:
+        item = (await db.execute(_move_statement(item_id, change))).scalar_one_or_none()
+        if item is None:
+            available = (await db.execute(select(InventoryItem.stock).where(InventoryItem.id == item_id))).scalar_one_or_none()
+            shortfalls.append(StockShortfall(item_id=item_id, requested=-change, available=available))
+            continue
+        items.append(item)
+        movements.append({"item_id": item_id, "change": change, "stock_after": item.stock, "reason": reason,
+                          "reference": reference, "note": note, "created_at": now})
+    if shortfalls:
+        raise StockShortage(shortfalls)
+    await db.execute(insert(StockMovement), movements)
+    return items
+
+
+async def dispense(db: AsyncSession, item_id: str, quantity: int, reference: Optional[str] = None,
+                   note: Optional[str] = None) -> InventoryItem:
+    return (await _apply(db, [(item_id, -quantity)], "dispense", reference, note))[0]
+
+
+async def receive(db: AsyncSession, item_id: str, quantity: int, reference: Optional[str] = None,
+                  note: Optional[str] = None) -> InventoryItem:
+    return (await _apply(db, [(item_id, quantity)], "receive", reference, note))[0]
+
+
+async def dispense_prescription(db: AsyncSession, data: PrescriptionDispense) -> list[InventoryItem]:
+    """Dispense every line of a prescription or none of them. Lines for the same item are
+    merged, and items are updated in id order so concurrent batches lock rows consistently."""
+    quantities: dict[str, int] = defaultdict(int)
+    for line in data.lines:
+        quantities[line.item_id] += line.quantity
+    return await _apply(db, [(item_id, -quantities[item_id]) for item_id in sorted(quantities)],
+                        "dispense", data.reference, None)
+
+
+def movements_statement(item_id: str, limit: int, before: Optional[int] = None):
+    """An item's ledger, newest first; pass the last id seen as before for the next page."""
+    stmt = select(StockMovement).where(StockMovement.item_id == item_id)
+    if before is not None:
+        stmt = stmt.where(StockMovement.id < before)
+    return stmt.order_by(StockMovement.id.desc()).limit(limit)
+
+
+# ── Writes through the generic routes ──
+
+@event.listens_for(Session, "before_flush")
+def _ledger_for_orm_writes(session, flush_context, instances):
+    now = datetime.now()
+    for obj in list(session.new):
+        if type(obj) is InventoryItem:
+            obj.status = inventory_status(obj.stock or 0, obj.threshold)
+            if obj.stock:
+                session.add(StockMovement(item_id=obj.id, change=obj.stock, stock_after=obj.stock,
+                                          reason="opening", created_at=now))
+    for obj in list(session.dirty):
+        if type(obj) is InventoryItem and session.is_modified(obj):
+            obj.status = inventory_status(obj.stock, obj.threshold)
+            old = attributes.get_history(obj, "stock").deleted
+            if old and old[0] != obj.stock:
+                session.add(StockMovement(item_id=obj.id, change=obj.stock - old[0], stock_after=obj.stock,
+                                          reason="adjust", created_at=now))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _ledger_for_statements(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if orm_execute_state.statement.table.name != InventoryItem.__tablename__:
+        return
+    if orm_execute_state.execution_options.get("inventory_tracked"):
+        return
+    if orm_execute_state.is_delete:
+        return  # an item's history outlives it
+    session = orm_execute_state.session
+    pending = session.info.setdefault("inventory_pending", {"movements": [], "ids": set(), "all": False})
+    params = orm_execute_state.parameters
+    rows = params if isinstance(params, list) else [params] if params else []
+    if not rows or not all(isinstance(r, dict) and "id" in r for r in rows):
+        pending["all"] = True
+        return
+    now = datetime.now()
+    pending["ids"].update(r["id"] for r in rows)
+    if orm_execute_state.is_insert:
+        pending["movements"].extend(
+            {"item_id": r["id"], "change": r["stock"], "stock_after": r["stock"], "reason": "opening", "created_at": now}
+            for r in rows if r.get("stock")
+        )
+        return
+    # bulk update by primary key: read the stock it is about to overwrite
+    changed = {r["id"]: r["stock"] for r in rows if "stock" in r}
+    if changed:
+        old = dict(session.connection().execute(
+            select(InventoryItem.id, InventoryItem.stock).where(InventoryItem.id.in_(changed))
+        ).all())
+        pending["movements"].extend(
+            {"item_id": item_id, "change": stock - old[item_id], "stock_after": stock, "reason": "adjust", "created_at": now}
+            for item_id, stock in changed.items() if item_id in old and old[item_id] != stock
+        )
+
+
+@event.listens_for(Session, "before_commit")
+def _finish_statement_ledger(session):
+    pending = session.info.pop("inventory_pending", None)
+    if pending is None:
+        return
+    conn = session.connection()
+    if pending["movements"]:
+        conn.execute(insert(StockMovement), pending["movements"])
+    recompute = update(InventoryItem).values(status=_status_expr(InventoryItem.stock, InventoryItem.threshold))
+    if not pending["all"]:
+        recompute = recompute.where(InventoryItem.id.in_(pending["ids"]))
+    conn.execute(recompute)
+    bump_versions(session, {InventoryItem.__tablename__, StockMovement.__tablename__})
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_statement_ledger(session):
+    session.info.pop("inventory_pending", None)
@@ -0,0 +1,143 @@
+"""In-process request, database and AI-call metrics, rendered in the Prometheus text format.
+
+Metric objects are created once per (method, route template) and then only have their
+integer/float slots bumped, so recording is a dict lookup plus a few additions. Everything
+runs on the event-loop thread (SQLAlchemy cursor events fire in the same greenlet as the
+awaiting request), which is what makes the plain increments safe without locks.
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+AI_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts are per bucket and made cumulative only when rendered."""
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str, out: list):
+        cumulative = 0
+        for bound, n in zip(self.bounds, self.counts):
+            cumulative += n
+            out.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        out.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        out.append(f"{name}_sum{{{labels}}} {self.sum}")
+        out.append(f"{name}_count{{{labels}}} {self.count}")
+
+
+class RouteMetrics:
+    __slots__ = ("labels", "statuses", "latency", "size", "db_queries", "db_seconds")
+
+    def __init__(self, method: str, route: str):
+        self.labels = f'method="{method}",route="{route}"'
+        self.statuses: dict[int, int] = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.db_queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.db_seconds = Histogram(LATENCY_BUCKETS)
+
+    def record(self, status: int, seconds: float, size: int, db: list):
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.latency.observe(seconds)
+        self.size.observe(size)
+        self.db_queries.observe(db[0])
+        self.db_seconds.observe(db[1])
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+        self.ai_calls: dict[tuple[str, str], Histogram] = {}
+        self.in_flight = 0
+        self.db_queries_total = 0
+        self.db_seconds_total = 0.0
+
+    def route(self, method: str, route: str) -> RouteMetrics:
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics(method, route)
+        return metrics
+
+    def observe_ai_call(self, model: str, outcome: str, seconds: float):
+        hist = self.ai_calls.get((model, outcome))
+        if hist is None:
+            hist = self.ai_calls[(model, outcome)] = Histogram(AI_LATENCY_BUCKETS)
+        hist.observe(seconds)
+
+    def render(self) -> str:
+        out: list[str] = []
+        routes = list(self.routes.values())
+
+        out += ["# HELP http_requests_total Requests handled, by route template and status code.",
+                "# TYPE http_requests_total counter"]
+        for m in routes:
+            for status, n in sorted(m.statuses.items()):
+                out.append(f'http_requests_total{{{m.labels},status="{status}"}} {n}')
+        out += ["# HELP http_requests_in_progress Requests currently being handled.",
+                "# TYPE http_requests_in_progress gauge",
+                f"http_requests_in_progress {self.in_flight}"]
+        for name, attr, help_text in (
+            ("http_request_duration_seconds", "latency", "Time from request start to the last response byte."),
+            ("http_response_size_bytes", "size", "Response body size."),
+            ("http_request_db_queries", "db_queries", "SQL statements executed per request."),
+            ("http_request_db_seconds", "db_seconds", "Time spent executing SQL per request."),
+        ):
+            out += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for m in routes:
+                getattr(m, attr).render(name, m.labels, out)
+        out += ["# HELP db_queries_total SQL statements executed, including outside requests.",
+                "# TYPE db_queries_total counter",
+                f"db_queries_total {self.db_queries_total}",
+                "# HELP db_query_seconds_total Time spent executing SQL.",
+                "# TYPE db_query_seconds_total counter",
+                f"db_query_seconds_total {self.db_seconds_total}",
+                "# HELP ai_request_duration_seconds Model API call latency, by model and outcome.",
+                "# TYPE ai_request_duration_seconds histogram"]
+        for (model, outcome), hist in list(self.ai_calls.items()):
+            hist.render("ai_request_duration_seconds", f'model="{model}",outcome="{outcome}"', out)
+        return "\n".join(out) + "\n"
+
+
+registry = MetricsRegistry()
+
+# [query_count, query_seconds] of the request running in the current context
+request_db_stats: ContextVar[Optional[list]] = ContextVar("request_db_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    registry.db_queries_total += 1
+    registry.db_seconds_total += elapsed
+    stats = request_db_stats.get()
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += elapsed
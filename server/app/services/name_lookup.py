@@ -0,0 +1,358 @@
+"""Typo-tolerant patient name lookup: a trigram index over Patient.name and every patient_name column.
+
+Names are indexed by their words. name_index has one row per distinct name with its
+normalised form (' ' || lower(trim(name)) || ' '); name_refs counts how many rows of
+each source table carry it, so a name leaves the index with its last row. word_index
+is the vocabulary of name words with the number of names using each, name_words links
+words to those names, and word_trigrams is the vocabulary's trigram posting list. Like
+the search index this is derived data outside Base.metadata: init_db calls
+ensure_name_index, and per-row triggers on the source tables keep it current inside
+the writing transaction — a repeated name costs one counter update, a new one a few
+word links, and only a word never seen before gets trigram postings. Words and
+trigrams are cut in SQL against name_positions (1..NAME_MAX_LENGTH), since triggers
+cannot run recursive CTEs.
+
+Trigram postings over the vocabulary stay short however many patients there are, which
+postings over whole names would not ("an " is in most of a million names). A lookup
+first finds the vocabulary words most similar to each query word: a word with trigram
+Jaccard similarity >= s = NAME_LOOKUP_WORD_SIMILARITY shares at least ceil(s * |G|) of
+the query word's |G| trigrams, so one grouped pass over those postings finds them all.
+Names containing a match for the rarest query word (and for the next one, when the
+query has several) are then scored by trigram similarity of the whole name, or, when
+higher, by how well each query word matches one of the name's words.
+"""
+import math
+import string
+from collections import defaultdict
+from typing import Optional
+from sqlalchemy import Column, Integer, MetaData, String, Table, exists, func, literal, or_, select, text, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
+from app.models.appointment import Appointment
+from app.models.blood_bank import BloodRequest
+from app.models.invoice import Invoice
+from app.models.lab import LabTestRequest, RadiologyRequest
+from app.models.patient import Patient
+from app.models.referral import Referral
+from app.models.research import QueueItem
+from app.schemas.schemas import NameMatch
+
+settings = get_settings()
+
+NAME_COLUMNS = (
+    Patient.name, Appointment.patient_name, Invoice.patient_name, LabTestRequest.patient_name,
+    RadiologyRequest.patient_name, Referral.patient_name, BloodRequest.patient_name, QueueItem.patient_name,
+)
+# source table -> name column
+SOURCES = {c.table.name: c.name for c in NAME_COLUMNS}
+
+# query-side descriptions of the index tables; ensure_name_index creates them, not create_all
+_tables = MetaData()
+_name_index = Table("name_index", _tables, Column("id", Integer), Column("name", String), Column("norm", String))
+_name_refs = Table("name_refs", _tables, Column("name_id", Integer), Column("source", String), Column("n", Integer))
+_word_index = Table("word_index", _tables, Column("id", Integer), Column("word", String), Column("names", Integer))
+_name_words = Table("name_words", _tables, Column("word_id", Integer), Column("name_id", Integer))
+_word_trigrams = Table("word_trigrams", _tables, Column("gram", String), Column("word_id", Integer))
+
+_ready = False
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def normalize(name: str) -> str:
+    """Python twin of the triggers' ' ' || lower(trim(name)) || ' ' (SQLite's lower() is ASCII-only)."""
+    return f" {name.strip(' ').translate(_ASCII_LOWER)} "
+
+
+def trigrams(padded: str) -> set[str]:
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def word_trigrams(word: str) -> set[str]:
+    """The trigrams the index holds for a vocabulary word."""
+    return trigrams(f" {word} ")
+
+
+def similarity(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+def word_similarity(a: set[str], b: set[str]) -> float:
+    """Trigram Dice coefficient of two words: kinder than Jaccard to a swapped or missing letter
+    in a short word ("jonhson" / "johnson" 0.43 rather than 0.27)."""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def name_score(grams: set[str], query_words: list[set[str]], norm: str) -> float:
+    """The better of whole-name similarity and the mean of each query word's best match among the
+    name's words, so one misspelled word still finds the full names containing it."""
+    name_words = [word_trigrams(w) for w in norm.split()]
+    if not query_words or not name_words:
+        return similarity(grams, trigrams(norm))
+    per_word = sum(max(word_similarity(q, w) for w in name_words) for q in query_words) / len(query_words)
+    return max(similarity(grams, trigrams(norm)), per_word)
+
+
+# ── Index maintenance (SQLite) ──
+
+def _norm_sql(expr: str) -> str:
+    return f"' ' || lower(trim({expr})) || ' '"
+
+
+def _words_sql(names: str) -> str:
+    """(word, name_id) for the words of the name_index rows selected by names."""
+    return (
+        "SELECT word, name_id FROM (SELECT DISTINCT "
+        "substr(n.norm, p.i + 1, instr(substr(n.norm, p.i + 1), ' ') - 1) AS word, n.id AS name_id "
+        f"FROM ({names}) n JOIN name_positions p ON p.i < length(n.norm) AND substr(n.norm, p.i, 1) = ' ') "
+        "WHERE word <> ''"
+    )
+
+
+def _grams_sql(words: str) -> str:
+    """(gram, word_id) for the word_index rows selected by words."""
+    return ("SELECT DISTINCT substr(' ' || w.word || ' ', p.i, 3) AS gram, w.id AS word_id "
+            f"FROM ({words}) w JOIN name_positions p ON p.i <= length(w.word)")
+
+
+def _add_name(expr: str, source: str) -> str:
+    """Statements counting one more source row for the name expr, indexing the name if it is new."""
+    words = _words_sql(f"SELECT id, norm FROM name_index WHERE name = {expr} AND linked IS NULL")
+    new_words = f"SELECT id, word FROM word_index WHERE names = 0 AND word IN (SELECT word FROM ({words}))"
+    return (
+        f"INSERT INTO name_index(name, norm) VALUES ({expr}, {_norm_sql(expr)}) ON CONFLICT (name) DO NOTHING; "
+        f"INSERT INTO word_index(word, names) SELECT word, 0 FROM ({words}) WHERE true ON CONFLICT (word) DO NOTHING; "
+        f"INSERT INTO word_trigrams(gram, word_id) {_grams_sql(new_words)}; "
+        f"INSERT INTO name_words(word_id, name_id) SELECT w.id, x.name_id FROM ({words}) x "
+        f"JOIN word_index w ON w.word = x.word; "
+        f"UPDATE word_index SET names = names + 1 WHERE word IN (SELECT word FROM ({words})); "
+        f"UPDATE name_index SET linked = 1 WHERE name = {expr} AND linked IS NULL; "
+        f"INSERT INTO name_refs(name_id, source, n) SELECT id, '{source}', 1 FROM name_index WHERE name = {expr} "
+        f"ON CONFLICT (name_id, source) DO UPDATE SET n = n + 1; "
+    )
+
+
+def _drop_name(expr: str, source: str) -> str:
+    """Statements counting one source row less for the name expr, unindexing it after its last row."""
+    name_id = f"(SELECT id FROM name_index WHERE name = {expr})"
+    gone = (f"SELECT id, norm FROM name_index WHERE name = {expr} "
+            f"AND NOT EXISTS (SELECT 1 FROM name_refs r WHERE r.name_id = name_index.id)")
+    words = _words_sql(gone)
+    dead_words = f"SELECT id, word FROM word_index WHERE names <= 0 AND word IN (SELECT word FROM ({words}))"
+    return (
+        f"UPDATE name_refs SET n = n - 1 WHERE name_id = {name_id} AND source = '{source}'; "
+        f"DELETE FROM name_refs WHERE name_id = {name_id} AND source = '{source}' AND n <= 0; "
+        f"UPDATE word_index SET names = names - 1 WHERE word IN (SELECT word FROM ({words})); "
+        f"DELETE FROM name_words WHERE (word_id, name_id) IN "
+        f"(SELECT w.id, x.name_id FROM ({words}) x JOIN word_index w ON w.word = x.word); "
+        f"DELETE FROM word_trigrams WHERE (gram, word_id) IN ({_grams_sql(dead_words)}); "
+        f"DELETE FROM word_index WHERE id IN (SELECT id FROM ({dead_words})); "
+        f"DELETE FROM name_index WHERE id IN (SELECT id FROM ({gone})); "
+    )
+
+
+def _trigger_ddl(table: str, column: str) -> dict[str, str]:
+    return {
+        f"names_{table}_ai": f"CREATE TRIGGER names_{table}_ai AFTER INSERT ON {table} "
+                             f"WHEN new.{column} IS NOT NULL BEGIN {_add_name(f'new.{column}', table)}END",
+        f"names_{table}_au": f"CREATE TRIGGER names_{table}_au AFTER UPDATE OF {column} ON {table} "
+                             f"WHEN old.{column} IS NOT new.{column} BEGIN "
+                             f"{_drop_name(f'old.{column}', table)}{_add_name(f'new.{column}', table)}END",
+        f"names_{table}_ad": f"CREATE TRIGGER names_{table}_ad AFTER DELETE ON {table} "
+                             f"WHEN old.{column} IS NOT NULL BEGIN {_drop_name(f'old.{column}', table)}END",
+    }
+
+
+_TABLES = {
+    "name_index": "CREATE TABLE IF NOT EXISTS name_index (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, "
+                  "norm TEXT NOT NULL, linked INTEGER)",
+    "name_refs": "CREATE TABLE IF NOT EXISTS name_refs (name_id INTEGER NOT NULL, source TEXT NOT NULL, "
+                 "n INTEGER NOT NULL, PRIMARY KEY (name_id, source)) WITHOUT ROWID",
+    "word_index": "CREATE TABLE IF NOT EXISTS word_index (id INTEGER PRIMARY KEY, word TEXT NOT NULL UNIQUE, "
+                  "names INTEGER NOT NULL)",
+    "name_words": "CREATE TABLE IF NOT EXISTS name_words (word_id INTEGER NOT NULL, name_id INTEGER NOT NULL, "
+                  "PRIMARY KEY (word_id, name_id)) WITHOUT ROWID",
+    "word_trigrams": "CREATE TABLE IF NOT EXISTS word_trigrams (gram TEXT NOT NULL, word_id INTEGER NOT NULL, "
+                     "PRIMARY KEY (gram, word_id)) WITHOUT ROWID",
+}
+
+
+async def _rebuild(conn):
+    for table in _TABLES:
+        await conn.execute(text(f"DELETE FROM {table}"))
+    rows = " UNION ALL ".join(
+        f"SELECT {column} AS name, '{table}' AS source FROM {table} WHERE {column} IS NOT NULL"
+        for table, column in SOURCES.items()
+    )
+    await conn.execute(text(f"CREATE TEMP TABLE name_refs_load AS SELECT name, source, count(*) AS n FROM ({rows}) "
+                            f"GROUP BY name, source"))
+    await conn.execute(text(f"INSERT INTO name_index(name, norm, linked) SELECT DISTINCT name, {_norm_sql('name')}, 1 "
+                            f"FROM name_refs_load"))
+    await conn.execute(text("INSERT INTO name_refs(name_id, source, n) SELECT i.id, l.source, l.n "
+                            "FROM name_refs_load l JOIN name_index i ON i.name = l.name"))
+    await conn.execute(text("DROP TABLE name_refs_load"))
+    await conn.execute(text(f"CREATE TEMP TABLE name_words_load AS {_words_sql('SELECT id, norm FROM name_index')}"))
+    await conn.execute(text("INSERT INTO word_index(word, names) SELECT word, count(*) FROM name_words_load "
+                            "GROUP BY word"))
+    await conn.execute(text("INSERT INTO name_words(word_id, name_id) SELECT w.id, x.name_id "
+                            "FROM name_words_load x JOIN word_index w ON w.word = x.word"))
+    await conn.execute(text("DROP TABLE name_words_load"))
+    await conn.execute(text(f"INSERT INTO word_trigrams(gram, word_id) {_grams_sql('SELECT id, word FROM word_index')}"))
+
+
+async def ensure_name_index(conn):
+    """Create the name index tables and triggers where missing; refill the index if any trigger was missing."""
+    global _ready
+    if conn.dialect.name != "sqlite":
+        return
+    for ddl in _TABLES.values():
+        await conn.execute(text(ddl))
+    await conn.execute(text("CREATE TABLE IF NOT EXISTS name_positions (i INTEGER PRIMARY KEY)"))
+    if (await conn.execute(text("SELECT max(i) FROM name_positions"))).scalar() != settings.NAME_MAX_LENGTH:
+        await conn.execute(text("DELETE FROM name_positions"))
+        await conn.execute(text("INSERT INTO name_positions(i) VALUES (:i)"),
+                           [{"i": i} for i in range(1, settings.NAME_MAX_LENGTH + 1)])
+    existing = set((await conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'"))).scalars())
+    missing = False
+    for table, column in SOURCES.items():
+        for name, ddl in _trigger_ddl(table, column).items():
+            if name not in existing:
+                await conn.execute(text(ddl))
+                missing = True
+    if missing:
+        await _rebuild(conn)
+    _ready = True
+
+
+async def drop_name_triggers(conn):
+    """For bulk loads: stop per-row index maintenance; ensure_name_index restores it and refills the index."""
+    if not _ready:
+        return
+    for table, column in SOURCES.items():
+        for name in _trigger_ddl(table, column):
+            await conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+
+
+async def rebuild_name_index(conn) -> bool:
+    """Refill the index from the source tables; False on backends without it."""
+    if not _ready:
+        return False
+    await _rebuild(conn)
+    return True
+
+
+# ── Lookup ──
+
+async def _similar_words(db: AsyncSession, words: list[str]) -> list[list[tuple[int, int]]]:
+    """For each query word, (word_id, names) of up to NAME_LOOKUP_WORDS_PER_TERM vocabulary words
+    sharing enough of its trigrams, most similar first; one statement for all the words."""
+    branches = []
+    for term, word in enumerate(words):
+        grams = word_trigrams(word)
+        need = max(1, math.ceil(settings.NAME_LOOKUP_WORD_SIMILARITY * len(grams)))
+        hits = (
+            select(_word_trigrams.c.word_id, func.count().label("hits"))
+            .where(_word_trigrams.c.gram.in_(grams))
+            .group_by(_word_trigrams.c.word_id)
+            .having(func.count() >= need)
+            .subquery()
+        )
+        # a word of n characters has (at most) n trigrams
+        score = hits.c.hits * 1.0 / (len(grams) + func.length(_word_index.c.word) - hits.c.hits)
+        best = (
+            select(literal(term).label("term"), _word_index.c.id, _word_index.c.names)
+            .join_from(hits, _word_index, _word_index.c.id == hits.c.word_id)
+            .order_by(score.desc())
+            .limit(settings.NAME_LOOKUP_WORDS_PER_TERM)
+            .subquery()
+        )
+        branches.append(select(best))
+    similar: list[list[tuple[int, int]]] = [[] for _ in words]
+    for term, word_id, names in await db.execute(union_all(*branches)):
+        similar[term].append((word_id, names))
+    return similar
+
+
+def _names_with(first: list[int], second: Optional[list[int]], limit: int):
+    """Names containing one of the first words (and one of the second, if given)."""
+    a, b = _name_words.alias("a"), _name_words.alias("b")
+    stmt = (
+        select(_name_index.c.name, _name_index.c.norm)
+        .join_from(a, _name_index, _name_index.c.id == a.c.name_id)
+        .where(a.c.word_id.in_(first))
+        .limit(limit)
+    )
+    if second is not None:
+        stmt = stmt.where(exists().where(b.c.word_id.in_(second), b.c.name_id == a.c.name_id))
+    return stmt
+
+
+async def _candidates(db: AsyncSession, norm: str) -> list[tuple[str, str]]:
+    """(name, norm) of names with a match for both of the query's two rarest words, or if none
+    has, for either of them."""
+    words = list(dict.fromkeys(w for w in norm.split(" ") if w))
+    matched = [s for s in await _similar_words(db, words) if s]
+    if not matched:
+        return []
+    # rarest first: the fewest names to walk
+    first, second = ([word_id for word_id, _ in s] for s in
+                     (sorted(matched, key=lambda s: sum(names for _, names in s)) * 2)[:2])
+    cap = settings.NAME_LOOKUP_CANDIDATES
+    if len(matched) > 1:
+        rows = (await db.execute(_names_with(first, second, cap))).all()
+        if rows:
+            return rows
+        return (await db.execute(union_all(*(select(_names_with(ids, None, cap // 2).subquery()) for ids in (first, second))))).all()
+    return (await db.execute(_names_with(first, None, cap))).all()
+
+
+async def _candidates_like(db: AsyncSession, q: str) -> list[tuple[str, str]]:
+    """Backends without the index: names containing any word of the query (not typo tolerant)."""
+    words = q.split()
+    names = set()
+    for column in NAME_COLUMNS:
+        stmt = select(column).where(or_(*(func.lower(column).contains(w.lower(), autoescape=True) for w in words))) \
+            .distinct().limit(settings.NAME_LOOKUP_CANDIDATES)
+        names.update((await db.execute(stmt)).scalars())
+    return [(n, normalize(n)) for n in names]
+
+
+async def _references(db: AsyncSession, names: list[str]) -> dict[str, dict[str, int]]:
+    refs: dict[str, dict[str, int]] = {n: {} for n in names}
+    if _ready:
+        rows = await db.execute(
+            select(_name_index.c.name, _name_refs.c.source, _name_refs.c.n)
+            .join_from(_name_index, _name_refs, _name_refs.c.name_id == _name_index.c.id)
+            .where(_name_index.c.name.in_(names))
+        )
+        for name, source, n in rows:
+            refs[name][source] = n
+    return refs
+
+
+async def lookup(db: AsyncSession, q: str, limit: int, min_similarity: float) -> list[NameMatch]:
+    """The limit names most similar to q (at least min_similarity), with the patients carrying each
+    name and how many rows of each source table reference it."""
+    norm = normalize(q)
+    if not norm.strip():
+        return []
+    grams = trigrams(norm)
+    query_words = [word_trigrams(w) for w in dict.fromkeys(norm.split())]
+    # by name: a name with words from both sets comes back from each side of the union fallback
+    candidates = dict(await (_candidates(db, norm) if _ready else _candidates_like(db, q)))
+    scored = sorted(((name_score(grams, query_words, n), name) for name, n in candidates.items()), key=lambda s: (-s[0], s[1]))
+    top = [(score, name) for score, name in scored if score >= min_similarity][:limit]
+    if not top:
+        return []
+    names = [name for _, name in top]
+    patient_ids: dict[str, list[str]] = defaultdict(list)
+    rows = await db.execute(select(Patient.name, Patient.id).where(Patient.name.in_(names)).order_by(Patient.id))
+    for name, patient_id in rows:
+        patient_ids[name].append(patient_id)
+    refs = await _references(db, names)
+    return [NameMatch(name=name, similarity=round(score, 4), patient_ids=patient_ids[name], references=refs[name])
+            for score, name in top]
@@ -0,0 +1,115 @@
+"""OPD token allocation and call-next for the outpatient queue.
+
+Tokens come from opd_token_sequences, one row per (department, doctor, day) — doctor is
+"" when OPD_TOKEN_SCOPE is "department". A token is taken with a single
+UPDATE ... SET last_token = last_token + 1 ... RETURNING in the same transaction as the
+queue row insert, so concurrent terminals serialise on that row and a failed check-in
+rolls its number back: the sequence has no gaps and no duplicates.
+
+"Call next" picks the first waiting entry for the day in (priority desc, token) order —
+an index seek on ix_opd_queue_call_order — and claims it with a conditional
+UPDATE ... WHERE status = 'Waiting'. If another terminal claimed the same entry first the
+update matches nothing and the next candidate is tried.
+"""
+from datetime import date, datetime
+from typing import Optional
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
+from app.models.research import QueueItem, QueueTokenSequence
+from app.schemas.schemas import BulkResult, BulkRowResult, QueueIssue
+from app.services.bulk import new_id, summarise, validate_rows
+
+settings = get_settings()
+
+WAITING = "Waiting"
+CALLED = "In Consultation"
+
+
+def _sequence_key(department: str, doctor_name: str, day: date) -> tuple[str, str, date]:
+    return department, doctor_name if settings.OPD_TOKEN_SCOPE == "doctor" else "", day
+
+
+async def next_token(db: AsyncSession, department: str, doctor_name: str, day: date) -> int:
+    department, doctor, day = _sequence_key(department, doctor_name, day)
+    seq = QueueTokenSequence
+    bump = (
+        update(seq)
+        .where(seq.department == department, seq.doctor_name == doctor, seq.queue_date == day)
+        .values(last_token=seq.last_token + 1)
+        .returning(seq.last_token)
+        .execution_options(synchronize_session=False)
+    )
+    token = (await db.execute(bump)).scalar_one_or_none()
+    if token is None:
+        # first token of the day for this key; if another terminal creates the row first, use theirs
+        try:
+            async with db.begin_nested():
+                await db.execute(insert(seq).values(department=department, doctor_name=doctor, queue_date=day,
+                                                    last_token=settings.OPD_TOKEN_START - 1))
+        except IntegrityError:
+            pass
+        token = (await db.execute(bump)).scalar_one()
+    return token
+
+
+async def issue_token(db: AsyncSession, data: QueueIssue) -> QueueItem:
+    today = date.today()
+    item = QueueItem(
+        id=new_id("Q-"),
+        token_number=await next_token(db, data.department, data.doctor_name, today),
+        status=WAITING,
+        queue_date=today,
+        issued_at=datetime.now(),
+        **data.model_dump(),
+    )
+    db.add(item)
+    await db.flush()
+    return item
+
+
+async def issue_tokens(db: AsyncSession, rows: list) -> BulkResult:
+    """Bulk check-in: each valid row gets its token as issue_token would, in its own savepoint,
+    committing every BULK_CHUNK_SIZE rows so the sequence rows are not held for the whole batch."""
+    results: list[BulkRowResult] = []
+    for n, (i, values) in enumerate(validate_rows(rows, QueueIssue, results), 1):
+        try:
+            async with db.begin_nested():
+                item = await issue_token(db, QueueIssue(**values))
+            results.append(BulkRowResult(index=i, id=item.id, status="created"))
+        except SQLAlchemyError as e:
+            results.append(BulkRowResult(index=i, status="error", errors=[str(getattr(e, "orig", e))]))
+        if n % settings.BULK_CHUNK_SIZE == 0:
+            await db.commit()
+    return summarise(results, "created")
+
+
+def waiting_statement(department: str, doctor_name: Optional[str] = None, day: Optional[date] = None):
+    """Today's waiting entries for a department (optionally one doctor) in call order."""
+    stmt = select(QueueItem).where(
+        QueueItem.department == department,
+        QueueItem.queue_date == (day or date.today()),
+        QueueItem.status == WAITING,
+    )
+    if doctor_name:
+        stmt = stmt.where(QueueItem.doctor_name == doctor_name)
+    return stmt.order_by(QueueItem.priority.desc(), QueueItem.token_number)
+
+
+async def call_next(db: AsyncSession, department: str, doctor_name: Optional[str] = None) -> Optional[QueueItem]:
+    """Claim the next waiting patient, or return None when nobody is waiting."""
+    claim = (
+        update(QueueItem)
+        .where(QueueItem.id == bindparam("item_id"), QueueItem.status == WAITING)
+        .values(status=CALLED, called_at=datetime.now())
+        .execution_options(synchronize_session=False)
+    )
+    candidates = waiting_statement(department, doctor_name).with_only_columns(QueueItem.id)
+    while True:
+        item_id = (await db.execute(candidates.limit(1))).scalar_one_or_none()
+        if item_id is None:
+            return None
+        # losing the race means another terminal took this patient; the queue got shorter, so retry
+        if (await db.execute(claim, {"item_id": item_id})).rowcount == 1:
+            return await db.get(QueueItem, item_id, populate_existing=True)
@@ -0,0 +1,122 @@
+"""Keyset (cursor) pagination, filtering and sorting helpers for list endpoints."""
+import base64
+import json
+from datetime import date, datetime, time
+from typing import Literal, Optional
+from fastapi import HTTPException
+from pydantic import BaseModel, Field, create_model
+from sqlalchemy import Select, and_, or_, select
+from app.config import get_settings
+
+settings = get_settings()
+
+RANGE_TYPES = (date, datetime, time)
+
+
+class ListQuery(BaseModel):
+    """Query parameters shared by every paginated list endpoint."""
+    limit: int = Field(default=settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX)
+    cursor: Optional[str] = None
+    sort: Optional[str] = None
+    unpaginated: bool = False
+
+
+def build_list_query_model(model_class, filter_fields: tuple[str, ...] = (), sort_fields: tuple[str, ...] = (),
+                           base: type[BaseModel] = ListQuery, name: str = "ListQuery"):
+    """Create a per-entity query model with one optional equality filter per declared column.
+    Date/time columns are typed and also get inclusive <field>_from / <field>_to range filters."""
+    sort_options = ("id", "-id") + tuple(opt for f in sort_fields for opt in (f, f"-{f}"))
+    fields = {}
+    for f in filter_fields:
+        python_type = _python_type(model_class, f)
+        fields[f] = (Optional[python_type], None)
+        if python_type in RANGE_TYPES:
+            fields[f"{f}_from"] = (Optional[python_type], None)
+            fields[f"{f}_to"] = (Optional[python_type], None)
+    fields["sort"] = (Optional[Literal[sort_options]], None)
+    return create_model(f"{model_class.__name__}{name}", __base__=base, **fields)
+
+
+def _python_type(model_class, field: str) -> type:
+    try:
+        python_type = getattr(model_class, field).type.python_type
+    except NotImplementedError:
+        return str
+    return python_type if python_type in RANGE_TYPES else str
+
+
+def encode_cursor(values: list) -> str:
+    # dates/times are carried as ISO strings; the column types parse them back on bind
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":"), default=str).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or not values:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _sort_spec(model_class, sort: Optional[str]):
+    field = (sort or "id").lstrip("-")
+    return getattr(model_class, field), bool(sort and sort.startswith("-"))
+
+
+def build_filtered_statement(model_class, params: BaseModel, filter_fields: tuple[str, ...] = (), base: Optional[Select] = None) -> Select:
+    """Apply the equality filters and the (sort column, id) ordering carried by params."""
+    stmt = base if base is not None else select(model_class)
+    for field in filter_fields:
+        col = getattr(model_class, field)
+        value = getattr(params, field, None)
+        if value is not None:
+            stmt = stmt.where(col == value)
+        lower, upper = getattr(params, f"{field}_from", None), getattr(params, f"{field}_to", None)
+        if lower is not None:
+            stmt = stmt.where(col >= lower)
+        if upper is not None:
+            stmt = stmt.where(col <= upper)
+
+    pk = model_class.id
+    col, desc = _sort_spec(model_class, params.sort)
+    if col is pk:
+        return stmt.order_by(pk.desc() if desc else pk)
+    return stmt.order_by(col.desc() if desc else col, pk.desc() if desc else pk)
+
+
+def build_list_statement(model_class, params: ListQuery, filter_fields: tuple[str, ...] = (), base: Optional[Select] = None) -> Select:
+    """Build the filtered, keyset-ordered SELECT for one page (fetches limit + 1 rows to detect a next page)."""
+    stmt = build_filtered_statement(model_class, params, filter_fields, base)
+    if params.unpaginated:
+        return stmt
+
+    pk = model_class.id
+    col, desc = _sort_spec(model_class, params.sort)
+    if params.cursor:
+        values = decode_cursor(params.cursor)
+        if col is pk:
+            stmt = stmt.where(pk < values[-1] if desc else pk > values[-1])
+        elif len(values) == 2:
+            value, last_id = values
+            if desc:
+                stmt = stmt.where(or_(col < value, and_(col == value, pk < last_id)))
+            else:
+                stmt = stmt.where(or_(col > value, and_(col == value, pk > last_id)))
+        else:
+            raise HTTPException(status_code=400, detail="Cursor does not match sort order")
+    return stmt.limit(params.limit + 1)
+
+
+def next_cursor(model_class, params: ListQuery, rows: list) -> Optional[str]:
+    """Trim the look-ahead row and return the cursor for the following page, if there is one."""
+    if params.unpaginated or len(rows) <= params.limit:
+        return None
+    del rows[params.limit:]
+    last = rows[-1]
+    col, _ = _sort_spec(model_class, params.sort)
+    if col is model_class.id:
+        return encode_cursor([last.id])
+    return encode_cursor([getattr(last, col.key), last.id])
@@ -0,0 +1,279 @@
+"""Ranked, prefix-aware full-text search over patients, notices, lab and radiology requests.
+
+On SQLite the index is an FTS5 table, search_index(title, body), whose rowids come from
+search_keys (entity, entity_id); each entity owns a rowid range, so filtering by entity
+is a rowid range on the FTS5 scan. The index is derived data outside Base.metadata:
+init_db calls ensure_search_index, which creates both tables and an AFTER INSERT /
+UPDATE OF / DELETE trigger set per source table, and refills the index whenever a
+trigger had to be (re)created — a fresh database, or tables dropped and recreated by a
+seed. The triggers keep it in step with every write path (ORM, bulk statements, raw SQL)
+inside the writing transaction, and only fire on updates to the indexed columns.
+
+Queries match every term as a prefix ("chen diab" finds "Chen" with "diabetes") and rank
+with bm25, weighting titles over bodies. Scoring is bounded: only the most recently
+written SEARCH_RANK_WINDOW matches (index rowids follow insertion order, and an update
+re-adds its document) are ranked, so a term matching half the table costs the same as a
+rare one. Older matches follow them unranked, newest first, so every match can still be
+paged to. Other backends, or SQLite builds without FTS5, fall
+back to case-insensitive LIKE matching on the source tables, title-prefix matches first.
+"""
+import html
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import case, func, literal, or_, and_, select, text, union_all
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
+from app.models.lab import LabTestRequest, RadiologyRequest
+from app.models.patient import Patient
+from app.models.task import Notice
+from app.schemas.schemas import SearchHit, SearchPage
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    code: int  # the high bits of its index rowids, so an entity filter is a rowid range
+    model: type
+    title: tuple[str, ...]
+    body: tuple[str, ...]
+
+    @property
+    def table(self) -> str:
+        return self.model.__tablename__
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return ("id",) + self.title + self.body
+
+    @property
+    def rowids(self) -> tuple[int, int]:
+        return self.code << ROWID_BITS, ((self.code + 1) << ROWID_BITS) - 1
+
+
+ROWID_BITS = 40
+SNIPPET_WORDS = 16
+
+# entity name -> indexed columns
+SOURCES = {
+    "patient": SearchSource(1, Patient, ("name",), ("condition", "history", "room_number", "ward", "id")),
+    "notice": SearchSource(2, Notice, ("title",), ("content", "priority")),
+    "lab": SearchSource(3, LabTestRequest, ("patient_name",), ("test_name", "priority", "status", "id")),
+    "radiology": SearchSource(4, RadiologyRequest, ("patient_name",), ("modality", "body_part", "status", "id")),
+}
+
+_fts_ready = False
+
+
+# ── FTS5 index (SQLite) ──
+
+def _concat(row: str, columns: tuple[str, ...]) -> str:
+    return " || ' ' || ".join(f"coalesce({row}.\"{c}\", '')" for c in columns)
+
+
+def _key(entity: str, row: str) -> str:
+    return f"SELECT id FROM search_keys WHERE entity = '{entity}' AND entity_id = {row}.id"
+
+
+def _trigger_ddl(entity: str, source: SearchSource) -> dict[str, str]:
+    t = source.table
+    lo, hi = source.rowids
+    next_key = f"SELECT coalesce(max(id), {lo}) + 1 FROM search_keys WHERE id BETWEEN {lo} AND {hi}"
+    insert_doc = (f"INSERT INTO search_keys(id, entity, entity_id) VALUES (({next_key}), '{entity}', new.id); "
+                  f"INSERT INTO search_index(rowid, title, body) "
+                  f"VALUES (last_insert_rowid(), {_concat('new', source.title)}, {_concat('new', source.body)}); ")
+    delete_doc = (f"DELETE FROM search_index WHERE rowid IN ({_key(entity, 'old')}); "
+                  f"DELETE FROM search_keys WHERE entity = '{entity}' AND entity_id = old.id; ")
+    columns = ", ".join(f'"{c}"' for c in source.columns)
+    return {
+        f"search_{t}_ai": f"CREATE TRIGGER search_{t}_ai AFTER INSERT ON {t} BEGIN "
+                          f"DELETE FROM search_index WHERE rowid IN ({_key(entity, 'new')}); "
+                          f"DELETE FROM search_keys WHERE entity = '{entity}' AND entity_id = new.id; "
+                          f"{insert_doc}END",
+        f"search_{t}_au": f"CREATE TRIGGER search_{t}_au AFTER UPDATE OF {columns} ON {t} BEGIN {delete_doc}{insert_doc}END",
+        f"search_{t}_ad": f"CREATE TRIGGER search_{t}_ad AFTER DELETE ON {t} BEGIN {delete_doc}END",
+    }
+
+
+async def _rebuild(conn):
+    await conn.execute(text("DELETE FROM search_index"))
+    await conn.execute(text("DELETE FROM search_keys"))
+    for entity, source in SOURCES.items():
+        await conn.execute(text(
+            f"INSERT INTO search_keys(id, entity, entity_id) "
+            f"SELECT {source.rowids[0]} + row_number() OVER (ORDER BY rowid), '{entity}', id FROM {source.table}"
+        ))
+        await conn.execute(text(
+            f"INSERT INTO search_index(rowid, title, body) "
+            f"SELECT k.id, {_concat('s', source.title)}, {_concat('s', source.body)} "
+            f"FROM {source.table} s JOIN search_keys k ON k.entity = '{entity}' AND k.entity_id = s.id"
+        ))
+    await conn.execute(text("INSERT INTO search_index(search_index) VALUES ('optimize')"))
+
+
+async def ensure_search_index(conn):
+    """Create the FTS5 index and its triggers where missing; refill it if any trigger was missing."""
+    global _fts_ready
+    if conn.dialect.name != "sqlite" or settings.SEARCH_BACKEND == "like":
+        return
+    try:
+        await conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+            "title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        ))
+    except OperationalError as e:
+        logger.warning("FTS5 unavailable, search falls back to LIKE: %s", e)
+        return
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS search_keys (id INTEGER PRIMARY KEY, entity TEXT NOT NULL, entity_id TEXT NOT NULL, "
+        "UNIQUE (entity, entity_id))"
+    ))
+    existing = set((await conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'"))).scalars())
+    missing = False
+    for entity, source in SOURCES.items():
+        for name, ddl in _trigger_ddl(entity, source).items():
+            if name not in existing:
+                await conn.execute(text(ddl))
+                missing = True
+    if missing:
+        await _rebuild(conn)
+    _fts_ready = True
+
+
+async def drop_search_triggers(conn):
+    """For bulk loads: stop per-row index maintenance; ensure_search_index restores it and refills the index."""
+    if not _fts_ready:
+        return
+    for entity, source in SOURCES.items():
+        for name in _trigger_ddl(entity, source):
+            await conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+
+
+async def rebuild_search_index(conn) -> bool:
+    """Refill the FTS5 index from the source tables; False when search runs on the fallback."""
+    if not _fts_ready:
+        return False
+    await _rebuild(conn)
+    return True
+
+
+def _terms(q: str) -> list[str]:
+    return re.findall(r"\w+", q)
+
+
+def fts_query(q: str) -> Optional[str]:
+    """Each word becomes a quoted prefix term, ANDed: 'chen diab' -> '"chen"* "diab"*'. Single
+    characters match whole tokens only; there is no prefix index that short."""
+    return " ".join(f'"{t}"*' if len(t) > 1 else f'"{t}"' for t in _terms(q)) or None
+
+
+def _fold(word: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", word.casefold()) if not unicodedata.combining(c))
+
+
+def _matches(word: str, terms: list[str]) -> bool:
+    folded = _fold(word)
+    return any(folded.startswith(t) if len(t) > 1 else folded == t for t in terms)
+
+
+def highlight(value: str, terms: list[str], words: Optional[int] = None) -> str:
+    """Wrap words matching a query term in <mark>; with words, cut to that many words around the
+    first match. Done on the page's rows here, as FTS5's highlight() would rerun the query per row.
+    The result is HTML: every piece of the record's own text is escaped."""
+    tokens = re.split(r"(\w+)", value)  # separators at even positions, words at odd ones
+    start, end = 0, len(tokens)
+    if words is not None:
+        hits = [i for i in range(1, len(tokens), 2) if _matches(tokens[i], terms)]
+        first = hits[0] if hits else 1
+        start = max(first - 2 * (words // 4), 0)
+        end = min(start + 2 * words, len(tokens))
+    out = "".join(f"<mark>{html.escape(tok)}</mark>" if i % 2 and _matches(tok, terms) else html.escape(tok)
+                  for i, tok in enumerate(tokens[start:end], start))
+    if words is not None:
+        out = ("…" if start > 0 else "") + out.strip() + ("…" if end < len(tokens) else "")
+    return out
+
+
+def _rowid_filter(entities: list[str]) -> str:
+    if len(entities) == len(SOURCES):
+        return ""
+    ranges = " OR ".join("search_index.rowid BETWEEN {} AND {}".format(*SOURCES[e].rowids) for e in entities)
+    return f"AND ({ranges})"
+
+
+async def _search_fts(db: AsyncSession, q: str, entities: list[str], limit: int, offset: int) -> list[SearchHit]:
+    match = fts_query(q)
+    if match is None:
+        return []
+    in_entities = _rowid_filter(entities)
+    params = {"match": match, "window": settings.SEARCH_RANK_WINDOW}
+    # where the newest SEARCH_RANK_WINDOW matches start: one rowid-ordered doclist walk, no scoring
+    floor, ranked = (await db.execute(text(
+        "SELECT coalesce(min(rowid), 0), count(*) FROM (SELECT search_index.rowid AS rowid FROM search_index "
+        f"WHERE search_index MATCH :match {in_entities} ORDER BY search_index.rowid DESC LIMIT :window)"
+    ), params)).one()
+    pages = []
+    if offset < ranked:
+        # bm25 over the window only; the page's documents are then read back by rowid
+        pages.append((await db.execute(text(
+            "SELECT k.entity, k.entity_id, d.title, d.body, -p.score "
+            "FROM (SELECT search_index.rowid AS rowid, bm25(search_index, 10.0, 1.0) AS score FROM search_index "
+            f"WHERE search_index MATCH :match {in_entities} AND search_index.rowid >= :floor "
+            "ORDER BY score LIMIT :limit OFFSET :offset) p "
+            "CROSS JOIN search_index d ON d.rowid = p.rowid "
+            "JOIN search_keys k ON k.id = p.rowid "
+            "ORDER BY p.score"
+        ), {**params, "floor": floor, "limit": limit, "offset": offset})).all())
+    rest = limit - sum(len(p) for p in pages)
+    if ranked == settings.SEARCH_RANK_WINDOW and rest > 0:
+        # older matches follow unranked, newest first, with score 0
+        pages.append((await db.execute(text(
+            "SELECT k.entity, k.entity_id, d.title, d.body, 0.0 "
+            "FROM (SELECT search_index.rowid AS rowid FROM search_index "
+            f"WHERE search_index MATCH :match {in_entities} AND search_index.rowid < :floor "
+            "ORDER BY search_index.rowid DESC LIMIT :limit OFFSET :offset) p "
+            "CROSS JOIN search_index d ON d.rowid = p.rowid "
+            "JOIN search_keys k ON k.id = p.rowid "
+            "ORDER BY p.rowid DESC"
+        ), {**params, "floor": floor, "limit": rest, "offset": max(offset - ranked, 0)})).all())
+    terms = [_fold(t) for t in _terms(q)]
+    return [SearchHit(entity=e, id=i, title=highlight(title, terms), snippet=highlight(body, terms, SNIPPET_WORDS),
+                      score=score) for page in pages for e, i, title, body, score in page]
+
+
+# ── Portable fallback ──
+
+def _like_statement(entity: str, source: SearchSource, terms: list[str]):
+    model = source.model
+    title = getattr(model, source.title[0])
+    body = [getattr(model, c) for c in source.body]
+    conditions = [or_(*(func.lower(col).contains(t, autoescape=True) for col in (title, *body))) for t in terms]
+    rank = case((func.lower(title).startswith(terms[0], autoescape=True), 0), else_=1)
+    return select(literal(entity).label("entity"), model.id.label("id"), title.label("title"),
+                  func.coalesce(body[0], "").label("snippet"), rank.label("rank")).where(and_(*conditions))
+
+
+async def _search_like(db: AsyncSession, q: str, entities: list[str], limit: int, offset: int) -> list[SearchHit]:
+    terms = [t.lower() for t in _terms(q)]
+    if not terms:
+        return []
+    merged = union_all(*(_like_statement(e, SOURCES[e], terms) for e in entities)).subquery()
+    stmt = select(merged).order_by(merged.c.rank, merged.c.title, merged.c.id).limit(limit).offset(offset)
+    folded = [_fold(t) for t in terms]
+    return [SearchHit(entity=e, id=i, title=highlight(title, folded), snippet=highlight(snippet, folded, SNIPPET_WORDS),
+                      score=1.0 - rank)
+            for e, i, title, snippet, rank in (await db.execute(stmt)).all()]
+
+
+async def search(db: AsyncSession, q: str, entities: Optional[list[str]], limit: int, offset: int) -> SearchPage:
+    entities = [e for e in SOURCES if not entities or e in entities]
+    use_fts = _fts_ready and (await db.connection()).dialect.name == "sqlite"
+    run = _search_fts if use_fts else _search_like
+    # one extra row tells whether there is a next page without counting every match
+    hits = await run(db, q, entities, limit + 1, offset)
+    return SearchPage(hits=hits[:limit], next_offset=offset + limit if len(hits) > limit else None)
@@ -0,0 +1,103 @@
+"""Fast path for list endpoints: project the Out schema's columns as Core rows and encode them with orjson.
+
+The ORM path builds one mapped object per row, registers it in the identity map, then
+has Pydantic validate it against the *Out schema via from_attributes before the stdlib
+encoder runs. Rows read straight from our own tables are already the right shape, so
+this path selects just the Out columns, zips each row with the field names and hands the
+list to orjson in one call. It is enabled with LIST_FAST_PATH_ENABLED; without orjson
+installed the stdlib encoder is used instead (still skipping the ORM and validation).
+JSON columns are decoded with orjson as well (see JSON_ENGINE_OPTIONS), which benefits
+both paths since decoding them dominates once validation is gone.
+"""
+import json
+from datetime import date, datetime, time
+from typing import Optional
+from fastapi import Response
+from sqlalchemy import JSON, Select, String, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ColumnProperty
+from app.config import get_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+settings = get_settings()
+
+# create_engine options routing JSON column encode/decode through orjson when it is available
+JSON_ENGINE_OPTIONS = (
+    {"json_serializer": lambda value: orjson.dumps(value).decode(), "json_deserializer": orjson.loads}
+    if orjson is not None else {}
+)
+
+
+def _default(value):
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _embed_json(text: Optional[str]):
+    if text is None:
+        return None
+    return orjson.Fragment(text) if orjson is not None else json.loads(text)
+
+
+class RowsJSONResponse(Response):
+    """JSON array of objects built from Core rows and a fixed tuple of field names.
+    Fields listed in json_fields hold raw JSON text, which is embedded without re-parsing."""
+    media_type = "application/json"
+
+    def __init__(self, rows, fields: tuple[str, ...], json_fields: tuple[str, ...] = (), **kwargs):
+        self.fields = fields
+        self.json_fields = json_fields
+        super().__init__(rows, **kwargs)
+
+    def render(self, rows) -> bytes:
+        fields = self.fields
+        items = [dict(zip(fields, row)) for row in rows]
+        for field in self.json_fields:
+            for item in items:
+                item[field] = _embed_json(item[field])
+        return dumps(items)
+
+
+class RowProjection:
+    """The columns behind an Out schema, selected under the schema's field names.
+    JSON columns are selected as their stored text rather than decoded."""
+
+    def __init__(self, model_class, out_schema):
+        self.fields = tuple(out_schema.model_fields)
+        self.json_fields = tuple(f for f in self.fields if isinstance(getattr(model_class, f).type, JSON))
+        self.columns = [
+            (type_coerce(getattr(model_class, f), String) if f in self.json_fields else getattr(model_class, f)).label(f)
+            for f in self.fields
+        ]
+
+    def select(self) -> Select:
+        return select(*self.columns)
+
+    async def fetch(self, db: AsyncSession, stmt: Select) -> list:
+        """Run stmt on the session's connection as plain Core, bypassing ORM result loading."""
+        conn = await db.connection()
+        return list((await conn.execute(stmt)).all())
+
+    def response(self, rows, headers: Optional[dict] = None) -> RowsJSONResponse:
+        return RowsJSONResponse(rows, self.fields, self.json_fields, headers=headers)
+
+
+def row_projection(model_class, out_schema) -> Optional[RowProjection]:
+    """A projection for out_schema, or None when the fast path is off or a field is not a plain column."""
+    if not settings.LIST_FAST_PATH_ENABLED:
+        return None
+    props = model_class.__mapper__.attrs
+    if not all(f in props and isinstance(props[f], ColumnProperty) for f in out_schema.model_fields):
+        return None
+    return RowProjection(model_class, out_schema)
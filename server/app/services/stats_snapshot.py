@@ -0,0 +1,195 @@
+"""Dashboard stats from grouped SQL aggregates, plus an optional in-memory snapshot kept current by ORM writes.
+
+Every table behind /api/stats is summarised as {status: [row_count, amount_sum]}. The
+snapshot is built with one UNION ALL query, then adjusted in place by the deltas each
+committed ORM flush produces, and fully rebuilt after STATS_SNAPSHOT_TTL_SECONDS so
+writes from other workers or Core statements are picked up.
+
+A writer notes the snapshot's build number with its first delta. If a rebuild has started
+or finished since, that rebuild may or may not have read the write, so at commit the
+delta is dropped and the snapshot rebuilt on its next read instead of counting the rows
+twice.
+"""
+import asyncio
+import time
+from collections import defaultdict
+from typing import Optional
+from sqlalchemy import event, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, attributes
+from app.config import get_settings
+from app.models.patient import Patient
+from app.models.appointment import Appointment
+from app.models.invoice import Invoice
+from app.models.staff import Doctor
+from app.models.task import Bed
+from app.models.lab import LabTestRequest
+from app.models.ambulance import Ambulance
+from app.schemas.schemas import DashboardStats
+
+settings = get_settings()
+
+# model -> numeric column summed per status (None = count only)
+TRACKED_MODELS = {
+    Patient: None,
+    Appointment: None,
+    Invoice: "amount",
+    Doctor: None,
+    Bed: None,
+    LabTestRequest: None,
+    Ambulance: None,
+}
+PENDING_LAB_STATUSES = ("Pending", "Processing", "Sample Collected")
+
+Counters = dict[str, dict[Optional[str], list]]
+
+
+def _aggregate_statement():
+    parts = []
+    for model, amount_col in TRACKED_MODELS.items():
+        amount = func.coalesce(func.sum(getattr(model, amount_col)), 0) if amount_col else literal(0)
+        parts.append(
+            select(literal(model.__tablename__).label("tbl"), model.status, func.count().label("n"), amount.label("amount"))
+            .group_by(model.status)
+        )
+    return union_all(*parts)
+
+
+async def load_counters(db: AsyncSession) -> Counters:
+    counters: Counters = defaultdict(dict)
+    for tbl, status, n, amount in (await db.execute(_aggregate_statement())).all():
+        counters[tbl][status] = [n, amount or 0]
+    return counters
+
+
+def compute_stats(counters: Counters) -> DashboardStats:
+    def count(tbl, statuses=None, exclude=None):
+        return sum(v[0] for s, v in counters.get(tbl, {}).items()
+                   if (statuses is None or s in statuses) and s != exclude)
+
+    def amount(tbl, status):
+        return counters.get(tbl, {}).get(status, [0, 0])[1]
+
+    return DashboardStats(
+        total_patients=count("patients"),
+        total_appointments=count("appointments", exclude="Cancelled"),
+        total_revenue=amount("invoices", "Paid"),
+        pending_revenue=amount("invoices", "Pending"),
+        total_staff=count("doctors"),
+        available_beds=count("beds", ("Available",)),
+        occupied_beds=count("beds", ("Occupied",)),
+        pending_labs=count("lab_requests", PENDING_LAB_STATUSES),
+        active_ambulances=count("ambulances", ("On Route",)),
+    )
+
+
+class StatsSnapshot:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._counters: Optional[Counters] = None
+        self._built_at = 0.0
+        self._generation = 0
+        self.build = 0  # moves when a rebuild starts and again when it ends
+        self._lock = asyncio.Lock()
+
+    def apply(self, delta: dict, since_build: int):
+        """Add a committed writer's delta, collected while self.build was since_build. A rebuild
+        that started or ended since may already hold the write, so the delta is dropped instead."""
+        if self._counters is None:
+            return
+        if since_build != self.build:
+            self.invalidate()
+            return
+        for (tbl, status), (n, amount) in delta.items():
+            entry = self._counters[tbl].setdefault(status, [0, 0])
+            entry[0] += n
+            entry[1] += amount
+        self._generation += 1
+
+    def invalidate(self):
+        """Force a rebuild on next read — for writers that bypass the ORM unit of work."""
+        self._built_at = 0.0
+        self._generation += 1  # a rebuild in flight may have read around the write: not fresh either
+
+    async def get(self, db: AsyncSession) -> DashboardStats:
+        if self._counters is None or time.monotonic() - self._built_at > self.ttl:
+            async with self._lock:
+                if self._counters is None or time.monotonic() - self._built_at > self.ttl:
+                    generation = self._generation
+                    self.build += 1
+                    self._counters = await load_counters(db)
+                    self.build += 1
+                    # a write landed mid-rebuild: keep the result but rebuild again next time
+                    self._built_at = time.monotonic() if generation == self._generation else 0.0
+        return compute_stats(self._counters)
+
+
+stats_snapshot: Optional[StatsSnapshot] = (
+    StatsSnapshot(settings.STATS_SNAPSHOT_TTL_SECONDS) if settings.STATS_SNAPSHOT_ENABLED else None
+)
+
+
+def _row_key(obj, amount_col, old: bool):
+    def value(attr):
+        if old:
+            hist = attributes.get_history(obj, attr)
+            if hist.deleted:
+                return hist.deleted[0]
+        return getattr(obj, attr)
+
+    return value("status"), (value(amount_col) or 0) if amount_col else 0
+
+
+def _pending_delta(session: Session) -> dict:
+    if "stats_delta" not in session.info:
+        session.info["stats_build"] = stats_snapshot.build
+        session.info["stats_delta"] = defaultdict(lambda: [0, 0])
+    return session.info["stats_delta"]
+
+
+def add_delta(session: Session, table: str, status: Optional[str], n: int, amount: float = 0):
+    """Count a write the ORM flush does not see (a Core statement) into the session's delta."""
+    if stats_snapshot is None:
+        return
+    entry = _pending_delta(session)[(table, status)]
+    entry[0] += n
+    entry[1] += amount
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_stats_delta(session, flush_context):
+    if stats_snapshot is None:
+        return
+    delta = _pending_delta(session)
+
+    def bump(obj, sign, old=False):
+        amount_col = TRACKED_MODELS[type(obj)]
+        status, amount = _row_key(obj, amount_col, old)
+        entry = delta[(obj.__tablename__, status)]
+        entry[0] += sign
+        entry[1] += sign * amount
+
+    for obj in session.new:
+        if type(obj) in TRACKED_MODELS:
+            bump(obj, 1)
+    for obj in session.deleted:
+        if type(obj) in TRACKED_MODELS:
+            bump(obj, -1, old=True)
+    for obj in session.dirty:
+        if type(obj) in TRACKED_MODELS and session.is_modified(obj):
+            bump(obj, -1, old=True)
+            bump(obj, 1)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_stats_delta(session):
+    delta = session.info.pop("stats_delta", None)
+    since_build = session.info.pop("stats_build", None)
+    if delta and stats_snapshot is not None:
+        stats_snapshot.apply(delta, since_build)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stats_delta(session):
+    session.info.pop("stats_delta", None)
+    session.info.pop("stats_build", None)
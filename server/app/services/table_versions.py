@@ -0,0 +1,149 @@
+"""Per-table version counters for conditional GETs (ETag / If-None-Match).
+
+Every ORM flush and every ORM-enabled insert/update/delete statement bumps the
+table_versions row of the tables it writes, on the same connection and therefore in the
+same transaction. Each worker keeps the counters in memory: its own commits are applied
+as soon as they land, and the whole table is re-read at most every
+ETAG_VERSION_TTL_SECONDS so writes made by other workers are seen with bounded delay.
+A GET whose If-None-Match matches the current ETag is answered 304 before any query
+runs or any row is serialised.
+"""
+import asyncio
+import time
+from itertools import chain
+from typing import Optional
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.database import Base, read_engine
+from app.models.table_version import TableVersion
+
+settings = get_settings()
+
+
+class TableVersions:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._versions: dict[str, int] = {}
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def apply(self, touched: dict[str, Optional[int]]):
+        """Apply a committed transaction's bumps; None means the new value is unknown
+        (no RETURNING support, or no counter row), so the local counter is advanced."""
+        for table, version in touched.items():
+            current = self._versions.get(table, 0)
+            self._versions[table] = max(current, version) if version is not None else current + 1
+
+    async def refresh(self) -> dict[str, int]:
+        """Merge the stored counters into the cache and return them as read."""
+        async with read_engine.connect() as conn:
+            rows = dict((await conn.execute(select(TableVersion.table_name, TableVersion.version))).all())
+        for table, version in rows.items():
+            if version > self._versions.get(table, -1):
+                self._versions[table] = version
+        return rows
+
+    def peek(self, table: str) -> int:
+        """The cached counter, without a refresh."""
+        return self._versions.get(table, 0)
+
+    async def get(self, table: str) -> int:
+        if time.monotonic() - self._loaded_at > self.ttl:
+            async with self._lock:
+                if time.monotonic() - self._loaded_at > self.ttl:
+                    await self.refresh()
+                    self._loaded_at = time.monotonic()
+        return self._versions.get(table, 0)
+
+
+table_versions = TableVersions(settings.ETAG_VERSION_TTL_SECONDS)
+
+
+async def ensure_rows(conn):
+    """Create a counter row for every table that lacks one. New rows start at the current
+    time in milliseconds, so ETags issued before a database was rebuilt never match again."""
+    existing = set((await conn.execute(select(TableVersion.table_name))).scalars())
+    start = int(time.time() * 1000)
+    missing = [{"table_name": t, "version": start} for t in Base.metadata.tables
+               if t not in existing and t != TableVersion.__tablename__]
+    if missing:
+        await conn.execute(insert(TableVersion), missing)
+
+
+# ── Conditional GET ──
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix added by a proxy still matches
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def etag_guard(*tables: str):
+    """Dependency for GET routes whose response depends only on the given tables (and the URL).
+
+    Sets a strong ETag built from the tables' versions, or short-circuits with 304 when
+    the client already holds it. The version is read before the handler queries, so a write
+    racing the query can only make the ETag older than the body, never newer.
+    """
+    async def check(request: Request, response: Response):
+        if not settings.ETAG_ENABLED:
+            return
+        etag = '"' + "-".join([f"{t}.{await table_versions.get(t)}" for t in tables]) + '"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+    return check
+
+
+# ── Write tracking ──
+
+def bump_versions(session: Session, tables: set[str]):
+    """Bump the counters of tables written in this session's transaction. Called for every
+    flush and ORM statement; code that writes on session.connection() directly calls it too."""
+    conn = session.connection()
+    stmt = (
+        update(TableVersion)
+        .where(TableVersion.table_name.in_(tables))
+        .values(version=TableVersion.version + 1)
+    )
+    returned = {}
+    if conn.dialect.update_returning:
+        returned = dict(conn.execute(stmt.returning(TableVersion.table_name, TableVersion.version)).all())
+    else:
+        conn.execute(stmt)
+    touched = session.info.setdefault("table_versions", {})
+    for table in tables:
+        touched[table] = returned.get(table)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_flushed_tables(session, flush_context):
+    tables = {obj.__table__.name for obj in chain(session.new, session.deleted)}
+    tables.update(obj.__table__.name for obj in session.dirty if session.is_modified(obj))
+    if tables:
+        bump_versions(session, tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_statement_table(orm_execute_state):
+    # insert(Model) / update(Model) / delete(Model) run through session.execute, e.g. bulk writes
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        bump_versions(orm_execute_state.session, {orm_execute_state.statement.table.name})
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_table_versions(session):
+    touched = session.info.pop("table_versions", None)
+    if touched:
+        table_versions.apply(touched)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_table_versions(session):
+    session.info.pop("table_versions", None)
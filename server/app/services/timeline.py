@@ -0,0 +1,119 @@
+"""One patient's chart: appointments, invoices, requests, certificates and queue tokens as one stream.
+
+Each entity is fetched with its own indexed query (patient_name, newest first, limit + 1
+rows past the cursor) and the per-entity pages are merged in Python, so a page costs
+one small query per entity however large the tables are. With
+TIMELINE_CONCURRENT_QUERIES the queries run at the same time, each on its own read
+connection; every connection reads its own snapshot, so a write landing mid-request
+can show in one entity and not yet in another. In-memory SQLite has a single
+connection and always runs them one after another on the request's session.
+
+Events are ordered by (date, entity, id) descending; the cursor is the last event's
+triple, encoded like the list endpoints' cursors.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.pool import StaticPool
+from app.config import get_settings
+from app.database import read_engine, read_session
+from app.models.appointment import Appointment
+from app.models.blood_bank import BloodRequest
+from app.models.invoice import Invoice
+from app.models.lab import LabTestRequest, RadiologyRequest
+from app.models.referral import MedicalCertificate, Referral
+from app.models.research import QueueItem
+from app.models.types import DateType
+from app.schemas.schemas import TimelineEvent, TimelinePage
+from app.services.pagination import decode_cursor, encode_cursor
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class TimelineSource:
+    entity: str  # the entity's list route, e.g. "lab-requests"
+    model: type
+    title: str  # str.format template over the row's columns
+
+    @property
+    def date(self):
+        if self.model is QueueItem:
+            # tokens issued before queue_date existed only carry issued_at
+            return func.coalesce(QueueItem.queue_date, func.date(QueueItem.issued_at), type_=DateType)
+        if self.model is BloodRequest:
+            return BloodRequest.request_date
+        if self.model is MedicalCertificate:
+            return MedicalCertificate.issue_date
+        return self.model.date
+
+
+SOURCES = {s.entity: s for s in (
+    TimelineSource("appointments", Appointment, "{type} with {doctor_name}"),
+    TimelineSource("invoices", Invoice, "Invoice {id}: {amount:.2f}"),
+    TimelineSource("lab-requests", LabTestRequest, "{test_name} ({priority})"),
+    TimelineSource("radiology", RadiologyRequest, "{modality} {body_part}"),
+    TimelineSource("referrals", Referral, "{direction} referral: {hospital}"),
+    TimelineSource("certificates", MedicalCertificate, "{type} certificate by {doctor}"),
+    TimelineSource("blood-requests", BloodRequest, "{units_required} unit(s) of {blood_group}"),
+    TimelineSource("opd-queue", QueueItem, "{department} token {token_number}"),
+)}
+
+
+def _statement(source: TimelineSource, patient_name: str, limit: int, after: Optional[list]):
+    table = source.model.__table__
+    day = source.date.label("timeline_date")
+    stmt = select(table, day).where(table.c.patient_name == patient_name, source.date.is_not(None))
+    if after is not None:
+        last_day, last_entity, last_id = after
+        # (day, entity, id) < cursor; the entity is constant within one source
+        if source.entity < last_entity:
+            stmt = stmt.where(source.date <= last_day)
+        elif source.entity == last_entity:
+            stmt = stmt.where(or_(source.date < last_day, and_(source.date == last_day, table.c.id < last_id)))
+        else:
+            stmt = stmt.where(source.date < last_day)
+    return stmt.order_by(source.date.desc(), table.c.id.desc()).limit(limit + 1)
+
+
+async def _fetch_concurrently(statements: list) -> list[list]:
+    async def fetch(stmt):
+        async with read_session() as session:
+            return (await session.execute(stmt)).all()
+    return list(await asyncio.gather(*(fetch(stmt) for stmt in statements)))
+
+
+async def timeline(db: AsyncSession, patient_name: str, entities: Optional[list[str]], limit: int,
+                   cursor: Optional[str] = None) -> TimelinePage:
+    after = None
+    if cursor:
+        after = decode_cursor(cursor)
+        if len(after) != 3:
+            raise HTTPException(status_code=400, detail="Cursor does not match the timeline order")
+    sources = [SOURCES[e] for e in (entities or SOURCES)]
+    statements = [_statement(s, patient_name, limit, after) for s in sources]
+    # a StaticPool (in-memory SQLite) has one connection to share
+    if settings.TIMELINE_CONCURRENT_QUERIES and len(statements) > 1 and not isinstance(read_engine.pool, StaticPool):
+        pages = await _fetch_concurrently(statements)
+    else:
+        pages = [(await db.execute(stmt)).all() for stmt in statements]
+
+    events = []
+    for source, rows in zip(sources, pages):
+        for row in rows:
+            record = dict(row._mapping)
+            day = record.pop("timeline_date")
+            events.append(TimelineEvent(
+                entity=source.entity, id=record["id"], date=day, title=source.title.format_map(record),
+                status=record.get("status"), record=record,
+            ))
+    events.sort(key=lambda e: (e.date, e.entity, e.id), reverse=True)
+    next_cursor = None
+    if len(events) > limit:
+        del events[limit:]
+        last = events[-1]
+        next_cursor = encode_cursor([last.date, last.entity, last.id])
+    return TimelinePage(events=events, next_cursor=next_cursor)
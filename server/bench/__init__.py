@@ -0,0 +1 @@
+"""Benchmark and load-generation tooling for the HMS API. Not imported by the app itself."""
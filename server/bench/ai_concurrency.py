@@ -0,0 +1,72 @@
+"""Measure how AI calls affect unrelated traffic on the same event loop.
+
+Fires a burst of /api/ai/triage requests at a local fake model server while polling
+/api/patients, then reports patient-list latency and the peak number of model calls
+in flight (which must never exceed AI_MAX_CONCURRENCY).
+
+    cd server && python -m bench.ai_concurrency --ai-calls 64 --latency 0.5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+
+async def run(ai_calls: int, polls: int) -> dict:
+    import httpx
+    from app.database import init_db
+    from app.main import app
+    from bench.fake_model import app as fake_app
+
+    await init_db()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        triage = {"patient_name": "Bench Patient", "symptoms": ["chest pain", "dyspnoea"], "age": 60}
+
+        async def poll_patients(latencies: list):
+            for _ in range(polls):
+                start = time.perf_counter()
+                await client.get("/api/patients/")
+                latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        latencies: list[float] = []
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(client.post("/api/ai/triage", json=triage) for _ in range(ai_calls)),
+            poll_patients(latencies),
+        )
+        elapsed = time.perf_counter() - start
+    statuses = [r.json().get("status") for r in results[:ai_calls]]
+    return {
+        "ai_calls": ai_calls,
+        "ai_success": statuses.count("success"),
+        "wall_seconds": round(elapsed, 3),
+        "peak_model_in_flight": fake_app.state.peak_in_flight,
+        "patients_p50_ms": round(statistics.median(latencies), 2),
+        "patients_max_ms": round(max(latencies), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ai-calls", type=int, default=64)
+    parser.add_argument("--polls", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    from bench.fake_model import free_port, serve_in_thread
+
+    port = free_port()
+    serve_in_thread(port, args.latency)
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["GEMINI_API_KEY"] = "bench-key"
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db")
+    print(json.dumps(asyncio.run(run(args.ai_calls, args.polls)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Local stand-in for the Gemini generateContent endpoint.
+
+Point the app at it with GEMINI_BASE_URL=http://127.0.0.1:<port> and any non-placeholder
+GEMINI_API_KEY. Each call sleeps for a configurable latency so concurrency through the
+shared AI client can be measured without network access.
+
+    python -m bench.fake_model --port 8765 --latency 0.5
+"""
+import argparse
+import asyncio
+import socket
+import threading
+import time
+from fastapi import FastAPI, Request
+
+app = FastAPI(title="Fake Gemini")
+app.state.latency = 0.2
+app.state.in_flight = 0
+app.state.peak_in_flight = 0
+app.state.calls = 0
+
+
+@app.post("/v1beta/models/{model}:generateContent")
+async def generate_content(model: str, request: Request):
+    body = await request.json()
+    prompt = body["contents"][0]["parts"][0]["text"]
+    app.state.calls += 1
+    app.state.in_flight += 1
+    app.state.peak_in_flight = max(app.state.peak_in_flight, app.state.in_flight)
+    try:
+        await asyncio.sleep(app.state.latency)
+    finally:
+        app.state.in_flight -= 1
+    text = f'{{"model": "{model}", "echo_chars": {len(prompt)}}}'
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+
+
+@app.get("/stats")
+async def stats():
+    return {"calls": app.state.calls, "in_flight": app.state.in_flight, "peak_in_flight": app.state.peak_in_flight}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve_in_thread(port: int, latency: float = 0.2):
+    """Start the fake server on a daemon thread and block until it accepts connections."""
+    import uvicorn
+
+    app.state.latency = latency
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds each model call takes")
+    args = parser.parse_args()
+    app.state.latency = args.latency
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,82 @@
+"""CPU cost of a large list response: ORM objects + Pydantic validation vs. Core rows + orjson.
+
+Loads --rows invoices (dates, floats and a JSON list column, so every encoder path is
+exercised), then serves the same unpaginated list from two routers built by
+create_crud_router, one with LIST_FAST_PATH_ENABLED off and one with it on. Reports the
+process CPU time per request and per row for each, the speed-up, and whether both
+responses decode to the same JSON.
+
+    cd server && python -m bench.list_serialization --rows 10000
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+
+async def _cpu_ms(client, url: str, repeat: int) -> tuple[float, bytes]:
+    samples = []
+    body = b""
+    for _ in range(repeat):
+        start = time.process_time()
+        r = await client.get(url)
+        samples.append((time.process_time() - start) * 1000)
+        body = r.content
+    return statistics.median(samples), body
+
+
+async def run(rows: int, repeat: int) -> dict:
+    import httpx
+    from fastapi import FastAPI
+    from sqlalchemy import insert
+    from app.config import get_settings
+    from app.database import engine, init_db
+    from app.models.invoice import Invoice
+    from app.routers.crud_factory import create_crud_router
+    from app.schemas.schemas import InvoiceCreate, InvoiceOut
+    from app.services import serialization
+
+    await init_db()
+    start = date(2024, 1, 1)
+    async with engine.begin() as conn:
+        await conn.execute(insert(Invoice), [
+            {"id": f"INV-{i:06d}", "patient_name": f"Patient {i % 997}", "date": start + timedelta(days=i % 365),
+             "amount": round(50 + i * 0.37, 2), "status": ("Paid", "Pending", "Overdue")[i % 3],
+             "items": ["Consultation", "CBC"]}
+            for i in range(rows)
+        ])
+
+    settings = get_settings()
+    app = FastAPI()
+    for prefix, fast in (("invoices-orm", False), ("invoices-fast", True)):
+        settings.LIST_FAST_PATH_ENABLED = fast
+        app.include_router(create_crud_router(prefix, prefix, Invoice, InvoiceCreate, InvoiceOut, "INV-"))
+
+    report = {"rows": rows, "orjson": serialization.orjson is not None}
+    bodies = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+        for name in ("orm", "fast"):
+            ms, bodies[name] = await _cpu_ms(client, f"/api/invoices-{name}/?unpaginated=true", repeat)
+            report[f"{name}_cpu_ms"] = round(ms, 2)
+            report[f"{name}_cpu_us_per_row"] = round(ms * 1000 / rows, 2)
+    await engine.dispose()
+    report["speedup"] = round(report["orm_cpu_ms"] / report["fast_cpu_ms"], 2)
+    report["identical_json"] = json.loads(bodies["orm"]) == json.loads(bodies["fast"])
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db")
+    print(json.dumps(asyncio.run(run(args.rows, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""End-to-end load test: RPS, latency percentiles and peak RSS per route family.
+
+Seeds --rows rows per hot table, then drives each scenario at every --concurrency level,
+either in process through httpx's ASGI transport (--target asgi) or over HTTP against a
+real uvicorn process (--target uvicorn). AI scenarios are served by bench.fake_model so
+no network or API key is needed. Each run is printed as JSON and, with --output, appended
+as one JSON line tagged with the git revision, so runs from different commits can be
+diffed; --compare prints the change against the last matching run in a results file.
+
+    cd server && python -m bench.load_suite --rows 10000 --concurrency 1,16,64
+    cd server && python -m bench.load_suite --target uvicorn --workers 2 --output bench-results.jsonl
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Callable, Optional
+from bench.common import git_revision, peak_rss_mb, percentile
+
+BENCH_EMAIL = "loadtest@bench.nexushealth.com"
+BENCH_PASSWORD = "loadtest"
+STATUSES = ["Pending", "Paid", "Overdue"]
+
+
+class Context:
+    """Ids sampled from the seeded dataset, plus a counter so writes and AI prompts stay unique."""
+
+    def __init__(self, patient_ids: list[str], invoice_ids: list[str]):
+        self.patient_ids = patient_ids
+        self.invoice_ids = invoice_ids
+        self.rng = random.Random(11)
+        self.counter = 0
+
+    def next(self) -> int:
+        self.counter += 1
+        return self.counter
+
+
+# name -> callable(ctx) returning (method, url, json body)
+SCENARIOS: dict[str, Callable[[Context], tuple]] = {
+    "crud_list": lambda ctx: ("GET", "/api/invoices/?limit=50&status=Pending&sort=-date", None),
+    "crud_get": lambda ctx: ("GET", f"/api/invoices/{ctx.rng.choice(ctx.invoice_ids)}", None),
+    "crud_create": lambda ctx: ("POST", "/api/tasks/", {"title": f"Load task {ctx.next()}", "assignee": "Nurse Joy"}),
+    "patients_list": lambda ctx: ("GET", "/api/patients/", None),
+    "patients_get": lambda ctx: ("GET", f"/api/patients/{ctx.rng.choice(ctx.patient_ids)}", None),
+    "stats": lambda ctx: ("GET", "/api/stats/", None),
+    "login": lambda ctx: ("POST", "/api/auth/login", {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}),
+    "ai_triage": lambda ctx: ("POST", "/api/ai/triage", {"patient_name": f"Load {ctx.next()}", "symptoms": ["fever"], "age": 40}),
+    "ai_advanced": lambda ctx: ("POST", "/api/ai/advanced/sepsis-predictor", {
+        "patient_name": f"Load {ctx.next()}", "temperature": 38.9, "heart_rate": 118, "respiratory_rate": 24}),
+}
+# bcrypt and model round trips are orders of magnitude slower than the rest
+SLOW_SCENARIOS = {"login", "ai_triage", "ai_advanced"}
+
+
+async def seed_dataset(rows: int) -> Context:
+    """Create the schema and load rows patients, invoices and lab requests (plus rows // 10 beds)."""
+    from sqlalchemy import insert
+    from app.database import engine, init_db
+    from app.middleware.auth import hash_password
+    from app.models.invoice import Invoice
+    from app.models.lab import LabTestRequest
+    from app.models.patient import Patient
+    from app.models.task import Bed
+    from app.models.user import User
+
+    await init_db()
+    rng = random.Random(7)
+    start = date(2024, 1, 1)
+
+    def day():
+        return start + timedelta(days=rng.randrange(365))
+
+    tables = {
+        Patient: lambda i: {"id": f"P-{i}", "name": f"Patient {i}", "age": rng.randrange(1, 95), "gender": rng.choice(["Male", "Female"]),
+                            "admission_date": day(), "condition": "Observation", "urgency": "MEDIUM", "status": "OPD"},
+        Invoice: lambda i: {"id": f"INV-{i}", "patient_name": f"Patient {rng.randrange(rows)}", "date": day(),
+                            "amount": round(rng.uniform(50, 5000), 2), "status": rng.choice(STATUSES)},
+        LabTestRequest: lambda i: {"id": f"LAB-{i}", "patient_name": f"Patient {rng.randrange(rows)}", "test_name": "CBC",
+                                   "priority": "Routine", "status": "Pending", "date": day()},
+        Bed: lambda i: {"id": f"B-{i}", "ward": f"W{i % 12}", "number": str(i), "status": rng.choice(["Available", "Occupied"]),
+                        "type": "General"},
+    }
+    async with engine.begin() as conn:
+        await conn.execute(insert(User), [{"id": "bench-user", "name": "Load Test", "email": BENCH_EMAIL,
+                                           "hashed_password": hash_password(BENCH_PASSWORD), "role": "Nurse"}])
+        for model, make in tables.items():
+            count = rows // 10 if model is Bed else rows
+            for offset in range(0, count, 5000):
+                await conn.execute(insert(model), [make(i) for i in range(offset, min(count, offset + 5000))])
+    return Context([f"P-{i}" for i in range(min(rows, 1000))], [f"INV-{i}" for i in range(min(rows, 1000))])
+
+
+async def run_scenario(client, ctx: Context, name: str, requests: int, concurrency: int, rss: Callable[[], float],
+                       warmup: int = 0) -> dict:
+    build = SCENARIOS[name]
+    for _ in range(warmup):
+        method, url, body = build(ctx)
+        await client.request(method, url, json=body)
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            method, url, body = build(ctx)
+            start = time.perf_counter()
+            try:
+                r = await client.request(method, url, json=body)
+                code = r.status_code
+            except Exception:
+                code = 0
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[code] = statuses.get(code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    errors = sum(n for code, n in statuses.items() if code == 0 or code >= 400)
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "peak_rss_mb": round(rss(), 1),
+    }
+
+
+def _server_rss(pid: int) -> float:
+    """Peak RSS of a uvicorn process and its worker processes."""
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            children = [int(c) for c in f.read().split()]
+    except OSError:
+        children = []
+    return peak_rss_mb(pid) + sum(peak_rss_mb(c) for c in children)
+
+
+def _start_uvicorn(port: int, workers: int) -> subprocess.Popen:
+    import httpx
+
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=os.environ.copy(),
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/api/health").status_code == 200:
+                return proc
+        except httpx.TransportError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30s")
+
+
+async def run(target: str, rows: int, levels: list[int], scenarios: list[str], requests: int, slow_requests: int,
+              workers: int, warmup: int) -> dict:
+    import httpx
+
+    ctx = await seed_dataset(rows)
+    proc: Optional[subprocess.Popen] = None
+    if target == "uvicorn":
+        from app.database import dispose_engines
+        from bench.fake_model import free_port
+
+        await dispose_engines()
+        port = free_port()
+        proc = _start_uvicorn(port, workers)
+        client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=None,
+                                   limits=httpx.Limits(max_connections=max(levels)))
+        rss = lambda: _server_rss(proc.pid)  # noqa: E731
+    else:
+        from app.main import app
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None)
+        rss = peak_rss_mb
+
+    results = []
+    try:
+        async with client:
+            for concurrency in levels:
+                for name in scenarios:
+                    slow = name in SLOW_SCENARIOS
+                    n = slow_requests if slow else requests
+                    results.append(await run_scenario(client, ctx, name, n, concurrency, rss, 0 if slow else warmup))
+                    print(json.dumps(results[-1]), file=sys.stderr)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+    return {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "target": target,
+        "workers": workers if target == "uvicorn" else None,
+        "rows": rows,
+        "results": results,
+    }
+
+
+def compare(current: dict, path: str):
+    """Print rps and p99 changes against the last run in path with the same target and row count."""
+    previous = None
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            if record["target"] == current["target"] and record["rows"] == current["rows"]:
+                previous = record
+    if previous is None:
+        print(f"no earlier {current['target']} run with rows={current['rows']} in {path}", file=sys.stderr)
+        return
+    before = {(r["scenario"], r["concurrency"]): r for r in previous["results"]}
+    print(f"vs {previous['revision']} ({previous['timestamp']}):", file=sys.stderr)
+    for r in current["results"]:
+        old = before.get((r["scenario"], r["concurrency"]))
+        if old and old["rps"] and old["p99_ms"]:
+            print(f"  {r['scenario']:<14} c={r['concurrency']:<4} rps {100 * (r['rps'] / old['rps'] - 1):+6.1f}%"
+                  f"  p99 {100 * (r['p99_ms'] / old['p99_ms'] - 1):+6.1f}%", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--rows", type=int, default=10000, help="rows per seeded table")
+    parser.add_argument("--concurrency", default="1,16,64", help="comma-separated concurrency levels")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario and level")
+    parser.add_argument("--slow-requests", type=int, default=50, help="requests for login and AI scenarios")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests before each fast scenario")
+    parser.add_argument("--model-latency", type=float, default=0.2, help="seconds per fake model call")
+    parser.add_argument("--output", help="append the run as one JSON line to this file")
+    parser.add_argument("--compare", help="results file to compare this run against")
+    args = parser.parse_args()
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    from bench.fake_model import free_port, serve_in_thread
+
+    port = free_port()
+    serve_in_thread(port, args.model_latency)
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["GEMINI_API_KEY"] = "bench-key"
+    os.environ["AI_CACHE_BACKEND"] = "none"
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db")
+
+    levels = [int(c) for c in args.concurrency.split(",")]
+    result = asyncio.run(run(args.target, args.rows, levels, scenarios, args.requests, args.slow_requests, args.workers,
+                     args.warmup))
+    print(json.dumps(result, indent=2))
+    if args.compare:
+        compare(result, args.compare)
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Login latency under a shift-change burst, with bcrypt inline vs. on the worker pool.
+
+Creates --users accounts, fires --logins concurrent /api/auth/login calls (at most
+--concurrency in flight) and meanwhile probes /api/health to see how long the event
+loop stalls. "inline" patches the login handler back to calling bcrypt on the loop,
+which is how the server behaved before hashing moved to a worker pool.
+
+    cd server && python -m bench.login_load --mode inline
+    cd server && python -m bench.login_load --mode pool
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from bench.common import percentile
+
+
+async def run(mode: str, users: int, logins: int, concurrency: int) -> dict:
+    import httpx
+    from app.database import Base, engine, async_session
+    from app.main import app
+    from app.middleware import auth as auth_middleware
+    from app.models.user import User
+    from app.routers import auth as auth_router
+
+    if mode == "inline":
+        async def verify_inline(plain, hashed):
+            return auth_middleware.verify_password(plain, hashed)
+        auth_router.verify_password_async = verify_inline
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    hashed = auth_middleware.hash_password("shift-change")
+    async with async_session() as db:
+        db.add_all(User(id=f"u-{i}", name=f"Nurse {i}", email=f"nurse{i}@bench.nexushealth.com",
+                        hashed_password=hashed, role="Nurse") for i in range(users))
+        await db.commit()
+
+    login_ms: list[float] = []
+    probe_ms: list[float] = []
+    statuses: dict[int, int] = {}
+    gate = asyncio.Semaphore(concurrency)
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+        async def login(i: int):
+            async with gate:
+                start = time.perf_counter()
+                r = await client.post("/api/auth/login", json={"email": f"nurse{i % users}@bench.nexushealth.com", "password": "shift-change"})
+                login_ms.append((time.perf_counter() - start) * 1000)
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+        async def probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/api/health")
+                probe_ms.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.005)
+
+        prober = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(login(i) for i in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await prober
+
+    return {
+        "mode": mode,
+        "logins": logins,
+        "concurrency": concurrency,
+        "statuses": statuses,
+        "rps": round(logins / elapsed, 1),
+        "login_p50_ms": round(percentile(login_ms, 50), 1),
+        "login_p99_ms": round(percentile(login_ms, 99), 1),
+        "health_p99_ms": round(percentile(probe_ms, 99), 1),
+        "health_max_ms": round(max(probe_ms, default=0.0), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["inline", "pool"], default="pool")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db")
+    print(json.dumps(asyncio.run(run(args.mode, args.users, args.logins, args.concurrency)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Check that the hot status/patient/date queries run as indexed range scans, and time them.
+
+Builds a fresh database through the Alembic migrations, loads --rows rows into each hot
+table, then for every query prints SQLite's EXPLAIN QUERY PLAN, whether the expected
+composite index is used, and the median latency. The queries are then re-timed with the
+composite indexes dropped, which is what every one of them cost before they existed.
+Exits non-zero if any query does not use its index.
+
+    cd server && python -m bench.query_plans --rows 200000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+STATUSES = {
+    "invoices": ["Paid", "Pending", "Overdue"],
+    "lab_requests": ["Pending", "Processing", "Sample Collected", "Completed"],
+    "appointments": ["Pending", "Confirmed", "Cancelled", "Completed"],
+    "blood_bags": ["Available", "Reserved", "Used", "Expired"],
+}
+BLOOD_GROUPS = ["A+", "A-", "B+", "B-", "O+", "O-", "AB+", "AB-"]
+
+# name -> (expected index, SQL, params)
+QUERIES = {
+    "invoices_status_date_range": (
+        "ix_invoices_status_date",
+        "SELECT id, amount FROM invoices WHERE status = ? AND date BETWEEN ? AND ?",
+        ["Pending", "2024-03-01", "2024-03-31"],
+    ),
+    "invoices_patient_history": (
+        "ix_invoices_patient_name_date",
+        "SELECT id, date, amount FROM invoices WHERE patient_name = ? AND date >= ? ORDER BY date",
+        ["Patient 42", "2024-01-01"],
+    ),
+    "lab_requests_pending_window": (
+        "ix_lab_requests_status_date",
+        "SELECT id FROM lab_requests WHERE status = ? AND date >= ? ORDER BY date",
+        ["Pending", "2024-06-01"],
+    ),
+    "appointments_day_schedule": (
+        "ix_appointments_status_date",
+        "SELECT id, time FROM appointments WHERE status = ? AND date = ?",
+        ["Confirmed", "2024-05-15"],
+    ),
+    "blood_bags_fefo": (
+        "ix_blood_bags_blood_group_status_expiry_date",
+        "SELECT id, expiry_date FROM blood_bags WHERE blood_group = ? AND status = ? AND expiry_date >= ? "
+        "ORDER BY expiry_date LIMIT 10",
+        ["O-", "Available", "2024-06-01"],
+    ),
+}
+
+
+def _rows(table: str, n: int, rng: random.Random) -> list[dict]:
+    start = date(2024, 1, 1)
+    rows = []
+    for i in range(n):
+        day = start + timedelta(days=rng.randrange(365))
+        status = rng.choice(STATUSES[table])
+        patient = f"Patient {rng.randrange(n // 20 or 1)}"
+        if table == "invoices":
+            rows.append({"id": f"INV-{i}", "patient_name": patient, "date": day, "amount": rng.uniform(50, 5000), "status": status})
+        elif table == "lab_requests":
+            rows.append({"id": f"LAB-{i}", "patient_name": patient, "test_name": "CBC", "priority": "Routine", "status": status, "date": day})
+        elif table == "appointments":
+            rows.append({"id": f"APT-{i}", "patient_name": patient, "doctor_name": "Dr. Chen", "time": "09:00", "date": day,
+                         "type": "Follow-up", "status": status, "is_online": False})
+        else:
+            rows.append({"id": f"BB-{i}", "blood_group": rng.choice(BLOOD_GROUPS), "collection_date": day,
+                         "expiry_date": day + timedelta(days=42), "volume": 450, "status": status})
+    return rows
+
+
+async def _time_query(conn, sql: str, params: list, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        (await conn.exec_driver_sql(sql, tuple(params))).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def run(rows: int, repeat: int) -> dict:
+    from sqlalchemy import insert
+    from app.database import engine, init_db
+    from app.models.appointment import Appointment
+    from app.models.blood_bank import BloodBag
+    from app.models.invoice import Invoice
+    from app.models.lab import LabTestRequest
+
+    await init_db()
+    rng = random.Random(7)
+    async with engine.begin() as conn:
+        for model in (Invoice, LabTestRequest, Appointment, BloodBag):
+            await conn.execute(insert(model), _rows(model.__tablename__, rows, rng))
+        await conn.exec_driver_sql("ANALYZE")
+
+    report = {}
+    async with engine.connect() as conn:
+        for name, (index, sql, params) in QUERIES.items():
+            plan = [row[-1] for row in (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", tuple(params))).fetchall()]
+            report[name] = {
+                "plan": plan,
+                "uses_index": any(index in step for step in plan),
+                "indexed_ms": round(await _time_query(conn, sql, params, repeat), 3),
+            }
+
+    async with engine.begin() as conn:
+        for index, _, _ in QUERIES.values():
+            await conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index}")
+        await conn.exec_driver_sql("ANALYZE")
+    async with engine.connect() as conn:
+        for name, (_, sql, params) in QUERIES.items():
+            report[name]["unindexed_ms"] = round(await _time_query(conn, sql, params, repeat), 3)
+    await engine.dispose()
+    return {"rows_per_table": rows, "queries": report}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db")
+    result = asyncio.run(run(args.rows, args.repeat))
+    print(json.dumps(result, indent=2))
+    if not all(q["uses_index"] for q in result["queries"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
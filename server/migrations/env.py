@@ -0,0 +1,57 @@
+"""Alembic environment for the async app engine.
+
+Run from the CLI (alembic upgrade head), or in-process from init_db, which passes its
+own connection through config.attributes["connection"].
+"""
+import asyncio
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.config import get_settings
+from app.database import Base
+from app.models import (  # noqa: F401 — registers every table on Base.metadata
+    ambulance, appointment, blood_bank, inventory, invoice, lab, patient, referral, research, staff, table_version, task,
+    user,
+)
+
+config = context.config
+target_metadata = Base.metadata
+
+if config.config_file_name is not None and "connection" not in config.attributes:
+    fileConfig(config.config_file_name)
+
+
+def do_run_migrations(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations():
+    engine = create_async_engine(get_settings().DATABASE_URL)
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+def run_migrations_offline():
+    context.configure(
+        url=get_settings().DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+elif "connection" in config.attributes:
+    do_run_migrations(config.attributes["connection"])
+else:
+    asyncio.run(run_async_migrations())
@@ -0,0 +1,271 @@
+"""Baseline schema: every table as created by Base.metadata.create_all before migrations existed.
+
+Tables and indexes that already exist are skipped, so databases created by the old
+create_all startup path can be brought under Alembic by simply upgrading.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _create_table(name, *columns):
+    if not sa.inspect(op.get_bind()).has_table(name):
+        op.create_table(name, *columns)
+
+
+def _create_index(name, table, columns, unique=False):
+    existing = {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+    if name not in existing:
+        op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade():
+    _create_table(
+        "ambulances",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("vehicle_number", sa.String(), nullable=False, unique=True),
+        sa.Column("driver_name", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("location", sa.String(), nullable=True),
+        sa.Column("type", sa.String(), nullable=False),
+    )
+    _create_table(
+        "appointments",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("patient_name", sa.String(), nullable=False),
+        sa.Column("doctor_name", sa.String(), nullable=False),
+        sa.Column("time", sa.String(), nullable=False),
+        sa.Column("date", sa.String(), nullable=False),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("is_online", sa.Boolean(), nullable=True),
+    )
+    _create_index("ix_appointments_patient_name", "appointments", ["patient_name"], unique=False)
+    _create_table(
+        "beds",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("ward", sa.String(), nullable=False),
+        sa.Column("number", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("patient_name", sa.String(), nullable=True),
+        sa.Column("type", sa.String(), nullable=False),
+    )
+    _create_table(
+        "blood_bags",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("blood_group", sa.String(), nullable=False),
+        sa.Column("donor_id", sa.String(), nullable=True),
+        sa.Column("donor_name", sa.String(), nullable=True),
+        sa.Column("collection_date", sa.String(), nullable=False),
+        sa.Column("expiry_date", sa.String(), nullable=False),
+        sa.Column("volume", sa.Float(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("location", sa.String(), nullable=True),
+    )
+    _create_index("ix_blood_bags_blood_group", "blood_bags", ["blood_group"], unique=False)
+    _create_table(
+        "blood_donors",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("age", sa.Integer(), nullable=False),
+        sa.Column("gender", sa.String(), nullable=False),
+        sa.Column("blood_group", sa.String(), nullable=False),
+        sa.Column("contact", sa.String(), nullable=True),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("address", sa.String(), nullable=True),
+        sa.Column("last_donation_date", sa.String(), nullable=True),
+        sa.Column("total_donations", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("medical_conditions", sa.String(), nullable=True),
+        sa.Column("created_at", sa.String(), nullable=True),
+    )
+    _create_index("ix_blood_donors_name", "blood_donors", ["name"], unique=False)
+    _create_table(
+        "blood_requests",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("patient_id", sa.String(), nullable=True),
+        sa.Column("patient_name", sa.String(), nullable=False),
+        sa.Column("blood_group", sa.String(), nullable=False),
+        sa.Column("units_required", sa.Integer(), nullable=False),
+        sa.Column("urgency", sa.String(), nullable=False),
+        sa.Column("department", sa.String(), nullable=True),
+        sa.Column("doctor", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("request_date", sa.String(), nullable=False),
+        sa.Column("required_date", sa.String(), nullable=True),
+        sa.Column("cross_match_status", sa.String(), nullable=True),
+        sa.Column("notes", sa.String(), nullable=True),
+        sa.Column("fulfilled_date", sa.String(), nullable=True),
+        sa.Column("fulfilled_units", sa.Integer(), nullable=True),
+    )
+    _create_index("ix_blood_requests_patient_name", "blood_requests", ["patient_name"], unique=False)
+    _create_table(
+        "blood_units",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("group", sa.String(), nullable=False),
+        sa.Column("bags", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+    )
+    _create_table(
+        "doctors",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("specialty", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("patients", sa.Integer(), nullable=True),
+        sa.Column("image", sa.String(), nullable=True),
+        sa.Column("phone", sa.String(), nullable=True),
+        sa.Column("email", sa.String(), nullable=True),
+    )
+    _create_index("ix_doctors_name", "doctors", ["name"], unique=False)
+    _create_table(
+        "inventory",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("category", sa.String(), nullable=False),
+        sa.Column("stock", sa.Integer(), nullable=False),
+        sa.Column("unit", sa.String(), nullable=False),
+        sa.Column("last_updated", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+    )
+    _create_index("ix_inventory_name", "inventory", ["name"], unique=False)
+    _create_table(
+        "invoices",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("patient_name", sa.String(), nullable=False),
+        sa.Column("date", sa.String(), nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("items", sa.JSON(), nullable=True),
+    )
+    _create_index("ix_invoices_patient_name", "invoices", ["patient_name"], unique=False)
+    _create_table(
+        "lab_requests",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("patient_name", sa.String(), nullable=False),
+        sa.Column("test_name", sa.String(), nullable=False),
+        sa.Column("priority", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("date", sa.String(), nullable=False),
+    )
+    _create_index("ix_lab_requests_patient_name", "lab_requests", ["patient_name"], unique=False)
+    _create_table(
+        "maternity_patients",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("weeks_pregnant", sa.Integer(), nullable=False),
+        sa.Column("doctor", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("room", sa.String(), nullable=True),
+    )
+    _create_index("ix_maternity_patients_name", "maternity_patients", ["name"], unique=False)
+    _create_table(
+        "medical_certificates",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("patient_name", sa.String(), nullable=False),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column("issue_date", sa.String(), nullable=False),
+        sa.Column("doctor", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+    )
+    _create_index("ix_medical_certificates_patient_name", "medical_certificates", ["patient_name"], unique=False)
+    _create_table(
+        "notices",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("content", sa.String(), nullable=False),
+        sa.Column("date", sa.String(), nullable=False),
+        sa.Column("priority", sa.String(), nullable=False),
+    )
+    _create_table(
+        "opd_queue",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("token_number", sa.Integer(), nullable=False),
+        sa.Column("patient_name", sa.String(), nullable=False),
+        sa.Column("doctor_name", sa.String(), nullable=False),
+        sa.Column("department", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("wait_time", sa.String(), nullable=True),
+    )
+    _create_index("ix_opd_queue_patient_name", "opd_queue", ["patient_name"], unique=False)
+    _create_table(
+        "patients",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("age", sa.Integer(), nullable=False),
+        sa.Column("gender", sa.String(), nullable=False),
+        sa.Column("admission_date", sa.String(), nullable=False),
+        sa.Column("condition", sa.String(), nullable=False),
+        sa.Column("room_number", sa.String(), nullable=True),
+        sa.Column("urgency", sa.String(), nullable=False),
+        sa.Column("history", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("ward", sa.String(), nullable=True),
+        sa.Column("phone", sa.String(), nullable=True),
+        sa.Column("email", sa.String(), nullable=True),
+    )
+    _create_index("ix_patients_name", "patients", ["name"], unique=False)
+    _create_table(
+        "radiology_requests",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("patient_name", sa.String(), nullable=False),
+        sa.Column("modality", sa.String(), nullable=False),
+        sa.Column("body_part", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("date", sa.String(), nullable=False),
+    )
+    _create_index("ix_radiology_requests_patient_name", "radiology_requests", ["patient_name"], unique=False)
+    _create_table(
+        "referrals",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("patient_name", sa.String(), nullable=False),
+        sa.Column("direction", sa.String(), nullable=False),
+        sa.Column("hospital", sa.String(), nullable=False),
+        sa.Column("reason", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("date", sa.String(), nullable=False),
+    )
+    _create_index("ix_referrals_patient_name", "referrals", ["patient_name"], unique=False)
+    _create_table(
+        "research_trials",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("phase", sa.String(), nullable=False),
+        sa.Column("participants", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("lead_researcher", sa.String(), nullable=False),
+    )
+    _create_table(
+        "tasks",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("assignee", sa.String(), nullable=False),
+        sa.Column("priority", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+    )
+    _create_table(
+        "users",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False, unique=True),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("role", sa.String(), nullable=False),
+        sa.Column("avatar", sa.String(), nullable=True),
+    )
+    _create_index("ix_users_email", "users", ["email"], unique=True)
+
+
+
+def downgrade():
+    for name in ("ambulances", "appointments", "beds", "blood_bags", "blood_donors", "blood_requests", "blood_units",
+                 "doctors", "inventory", "invoices", "lab_requests", "maternity_patients", "medical_certificates",
+                 "notices", "opd_queue", "patients", "radiology_requests", "referrals", "research_trials", "tasks", "users"):
+        op.drop_table(name)
@@ -0,0 +1,129 @@
+"""Typed DATE/TIME columns and composite (status, date) / (patient_name, date) indexes.
+
+Existing free-form values are parsed with the same rules the API uses (ISO dates,
+"Oct 24, 2023", "09:00 AM", and Today/Tomorrow/Yesterday resolved against the day the
+migration runs) and rewritten in ISO form before the column types change. A value that
+cannot be parsed aborts the migration and is reported, rather than being guessed at.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.models.types import parse_date, parse_time
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# table -> [(column, "date" | "time", nullable)]
+TYPED_COLUMNS = {
+    "patients": [("admission_date", "date", False)],
+    "appointments": [("date", "date", False), ("time", "time", False)],
+    "invoices": [("date", "date", False)],
+    "lab_requests": [("date", "date", False)],
+    "radiology_requests": [("date", "date", False)],
+    "referrals": [("date", "date", False)],
+    "medical_certificates": [("issue_date", "date", False)],
+    "blood_bags": [("collection_date", "date", False), ("expiry_date", "date", False)],
+    "blood_requests": [("request_date", "date", False), ("required_date", "date", True), ("fulfilled_date", "date", True)],
+}
+
+# single-column indexes made redundant by a composite index with the same leading column
+REPLACED_INDEXES = {
+    "ix_appointments_patient_name": ("appointments", ["patient_name"]),
+    "ix_invoices_patient_name": ("invoices", ["patient_name"]),
+    "ix_lab_requests_patient_name": ("lab_requests", ["patient_name"]),
+    "ix_radiology_requests_patient_name": ("radiology_requests", ["patient_name"]),
+    "ix_blood_bags_blood_group": ("blood_bags", ["blood_group"]),
+    "ix_blood_requests_patient_name": ("blood_requests", ["patient_name"]),
+}
+
+NEW_INDEXES = {
+    "ix_patients_status_admission_date": ("patients", ["status", "admission_date"]),
+    "ix_appointments_status_date": ("appointments", ["status", "date"]),
+    "ix_appointments_patient_name_date": ("appointments", ["patient_name", "date"]),
+    "ix_invoices_status_date": ("invoices", ["status", "date"]),
+    "ix_invoices_patient_name_date": ("invoices", ["patient_name", "date"]),
+    "ix_lab_requests_status_date": ("lab_requests", ["status", "date"]),
+    "ix_lab_requests_patient_name_date": ("lab_requests", ["patient_name", "date"]),
+    "ix_radiology_requests_status_date": ("radiology_requests", ["status", "date"]),
+    "ix_radiology_requests_patient_name_date": ("radiology_requests", ["patient_name", "date"]),
+    "ix_referrals_status_date": ("referrals", ["status", "date"]),
+    "ix_blood_bags_status_expiry_date": ("blood_bags", ["status", "expiry_date"]),
+    "ix_blood_bags_blood_group_status_expiry_date": ("blood_bags", ["blood_group", "status", "expiry_date"]),
+    "ix_blood_requests_status_request_date": ("blood_requests", ["status", "request_date"]),
+    "ix_blood_requests_patient_name_request_date": ("blood_requests", ["patient_name", "request_date"]),
+    "ix_beds_status": ("beds", ["status"]),
+    "ix_doctors_status": ("doctors", ["status"]),
+    "ix_ambulances_status": ("ambulances", ["status"]),
+}
+
+
+def _sa_type(kind):
+    return sa.Date() if kind == "date" else sa.Time()
+
+
+def _iso(kind, value):
+    # same text layout SQLAlchemy's SQLite DATE/TIME types store, and castable on other backends
+    if kind == "date":
+        return parse_date(value).isoformat()
+    return parse_time(value).strftime("%H:%M:%S.%f")
+
+
+def _normalise(table, columns):
+    bind = op.get_bind()
+    tbl = sa.table(table, sa.column("id", sa.String()), *(sa.column(col, sa.String()) for col, _, _ in columns))
+    rows = bind.execute(sa.select(tbl)).mappings().all()
+    updates, bad = [], []
+    for row in rows:
+        values = {}
+        for col, kind, _ in columns:
+            if row[col] is None:
+                continue
+            try:
+                values[col] = _iso(kind, row[col])
+            except ValueError:
+                bad.append(f"{table}.{col} id={row['id']}: {row[col]!r}")
+        if values:
+            updates.append((row["id"], values))
+    if bad:
+        raise RuntimeError("Unparseable date/time values, fix them and re-run:\n  " + "\n  ".join(bad[:50]))
+    for row_id, values in updates:
+        bind.execute(tbl.update().where(tbl.c.id == row_id).values(**values))
+
+
+def _index_names(table):
+    return {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    for table, columns in TYPED_COLUMNS.items():
+        _normalise(table, columns)
+        # SQLite recreates the table; reflecting the columns as already-typed stops the copy from
+        # wrapping them in CAST(... AS DATE), which SQLite would turn into a number
+        typed = [sa.Column(col, _sa_type(kind), nullable=nullable) for col, kind, nullable in columns]
+        with op.batch_alter_table(table, reflect_args=typed) as batch:
+            for col, kind, nullable in columns:
+                batch.alter_column(col, type_=_sa_type(kind), existing_type=sa.String(), existing_nullable=nullable,
+                                   postgresql_using=f"{col}::{kind}")
+    # guarded, because a database built by create_all from the current models already has the new layout
+    for name, (table, _) in REPLACED_INDEXES.items():
+        if name in _index_names(table):
+            op.drop_index(name, table_name=table)
+    for name, (table, columns) in NEW_INDEXES.items():
+        if name not in _index_names(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, (table, _) in NEW_INDEXES.items():
+        op.drop_index(name, table_name=table)
+    for name, (table, columns) in REPLACED_INDEXES.items():
+        op.create_index(name, table, columns)
+    for table, columns in TYPED_COLUMNS.items():
+        with op.batch_alter_table(table) as batch:
+            for col, kind, nullable in columns:
+                batch.alter_column(col, type_=sa.String(), existing_type=_sa_type(kind), existing_nullable=nullable)
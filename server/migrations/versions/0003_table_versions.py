@@ -0,0 +1,29 @@
+"""Per-table version counters behind the ETag / If-None-Match support on GET endpoints.
+
+Rows are created at startup by app.services.table_versions.ensure_rows, so every table
+that exists (including ones added later) gets a counter without a data migration.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not sa.inspect(op.get_bind()).has_table("table_versions"):
+        op.create_table(
+            "table_versions",
+            sa.Column("table_name", sa.String(), primary_key=True),
+            sa.Column("version", sa.BigInteger(), nullable=False),
+        )
+
+
+def downgrade():
+    op.drop_table("table_versions")
@@ -0,0 +1,101 @@
+"""OPD queue engine: priority / day / timestamps on opd_queue, token sequences and call-order indexes.
+
+Existing queue rows are assigned to the day the migration runs, and the sequence table is
+seeded with the highest token already issued per department (and per doctor), so tokens
+allocated afterwards never repeat a number still on the board. Tokens that were typed in
+twice for the same day, department and doctor are renumbered past that key's highest
+token first, so the unique ix_opd_queue_token can be created.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+NEW_COLUMNS = [
+    sa.Column("priority", sa.Integer(), nullable=False, server_default="0"),
+    sa.Column("queue_date", sa.Date(), nullable=True),
+    sa.Column("issued_at", sa.DateTime(), nullable=True),
+    sa.Column("called_at", sa.DateTime(), nullable=True),
+]
+
+
+def _columns(table):
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _index_names(table):
+    return {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def _renumber_duplicate_tokens(bind):
+    queue = sa.table("opd_queue", sa.column("id", sa.String()), sa.column("queue_date", sa.Date()),
+                     sa.column("department", sa.String()), sa.column("doctor_name", sa.String()),
+                     sa.column("token_number", sa.Integer()))
+    key = (queue.c.queue_date, queue.c.department, queue.c.doctor_name)
+    rows = bind.execute(sa.select(queue.c.id, *key, queue.c.token_number).order_by(*key, queue.c.token_number, queue.c.id)).all()
+    highest, seen = {}, set()
+    for _, day, department, doctor, token in rows:
+        highest[(day, department, doctor)] = max(highest.get((day, department, doctor), token), token)
+    for item_id, day, department, doctor, token in rows:
+        if (day, department, doctor, token) in seen:
+            highest[(day, department, doctor)] += 1
+            token = highest[(day, department, doctor)]
+            bind.execute(queue.update().where(queue.c.id == item_id).values(token_number=token))
+        seen.add((day, department, doctor, token))
+
+
+def upgrade():
+    bind = op.get_bind()
+    existing = _columns("opd_queue")
+    for column in NEW_COLUMNS:
+        if column.name not in existing:
+            op.add_column("opd_queue", column.copy())
+    queue = sa.table("opd_queue", sa.column("queue_date", sa.Date()), sa.column("department", sa.String()),
+                     sa.column("doctor_name", sa.String()), sa.column("token_number", sa.Integer()))
+    bind.execute(queue.update().where(queue.c.queue_date.is_(None)).values(queue_date=date.today()))
+    _renumber_duplicate_tokens(bind)
+
+    if not sa.inspect(bind).has_table("opd_token_sequences"):
+        op.create_table(
+            "opd_token_sequences",
+            sa.Column("department", sa.String(), primary_key=True),
+            sa.Column("doctor_name", sa.String(), primary_key=True),
+            sa.Column("queue_date", sa.Date(), primary_key=True),
+            sa.Column("last_token", sa.Integer(), nullable=False),
+        )
+        sequences = sa.table("opd_token_sequences", sa.column("department", sa.String()), sa.column("doctor_name", sa.String()),
+                             sa.column("queue_date", sa.Date()), sa.column("last_token", sa.Integer()))
+        max_token = sa.func.max(queue.c.token_number)
+        per_department = sa.select(queue.c.department, sa.literal(""), queue.c.queue_date, max_token) \
+            .group_by(queue.c.department, queue.c.queue_date)
+        per_doctor = sa.select(queue.c.department, queue.c.doctor_name, queue.c.queue_date, max_token) \
+            .group_by(queue.c.department, queue.c.doctor_name, queue.c.queue_date)
+        for stmt in (per_department, per_doctor):
+            bind.execute(sequences.insert().from_select(["department", "doctor_name", "queue_date", "last_token"], stmt))
+
+    indexes = _index_names("opd_queue")
+    if "ix_opd_queue_department_status_token_number" not in indexes:
+        op.create_index("ix_opd_queue_department_status_token_number", "opd_queue", ["department", "status", "token_number"])
+    if "ix_opd_queue_call_order" not in indexes:
+        op.create_index("ix_opd_queue_call_order", "opd_queue",
+                        ["department", "queue_date", "status", sa.text("priority DESC"), "token_number"])
+    if "ix_opd_queue_token" not in indexes:
+        op.create_index("ix_opd_queue_token", "opd_queue", ["queue_date", "department", "doctor_name", "token_number"], unique=True)
+
+
+def downgrade():
+    op.drop_index("ix_opd_queue_token", table_name="opd_queue")
+    op.drop_index("ix_opd_queue_call_order", table_name="opd_queue")
+    op.drop_index("ix_opd_queue_department_status_token_number", table_name="opd_queue")
+    op.drop_table("opd_token_sequences")
+    with op.batch_alter_table("opd_queue") as batch:
+        for column in reversed(NEW_COLUMNS):
+            batch.drop_column(column.name)
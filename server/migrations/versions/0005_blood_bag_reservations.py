@@ -0,0 +1,27 @@
+"""Blood bag reservations: blood_bags.request_id links a reserved bag to its blood request.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if "request_id" not in {c["name"] for c in inspector.get_columns("blood_bags")}:
+        op.add_column("blood_bags", sa.Column("request_id", sa.String(), nullable=True))
+    if "ix_blood_bags_request_id" not in {ix["name"] for ix in inspector.get_indexes("blood_bags")}:
+        op.create_index("ix_blood_bags_request_id", "blood_bags", ["request_id"])
+
+
+def downgrade():
+    op.drop_index("ix_blood_bags_request_id", table_name="blood_bags")
+    with op.batch_alter_table("blood_bags") as batch:
+        batch.drop_column("request_id")
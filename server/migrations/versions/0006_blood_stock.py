@@ -0,0 +1,53 @@
+"""Derived blood stock: blood_units.reserved, one row per group, counts recomputed from blood_bags.
+
+blood_units was edited by hand until now, so the upgrade recounts Available and Reserved
+bags per group and re-evaluates each status against the BLOOD_STOCK_* thresholds. The
+unique index on blood_units.group is only created when no group appears twice.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.config import get_settings
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "reserved" not in {c["name"] for c in inspector.get_columns("blood_units")}:
+        op.add_column("blood_units", sa.Column("reserved", sa.Integer(), nullable=False, server_default="0"))
+
+    units = sa.table("blood_units", sa.column("id", sa.String()), sa.column("group", sa.String()), sa.column("bags", sa.Integer()),
+                     sa.column("reserved", sa.Integer()), sa.column("status", sa.String()))
+    bags = sa.table("blood_bags", sa.column("blood_group", sa.String()), sa.column("status", sa.String()))
+    missing = sa.select(bags.c.blood_group).distinct().where(bags.c.blood_group.not_in(sa.select(units.c.group)))
+    for (group,) in bind.execute(missing).all():
+        bind.execute(units.insert().values(id=f"BU-{group}", group=group, bags=0, reserved=0, status="Critical"))
+
+    def count(status):
+        return sa.select(sa.func.count()).where(bags.c.blood_group == units.c.group, bags.c.status == status).scalar_subquery()
+
+    bind.execute(units.update().values(bags=count("Available"), reserved=count("Reserved")))
+    settings = get_settings()
+    bind.execute(units.update().values(status=sa.case(
+        (units.c.bags < settings.BLOOD_STOCK_CRITICAL_BELOW, "Critical"),
+        (units.c.bags < settings.BLOOD_STOCK_LOW_BELOW, "Low"),
+        else_="Adequate",
+    )))
+
+    duplicated = bind.execute(sa.select(units.c.group).group_by(units.c.group).having(sa.func.count() > 1)).first()
+    if duplicated is None and "ix_blood_units_group" not in {ix["name"] for ix in inspector.get_indexes("blood_units")}:
+        op.create_index("ix_blood_units_group", "blood_units", ["group"], unique=True)
+
+
+def downgrade():
+    op.drop_index("ix_blood_units_group", table_name="blood_units")
+    with op.batch_alter_table("blood_units") as batch:
+        batch.drop_column("reserved")
@@ -0,0 +1,59 @@
+"""Inventory ledger: per-item low-stock threshold, inventory_movements, derived status.
+
+Each existing item gets an "opening" movement for its current stock so the ledger sums
+to it from the start, and its status is recomputed from stock and the default threshold.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "threshold" not in {c["name"] for c in inspector.get_columns("inventory")}:
+        op.add_column("inventory", sa.Column("threshold", sa.Integer(), nullable=False, server_default="10"))
+
+    inventory = sa.table("inventory", sa.column("id", sa.String()), sa.column("stock", sa.Integer()),
+                         sa.column("threshold", sa.Integer()), sa.column("status", sa.String()))
+    bind.execute(inventory.update().values(status=sa.case(
+        (inventory.c.stock <= 0, "Out of Stock"),
+        (inventory.c.stock < inventory.c.threshold, "Low Stock"),
+        else_="In Stock",
+    )))
+
+    if not inspector.has_table("inventory_movements"):
+        op.create_table(
+            "inventory_movements",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("item_id", sa.String(), nullable=False),
+            sa.Column("change", sa.Integer(), nullable=False),
+            sa.Column("stock_after", sa.Integer(), nullable=False),
+            sa.Column("reason", sa.String(), nullable=False),
+            sa.Column("reference", sa.String(), nullable=True),
+            sa.Column("note", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_inventory_movements_item_id_id", "inventory_movements", ["item_id", "id"])
+        movements = sa.table("inventory_movements", sa.column("item_id", sa.String()), sa.column("change", sa.Integer()),
+                             sa.column("stock_after", sa.Integer()), sa.column("reason", sa.String()),
+                             sa.column("created_at", sa.DateTime()))
+        opening = sa.select(inventory.c.id, inventory.c.stock, inventory.c.stock, sa.literal("opening"),
+                            sa.literal(datetime.now(), sa.DateTime())).where(inventory.c.stock != 0)
+        bind.execute(movements.insert().from_select(["item_id", "change", "stock_after", "reason", "created_at"], opening))
+
+
+def downgrade():
+    op.drop_index("ix_inventory_movements_item_id_id", table_name="inventory_movements")
+    op.drop_table("inventory_movements")
+    with op.batch_alter_table("inventory") as batch:
+        batch.drop_column("threshold")
@@ -79,8 +79,6 @@ interface DataContextType {
   addToQueue: (item: QueueItem) => Promise<void>;
   updateQueueItem: (id: string, updates: Partial<QueueItem>) => Promise<void>;
 
-  addBloodUnit: (unit: BloodUnit) => Promise<void>;
-  updateBloodUnit: (id: string, updates: Partial<BloodUnit>) => Promise<void>;
   addBloodBag: (bag: BloodBag) => Promise<void>;
   updateBloodBag: (id: string, updates: Partial<BloodBag>) => Promise<void>;
   deleteBloodBag: (id: string) => Promise<void>;
@@ -239,11 +237,11 @@ export const DataProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
   const addToQueue = (item: QueueItem) => createItem(opdQueueAPI, item, setOpdQueue);
   const updateQueueItem = (id: string, updates: Partial<QueueItem>) => updateItem(opdQueueAPI, id, updates, setOpdQueue);
 
-  const addBloodUnit = (item: BloodUnit) => createItem(bloodUnitsAPI, item, setBloodUnits);
-  const updateBloodUnit = (id: string, updates: Partial<BloodUnit>) => updateItem(bloodUnitsAPI, id, updates, setBloodUnits);
-  const addBloodBag = (item: BloodBag) => createItem(bloodBagsAPI, item, setBloodBags);
-  const updateBloodBag = (id: string, updates: Partial<BloodBag>) => updateItem(bloodBagsAPI, id, updates, setBloodBags);
-  const deleteBloodBag = (id: string) => deleteItem(bloodBagsAPI, id, setBloodBags);
+  // Blood units are counted by the server from the bags, so bag writes reload them
+  const refreshBloodUnits = async () => setBloodUnits(await bloodUnitsAPI.list());
+  const addBloodBag = (item: BloodBag) => createItem(bloodBagsAPI, item, setBloodBags).then(refreshBloodUnits);
+  const updateBloodBag = (id: string, updates: Partial<BloodBag>) => updateItem(bloodBagsAPI, id, updates, setBloodBags).then(refreshBloodUnits);
+  const deleteBloodBag = (id: string) => deleteItem(bloodBagsAPI, id, setBloodBags).then(refreshBloodUnits);
   const addBloodDonor = (item: BloodDonor) => createItem(bloodDonorsAPI, item, setBloodDonors);
   const updateBloodDonor = (id: string, updates: Partial<BloodDonor>) => updateItem(bloodDonorsAPI, id, updates, setBloodDonors);
   const deleteBloodDonor = (id: string) => deleteItem(bloodDonorsAPI, id, setBloodDonors);
@@ -275,7 +273,7 @@ export const DataProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
       updateBedStatus,
       addLabRequest, addRadiologyRequest, addReferral, addMedicalCertificate, addResearchTrial, addMaternityPatient,
       addToQueue, updateQueueItem,
-      addBloodUnit, updateBloodUnit, addBloodBag, updateBloodBag, deleteBloodBag,
+      addBloodBag, updateBloodBag, deleteBloodBag,
       addBloodDonor, updateBloodDonor, deleteBloodDonor, addBloodRequest, updateBloodRequest,
       getStats
     }}>